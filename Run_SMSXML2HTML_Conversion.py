@@ -9,6 +9,8 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
 import sys
+import queue
+import threading
 import subprocess
 from pathlib import Path
 
@@ -18,6 +20,21 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, errors='replace')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, errors='replace')
 
+# Conversion output is moved from the script to the window in batches rather than line by line
+OUTPUT_POLL_MS = 100  # How often queued output is shown
+OUTPUT_BATCH_LINES = 5000  # Most lines taken from the queue per poll, so the window never stalls
+OUTPUT_MAX_LINES = 2000  # Scrollback kept in the output box; older lines are dropped
+
+def read_output(pipe, q):
+    """Read output from pipe and put in queue"""
+    try:
+        for line in iter(pipe.readline, ''):
+            if line:
+                q.put(line)
+        pipe.close()
+    except:
+        pass
+
 class SMSConverterGUI:
     def __init__(self, root):
         self.root = root
@@ -268,12 +285,17 @@ class SMSConverterGUI:
         return True
     
     def append_output(self, text):
-        """Append text to the output text widget"""
+        """Append text to the output text widget, keeping at most OUTPUT_MAX_LINES lines"""
+        # Only follow the end if the user hasn't scrolled up to read something
+        at_bottom = self.output_text.yview()[1] >= 1.0
         self.output_text.configure(state='normal')
         self.output_text.insert(tk.END, text)
-        self.output_text.see(tk.END)
+        line_count = int(self.output_text.index('end-1c').split('.')[0])
+        if line_count > OUTPUT_MAX_LINES:
+            self.output_text.delete('1.0', f'{line_count - OUTPUT_MAX_LINES + 1}.0')
+        if at_bottom:
+            self.output_text.see(tk.END)
         self.output_text.configure(state='disabled')
-        self.root.update()
     
     def clear_output(self):
         """Clear the output text widget"""
@@ -282,7 +304,7 @@ class SMSConverterGUI:
         self.output_text.configure(state='disabled')
     
     def run_conversion(self):
-        """Run the conversion script"""
+        """Start the conversion script; its output is picked up by poll_conversion"""
         if not self.validate_inputs():
             return
         
@@ -311,7 +333,6 @@ class SMSConverterGUI:
         self.status_var.set("Converting... Please wait...")
         self.clear_output()
         self.append_output("Starting conversion...\n\n")
-        self.root.update()
         
         # Build command
         cmd = [
@@ -324,25 +345,8 @@ class SMSConverterGUI:
         ]
         
         try:
-            # Run the conversion with real-time output using a different approach
-            import threading
-            import queue
-            
-            output_queue = queue.Queue()
-            output_lines = []
-            
-            def read_output(pipe, q):
-                """Read output from pipe and put in queue"""
-                try:
-                    for line in iter(pipe.readline, ''):
-                        if line:
-                            q.put(line)
-                    pipe.close()
-                except:
-                    pass
-            
             # Start the process
-            process = subprocess.Popen(
+            self.process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
@@ -352,90 +356,102 @@ class SMSConverterGUI:
                 errors='replace',
                 bufsize=1
             )
+        except Exception as e:
+            self.conversion_failed(e)
+            return
+        
+        self.output_folder = output_folder
+        self.success_line = None
+        self.output_queue = queue.Queue()
+        
+        # The pipe is drained on its own thread as fast as the script writes, so the script
+        # never waits on the GUI; the GUI picks the lines up in batches from the queue
+        self.reader_thread = threading.Thread(target=read_output, args=(self.process.stdout, self.output_queue))
+        self.reader_thread.daemon = True
+        self.reader_thread.start()
+        self.root.after(OUTPUT_POLL_MS, self.poll_conversion)
+    
+    def poll_conversion(self):
+        """Move queued output into the text widget in one batch, then finish or check again later"""
+        try:
+            lines = []
+            try:
+                while len(lines) < OUTPUT_BATCH_LINES:
+                    lines.append(self.output_queue.get_nowait())
+            except queue.Empty:
+                pass
             
-            # Start thread to read output
-            thread = threading.Thread(target=read_output, args=(process.stdout, output_queue))
-            thread.daemon = True
-            thread.start()
-            
-            # Process output in real-time
-            while True:
-                # Check if process is done
-                if process.poll() is not None:
-                    # Process finished, get any remaining output
-                    while not output_queue.empty():
-                        try:
-                            line = output_queue.get_nowait()
-                            output_lines.append(line)
-                            self.append_output(line)
-                        except queue.Empty:
-                            break
-                    break
-                
-                # Get output from queue
-                try:
-                    line = output_queue.get(timeout=0.1)
-                    output_lines.append(line)
-                    self.append_output(line)
-                except queue.Empty:
-                    pass
+            for line in lines:
+                if 'Success!' in line:
+                    self.success_line = line
+            # Lines that would be trimmed from the scrollback straight away are never inserted
+            if len(lines) > OUTPUT_MAX_LINES:
+                lines = lines[-OUTPUT_MAX_LINES:]
+            if lines:
+                self.append_output(''.join(lines))
             
-            returncode = process.returncode
+            # Done once the script has exited and all of its output has been shown
+            if self.process.poll() is not None and not self.reader_thread.is_alive() and self.output_queue.empty():
+                self.finish_conversion(self.process.returncode)
+            else:
+                self.root.after(OUTPUT_POLL_MS, self.poll_conversion)
+        except Exception as e:
+            self.conversion_failed(e)
+    
+    def finish_conversion(self, returncode):
+        """Report the result of a finished conversion"""
+        # Re-enable button
+        self.convert_btn.config(state='normal')
+        
+        if returncode == 0:
+            self.status_var.set("Conversion completed successfully!")
+            self.append_output("\n✓ Conversion completed successfully!\n")
             
-            # Re-enable button
-            self.convert_btn.config(state='normal')
+            # Parse the output to find the created file path
+            html_file_path = None
+            folder_to_open = self.output_folder
             
-            if returncode == 0:
-                self.status_var.set("Conversion completed successfully!")
-                self.append_output("\n✓ Conversion completed successfully!\n")
-                
-                # Parse the output to find the created file path
-                html_file_path = None
-                folder_to_open = output_folder
+            # Look for the success line that contains both "Created" and " in "
+            # Example: "Success! Created TextConversation_Multiple_20251210_173903/messages.html in C:\Scripts\smsxml2html\output"
+            line = self.success_line
+            if line and 'Created' in line and ' in ' in line and '.html' in line:
+                # Find the position of "Created" and " in "
+                created_pos = line.find('Created')
+                in_pos = line.rfind(' in ')  # Use rfind to get the last occurrence
                 
-                if output_lines:
-                    for line in output_lines:
-                        # Look for the success line that contains both "Created" and " in "
-                        # Example: "Success! Created TextConversation_Multiple_20251210_173903/messages.html in C:\Scripts\smsxml2html\output"
-                        if 'Success!' in line and 'Created' in line and ' in ' in line and '.html' in line:
-                            # Find the position of "Created" and " in "
-                            created_pos = line.find('Created')
-                            in_pos = line.rfind(' in ')  # Use rfind to get the last occurrence
-                            
-                            if created_pos != -1 and in_pos != -1 and in_pos > created_pos:
-                                # Extract the relative path (between "Created" and " in ")
-                                relative_path = line[created_pos + 8:in_pos].strip()  # +8 to skip "Created "
-                                
-                                # Extract the base folder (after " in ")
-                                base_folder = line[in_pos + 4:].strip()  # +4 to skip " in "
-                                
-                                # Build the full HTML file path
-                                html_file_path = os.path.join(base_folder, relative_path.replace('/', os.sep))
-                                
-                                # Determine the folder to open
-                                if '/' in relative_path:
-                                    # Has subfolder - open the subfolder, not conv_files
-                                    subfolder = relative_path.split('/')[0]
-                                    folder_to_open = os.path.join(base_folder, subfolder)
-                                else:
-                                    # Single file - open the base folder
-                                    folder_to_open = base_folder
-                                
-                                break
-                
-                # Show success dialog with the actual paths
-                self.show_success_dialog(html_file_path, folder_to_open)
-            else:
-                self.status_var.set("Conversion failed!")
-                self.append_output("\n✗ Conversion failed!\n")
-                error_msg = "Conversion failed!\n\nCheck the output above for details."
-                messagebox.showerror("Error", error_msg)
-                
-        except Exception as e:
-            self.convert_btn.config(state='normal')
+                if created_pos != -1 and in_pos != -1 and in_pos > created_pos:
+                    # Extract the relative path (between "Created" and " in ")
+                    relative_path = line[created_pos + 8:in_pos].strip()  # +8 to skip "Created "
+                    
+                    # Extract the base folder (after " in ")
+                    base_folder = line[in_pos + 4:].strip()  # +4 to skip " in "
+                    
+                    # Build the full HTML file path
+                    html_file_path = os.path.join(base_folder, relative_path.replace('/', os.sep))
+                    
+                    # Determine the folder to open
+                    if '/' in relative_path:
+                        # Has subfolder - open the subfolder, not conv_files
+                        subfolder = relative_path.split('/')[0]
+                        folder_to_open = os.path.join(base_folder, subfolder)
+                    else:
+                        # Single file - open the base folder
+                        folder_to_open = base_folder
+            
+            # Show success dialog with the actual paths
+            self.show_success_dialog(html_file_path, folder_to_open)
+        else:
             self.status_var.set("Conversion failed!")
-            self.append_output(f"\n✗ Error: {str(e)}\n")
-            messagebox.showerror("Error", f"Failed to run conversion:\n{e}")
+            self.append_output("\n✗ Conversion failed!\n")
+            error_msg = "Conversion failed!\n\nCheck the output above for details."
+            messagebox.showerror("Error", error_msg)
+    
+    def conversion_failed(self, error):
+        """Report an error that stopped the conversion from being run or followed"""
+        self.convert_btn.config(state='normal')
+        self.status_var.set("Conversion failed!")
+        self.append_output(f"\n✗ Error: {str(error)}\n")
+        messagebox.showerror("Error", f"Failed to run conversion:\n{error}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+# Micro-benchmark for the date formatting done while rendering a conversation.
+# Compares the old two-pass loop (fromtimestamp + strftime for every message, twice)
+# with the single pass through DateFormatCache used by renderConversation.
+#
+# Usage: python benchmarks/bench_date_formatting.py [--messages 1000000]
+
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+import locale
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smsxml2html import DateFormatCache
+
+def makeTimestamps(count, seed=1):
+	"""Synthetic conversation: bursts of messages a few seconds to a few hours apart"""
+	rng = random.Random(seed)
+	timestamp = int(datetime.datetime(2012, 1, 1).timestamp() * 1000)
+	timestamps = []
+	for _ in range(count):
+		if rng.random() < 0.95:
+			gap = rng.randint(1, 180)
+		else:
+			gap = rng.randint(1800, 4 * 3600)
+		timestamp += gap * 1000 + rng.randint(0, 999)
+		timestamps.append(timestamp)
+	timestamps.reverse()  # Conversations are rendered newest first
+	return timestamps
+
+def formatTwoPass(timestamps):
+	"""The original dumpConversationsSplit formatting: one pass for the month list, one for rows"""
+	prev_month_year = ""
+	months = []
+	for timestamp in timestamps:
+		dt = datetime.datetime.fromtimestamp(timestamp / 1000, tz=None)
+		month_year = dt.strftime('%B %Y')
+		if month_year != prev_month_year:
+			months.append((month_year, dt.strftime('%y%m')))
+		prev_month_year = month_year
+	
+	rows = []
+	for timestamp in timestamps:
+		dt = datetime.datetime.fromtimestamp(timestamp / 1000, tz=None)
+		month_year = dt.strftime('%B %Y')
+		rows.append((month_year, dt.strftime("%b %d, %Y"), dt.strftime("%I:%M:%S %p")))
+	return months, rows
+
+def formatCached(timestamps):
+	"""Single pass through DateFormatCache, as renderConversation does now"""
+	prev_month_year = ""
+	months = []
+	rows = []
+	date_formatter = DateFormatCache()
+	for timestamp in timestamps:
+		month_year, month_short, date_str, time_str = date_formatter.format(timestamp)
+		if month_year != prev_month_year:
+			months.append((month_year, month_short))
+		prev_month_year = month_year
+		rows.append((month_year, date_str, time_str))
+	return months, rows
+
+def timeIt(func, timestamps, repeat):
+	best = None
+	result = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		result = func(timestamps)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	return best, result
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark per-message date formatting in the conversation renderer')
+	parser.add_argument('--messages', type=int, default=1000000,
+				help='Number of messages in the synthetic conversation (default: 1000000)')
+	parser.add_argument('--repeat', type=int, default=3,
+				help='Runs per variant; the best time is reported (default: 3)')
+	args = parser.parse_args()
+	locale.setlocale(locale.LC_ALL, '')
+	
+	timestamps = makeTimestamps(args.messages)
+	days = (timestamps[0] - timestamps[-1]) // 86400000 + 1
+	print(f"Synthetic conversation: {len(timestamps)} messages over {days} days\n")
+	
+	before, expected = timeIt(formatTwoPass, timestamps, args.repeat)
+	after, result = timeIt(formatCached, timestamps, args.repeat)
+	
+	if result != expected:
+		print("ERROR: cached formatting does not match the two-pass output")
+		sys.exit(1)
+	
+	print(f"  Two-pass strftime:   {before:8.3f}s  {len(timestamps) / before:12,.0f} messages/sec")
+	print(f"  Cached single pass:  {after:8.3f}s  {len(timestamps) / after:12,.0f} messages/sec")
+	print(f"  Speedup:             {before / after:8.1f}x")
+
+if __name__ == '__main__':
+	main()
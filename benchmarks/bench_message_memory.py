@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# Memory benchmark for the message objects held while a backup is parsed.
+# Compares the original SMSMsg / MMSMsg (per-instance __dict__, string type_, an empty
+# extra dict on every SMS, a fresh sender string per message) with the slotted classes.
+# Message bodies and image payloads are shared between the variants, so the figures are
+# the per-message overhead on top of the text itself.
+#
+# Usage: python benchmarks/bench_message_memory.py [--messages 1000000]
+
+import os
+import sys
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smsxml2html import SMSMsg, MMSMsg
+
+class LegacySMSMsg:
+	"""SMSMsg as it was before __slots__"""
+	def __init__(self, timestamp, text, type_, extra):
+		self.timestamp = timestamp
+		self.text = text if text else ""
+		self.type_ = type_
+		self.extra = extra
+		self.sender_address = None
+		self.sender_name = None
+
+class LegacyMMSMsg(LegacySMSMsg):
+	def __init__(self, timestamp=0, text="", type_=1, extra=None):
+		if extra is None:
+			extra = {}
+		LegacySMSMsg.__init__(self, timestamp, text, type_, extra)
+		self.images = []
+
+def fresh(value):
+	"""A new string object equal to value, as lxml returns for every attribute read"""
+	return (value + '.')[:-1]
+
+def makeFields(count, mms_ratio, seed=1):
+	"""Synthetic parsed attributes: (is_mms, timestamp, body, type, address, name) per message"""
+	rng = random.Random(seed)
+	contacts = [(f"1555{n:07d}", f"Contact {n}") for n in range(200)]
+	bodies = [' '.join('word' for _ in range(rng.randint(1, 25))) for _ in range(1000)]
+	fields = []
+	timestamp = 1325376000000
+	for _ in range(count):
+		timestamp += rng.randint(1000, 600000)
+		address, name = rng.choice(contacts)
+		is_mms = rng.random() < mms_ratio
+		received = rng.random() < 0.5
+		if is_mms:
+			type_ = '137' if received else '151'
+		else:
+			type_ = '1' if received else '2'
+		fields.append((is_mms, timestamp, rng.choice(bodies), type_, address, name))
+	return fields
+
+IMAGE_URI = 'data:image/jpeg;base64,' + 'A' * 64
+
+def buildLegacy(fields, carrier_number):
+	messages = []
+	for is_mms, timestamp, body, type_, address, name in fields:
+		if is_mms:
+			msg = LegacyMMSMsg()
+			msg.timestamp = timestamp
+			msg.text = body
+			msg.type_ = fresh(type_)
+			msg.images.append(IMAGE_URI)
+		else:
+			msg = LegacySMSMsg(timestamp, body, fresh(type_), {})
+		received = type_ in ('1', '137')
+		msg.sender_address = fresh(address) if received else carrier_number
+		msg.sender_name = fresh(name) if received else 'You'
+		messages.append(msg)
+	return messages
+
+def buildSlotted(fields, carrier_number):
+	messages = []
+	for is_mms, timestamp, body, type_, address, name in fields:
+		if is_mms:
+			msg = MMSMsg(timestamp, body, fresh(type_))
+			msg.images.append(IMAGE_URI)
+		else:
+			msg = SMSMsg(timestamp, body, fresh(type_))
+		if type_ in ('1', '137'):
+			msg.setSender(fresh(address), fresh(name))
+		else:
+			msg.setSender(carrier_number, 'You')
+		messages.append(msg)
+	return messages
+
+def bytesPerMessage(build, fields, carrier_number):
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	messages = build(fields, carrier_number)
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	per_message = (after - before) / len(messages)
+	del messages
+	return per_message
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark the memory used per parsed message')
+	parser.add_argument('--messages', type=int, default=1000000,
+				help='Number of messages in each synthetic corpus (default: 1000000)')
+	args = parser.parse_args()
+	carrier_number = '15550009999'
+	
+	for label, mms_ratio in (('SMS only', 0.0), ('Mixed (20% MMS)', 0.2)):
+		fields = makeFields(args.messages, mms_ratio)
+		before = bytesPerMessage(buildLegacy, fields, carrier_number)
+		after = bytesPerMessage(buildSlotted, fields, carrier_number)
+		print(f"{label}: {len(fields)} messages")
+		print(f"  __dict__ messages:  {before:8.1f} bytes/message")
+		print(f"  Slotted messages:   {after:8.1f} bytes/message")
+		print(f"  Reduction:          {(1 - after / before) * 100:8.1f}%\n")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# Benchmark for parsing attachment-heavy backups. Attachments are base64 in the data attribute of
+# each MMS <part>, so they are most of the bytes lxml has to parse. Compares parseBackupFile as it
+# is with parseBackupFile handing lxml the path of the backup, i.e. etree.iterparse(path) with no
+# filtering. Only --streaming mode filters (PartPayloadFilter empties every payload there), so the
+# default mode rows check that nothing else got slower. Each mode is timed on an image-only backup
+# and on the same backup with video clips, and both variants must produce the same conversations.
+#
+# Usage: python benchmarks/bench_mms_parsing.py [--sms 5000] [--mms 3000] [--image-kb 60] [--video-kb 1500]
+
+import io
+import os
+import sys
+import time
+import hashlib
+import tempfile
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import smsxml2html
+from smsxml2html import parseBackupFile, parseCarrierNumber, imagePayload
+from synthetic_backup import writeBackup, addArguments, generatorOptions, CARRIER_NUMBER
+
+def unfilteredSource(input_file, byte_range=None, streaming=False):
+	"""Stand-in for openBackupSource that lets lxml read the file itself"""
+	return input_file
+
+def summarize(conversations):
+	"""Everything the rest of the pipeline sees of the parsed messages"""
+	summary = {}
+	for conv_key, conv in conversations.items():
+		for timestamp, msg in conv['messages'].items():
+			images = tuple((mime, hashlib.sha256(data.encode('ascii')).hexdigest())
+			               for mime, data in map(imagePayload, getattr(msg, 'images', ())))
+			summary[(conv_key, timestamp)] = (msg.type_, msg.sender_address, msg.sender_name, msg.text, images)
+	return summary
+
+def timeParse(xml_path, streaming, open_source):
+	"""Wall time of one parse with open_source in place of openBackupSource, and the parsed conversations"""
+	original = smsxml2html.openBackupSource
+	smsxml2html.openBackupSource = open_source
+	try:
+		conversations = {}
+		start = time.perf_counter()
+		with contextlib.redirect_stdout(io.StringIO()):
+			parseBackupFile(xml_path, conversations, parseCarrierNumber(CARRIER_NUMBER), {}, streaming)
+		return time.perf_counter() - start, conversations
+	finally:
+		smsxml2html.openBackupSource = original
+
+def compareParses(xml_path, streaming, repeat):
+	"""Best times of the unfiltered and current parse, run alternately, and their summaries"""
+	variants = (unfilteredSource, smsxml2html.openBackupSource)
+	best = [None, None]
+	summaries = [None, None]
+	for _ in range(repeat):
+		for i, open_source in enumerate(variants):
+			elapsed, conversations = timeParse(xml_path, streaming, open_source)
+			best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+			summaries[i] = summarize(conversations)
+	return best, summaries
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark parsing of attachment-heavy backups with and without payload filtering')
+	addArguments(parser)
+	parser.add_argument('--repeat', type=int, default=3,
+				help='Runs per variant; the best time is reported (default: 3)')
+	parser.set_defaults(sms=5000, mms=3000, image_kb=60, images_per_mms=2, video_kb=1500)
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory(prefix='smsxml2html_bench_') as workdir:
+		backups = [('images', dict(generatorOptions(args), video_kb=0))]
+		if args.video_kb:
+			backups.append(('images+video', generatorOptions(args)))
+
+		print(f"  {'Backup':<14}{'MB':>6}  {'Mode':<12}{'iterparse(path) s':>19}{'Current s':>11}{'MB/s':>8}{'Speedup':>9}")
+		for label, options in backups:
+			xml_path = os.path.join(workdir, f'{label}.xml')
+			writeBackup(xml_path, **options)
+			size_mb = os.path.getsize(xml_path) / (1024 * 1024)
+			for mode, streaming in (('default', False), ('streaming', True)):
+				(before, after), (expected, result) = compareParses(xml_path, streaming, args.repeat)
+				if result != expected:
+					print(f"ERROR: parse of the {label} backup does not match iterparse(path) in {mode} mode")
+					sys.exit(1)
+				print(f"  {label:<14}{size_mb:>6.0f}  {mode:<12}{before:>19.3f}{after:>11.3f}{size_mb / after:>8.0f}{before / after:>8.1f}x")
+			os.remove(xml_path)
+
+if __name__ == '__main__':
+	main()
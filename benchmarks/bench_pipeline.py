@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+# End-to-end benchmark: generates a synthetic backup (see synthetic_backup.py), then times
+# parsing, rendering and writing it separately and records throughput, peak RSS and output
+# size in a JSON file. Pass --baseline with an earlier results file to see what changed.
+#
+# Rendering streams rows into the conversation files as it builds them, so the render phase
+# includes the write() calls; the write phase is the fsync of every output file, i.e. what
+# it takes for the archive to actually reach the disk.
+#
+# Usage: python benchmarks/bench_pipeline.py [--sms 100000] [--mms 10000] [--results run.json] [--baseline old.json]
+
+import io
+import os
+import sys
+import json
+import time
+import locale
+import argparse
+import platform
+import tempfile
+import contextlib
+try:
+	import resource
+except ImportError:  # Windows
+	resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, 'benchmark_results.json')
+
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+from smsxml2html import parseBackupFile, dumpConversations, parseCarrierNumber, parseChunkPolicy, DEFAULT_CHUNK_POLICY
+from synthetic_backup import writeBackup, addArguments, generatorOptions, CARRIER_NUMBER
+
+def peakRSS():
+	"""Peak resident set size so far in MB (this process plus finished worker processes), or None"""
+	if resource is None:
+		return None
+	scale = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+	peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+	return round(peak * scale / (1024 * 1024), 1)
+
+def cpuTime():
+	"""CPU seconds used by this process and its finished worker processes"""
+	if resource is None:
+		return time.process_time()
+	return sum(r.ru_utime + r.ru_stime for r in (resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)))
+
+@contextlib.contextmanager
+def phase(results, name, verbose):
+	"""Record wall time, CPU time and peak RSS of the enclosed block under results[name]"""
+	output = io.StringIO()
+	wall_start = time.perf_counter()
+	cpu_start = cpuTime()
+	with contextlib.redirect_stdout(sys.stdout if verbose else output):
+		yield
+	results[name] = {
+		'wall_s': round(time.perf_counter() - wall_start, 3),
+		'cpu_s': round(cpuTime() - cpu_start, 3),
+		'peak_rss_mb': peakRSS()
+	}
+
+def treeSize(path):
+	"""Total bytes and number of files under path"""
+	total = 0
+	files = 0
+	for dirpath, _, filenames in os.walk(path):
+		for filename in filenames:
+			total += os.path.getsize(os.path.join(dirpath, filename))
+			files += 1
+	return total, files
+
+def fsyncTree(path):
+	for dirpath, _, filenames in os.walk(path):
+		for filename in filenames:
+			fd = os.open(os.path.join(dirpath, filename), os.O_RDONLY)
+			try:
+				os.fsync(fd)
+			finally:
+				os.close(fd)
+
+def runBenchmark(args, workdir):
+	xml_path = os.path.join(workdir, 'synthetic.xml')
+	output_dir = os.path.join(workdir, 'output')
+	carrier_number = parseCarrierNumber(CARRIER_NUMBER)
+	phases = {}
+	
+	with phase(phases, 'generate', args.verbose):
+		messages = writeBackup(xml_path, **generatorOptions(args))
+	
+	conversations = {}
+	contacts = {}
+	with phase(phases, 'parse', args.verbose):
+		parseBackupFile(xml_path, conversations, carrier_number, contacts, args.streaming)
+	
+	sorted_conv_keys = sorted(conversations.keys(),
+	                          key=lambda k: max(conversations[k]['messages'].keys()) if conversations[k]['messages'] else 0,
+	                          reverse=True)
+	with phase(phases, 'render', args.verbose):
+		dumpConversations(output_dir, conversations, carrier_number, sorted_conv_keys, xml_path,
+		                  args.extract_images, args.jobs, None, args.search_index, args.chunk_policy, contacts=contacts)
+	
+	with phase(phases, 'write', args.verbose):
+		fsyncTree(output_dir)
+	
+	for name in ('parse', 'render', 'write'):
+		wall = phases[name]['wall_s']
+		phases[name]['messages_per_s'] = round(messages / wall) if wall else None
+	output_bytes, output_files = treeSize(output_dir)
+	return {
+		'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'cpus': os.cpu_count(),
+		'options': dict(generatorOptions(args), jobs=args.jobs, streaming=args.streaming,
+		                extract_images=args.extract_images, search_index=args.search_index,
+		                chunk_policy=list(args.chunk_policy)),
+		'messages': messages,
+		'conversations': len(conversations),
+		'input_bytes': os.path.getsize(xml_path),
+		'output_bytes': output_bytes,
+		'output_files': output_files,
+		'phases': phases
+	}
+
+def printResults(results, baseline=None):
+	print(f"{results['messages']} messages in {results['conversations']} conversations, "
+	      f"{results['input_bytes'] / (1024 * 1024):.1f} MB of XML -> "
+	      f"{results['output_bytes'] / (1024 * 1024):.1f} MB in {results['output_files']} files\n")
+	print(f"  {'Phase':<10}{'Wall s':>10}{'CPU s':>10}{'Msgs/s':>12}{'Peak RSS MB':>13}{'vs baseline':>14}")
+	for name, stats in results['phases'].items():
+		change = ''
+		old = (baseline or {}).get('phases', {}).get(name)
+		if old and old['wall_s']:
+			change = f"{(stats['wall_s'] / old['wall_s'] - 1) * 100:+.1f}%"
+		rate = f"{stats['messages_per_s']:,}" if stats.get('messages_per_s') else '-'
+		rss = stats['peak_rss_mb'] if stats['peak_rss_mb'] is not None else '-'
+		print(f"  {name:<10}{stats['wall_s']:>10.3f}{stats['cpu_s']:>10.3f}{rate:>12}{rss:>13}{change:>14}")
+	if baseline and baseline.get('options') != results['options']:
+		print("\n  Note: the baseline was run with different options")
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark parsing, rendering and writing a synthetic backup')
+	addArguments(parser)
+	parser.add_argument('-j', '--jobs', type=int, default=1,
+				help='Worker processes used to render conversations (default: 1)')
+	parser.add_argument('--streaming', action='store_true',
+				help='Parse in streaming mode')
+	parser.add_argument('--extract-images', action='store_true',
+				help='Write images to conv_files/media/ instead of embedding them')
+	parser.add_argument('--search-index', action='store_true',
+				help='Also build the search index')
+	parser.add_argument('--chunk-policy', type=parseChunkPolicy, default=DEFAULT_CHUNK_POLICY,
+				help=f'Chunk policy used when rendering (default: {DEFAULT_CHUNK_POLICY})')
+	parser.add_argument('--results', type=str, default=DEFAULT_RESULTS,
+				help='JSON file the results are written to (default: benchmarks/benchmark_results.json)')
+	parser.add_argument('--baseline', type=str,
+				help='Results file of an earlier run to compare against')
+	parser.add_argument('--workdir', type=str,
+				help='Directory for the generated backup and output (default: a temporary directory, removed afterwards)')
+	parser.add_argument('--verbose', action='store_true',
+				help="Show the converter's own progress output")
+	args = parser.parse_args()
+	locale.setlocale(locale.LC_ALL, '')
+	
+	baseline = None
+	if args.baseline:
+		with open(args.baseline, 'r', encoding='utf-8') as bf:
+			baseline = json.load(bf)
+	
+	if args.workdir:
+		os.makedirs(args.workdir, exist_ok=True)
+		results = runBenchmark(args, args.workdir)
+	else:
+		with tempfile.TemporaryDirectory(prefix='smsxml2html_bench_') as workdir:
+			results = runBenchmark(args, workdir)
+	
+	with open(args.results, 'w', encoding='utf-8') as rf:
+		json.dump(results, rf, indent=2)
+	printResults(results, baseline)
+	print(f"\nResults written to {args.results}")
+
+if __name__ == '__main__':
+	main()
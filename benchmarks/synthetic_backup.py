@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+# Synthetic SMS Backup & Restore XML for benchmarks.
+# Writes a backup shaped like the real app's output: <sms> elements for one-to-one texts and
+# <mms> elements with <parts> (SMIL, text and image parts with base64 data) and <addrs>
+# (type 137 sender, 151 recipients), including group threads whose address attribute is a
+# ~-separated list with a matching comma-separated contact_name.
+#
+# Usage: python benchmarks/synthetic_backup.py OUT.xml [--sms 100000] [--mms 10000] [--image-kb 100]
+
+import random
+import argparse
+import base64
+import datetime
+from xml.sax.saxutils import quoteattr
+
+CARRIER_NUMBER = '15550009999'
+
+WORDS = ('ok', 'yes', 'no', 'lol', 'see', 'you', 'at', 'the', 'store', 'tonight', 'dinner', 'running',
+         'late', 'traffic', 'call', 'me', 'when', 'free', 'love', 'it', 'thanks', 'happy', 'birthday',
+         'where', 'are', 'we', 'meeting', 'sounds', 'good', 'on', 'my', 'way', 'did', 'get', 'photos',
+         'weekend', 'plans', 'movie', 'coffee', 'tomorrow', 'morning', 'work', 'home', 'soon', 'great')
+EXTRAS = (' :)', ' 😂', ' ❤️', ' & more', ' <3', ' "quoted"', " it's", '!!', '?', ' 👍')
+
+def messageBody(rng):
+	"""A short text message, sometimes with emoji or characters that need escaping"""
+	body = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 30)))
+	if rng.random() < 0.3:
+		body += rng.choice(EXTRAS)
+	if rng.random() < 0.05:
+		body += '\nSecond line'
+	return body[0].upper() + body[1:]
+
+def makeContacts(count, rng):
+	"""(address as stored by the phone, display name) pairs in the mix of formats seen in backups"""
+	contacts = []
+	for n in range(count):
+		digits = f"555{n:07d}"
+		style = rng.random()
+		if style < 0.5:
+			address = digits
+		elif style < 0.8:
+			address = '+1' + digits
+		else:
+			address = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+		name = f"Contact {n}" if rng.random() < 0.85 else '(Unknown)'
+		contacts.append((address, name))
+	return contacts
+
+def smsElement(timestamp, contact, rng):
+	address, name = contact
+	type_ = '1' if rng.random() < 0.5 else '2'
+	return (f'  <sms protocol="0" address={quoteattr(address)} date="{timestamp}" type="{type_}" '
+	        f'body={quoteattr(messageBody(rng))} read="1" status="-1" locked="0" '
+	        f'contact_name={quoteattr(name)} />\n')
+
+def mmsElement(timestamp, members, image_count, image_bytes, rng, video_bytes=0):
+	"""An <mms> to or from members (a list of contacts; more than one makes it a group thread)
+	
+	With video_bytes the attachment is a video clip of that size instead of the images.
+	"""
+	received = rng.random() < 0.5
+	sender_address = rng.choice(members)[0] if received else None
+	address = '~'.join(addr for addr, _ in members)
+	contact_name = ', '.join(name for _, name in members)
+	
+	parts = ['    <part seq="-1" ct="application/smil" name="null" chset="null" cl="smil.xml" '
+	         'text=\'&lt;smil&gt;&lt;body&gt;&lt;par dur="5000ms"&gt;&lt;/par&gt;&lt;/body&gt;&lt;/smil&gt;\' />\n']
+	if video_bytes:
+		data = base64.b64encode(rng.randbytes(video_bytes)).decode('ascii')
+		parts.append(f'    <part seq="0" ct="video/mp4" name="VID_{timestamp}.mp4" chset="null" '
+		             f'cl="VID_{timestamp}.mp4" text="null" data="{data}" />\n')
+		image_count = 1  # The text part follows the clip
+	else:
+		for seq in range(image_count):
+			data = base64.b64encode(rng.randbytes(image_bytes)).decode('ascii')
+			parts.append(f'    <part seq="{seq}" ct="image/jpeg" name="IMG_{timestamp}_{seq}.jpg" chset="null" '
+			             f'cl="IMG_{timestamp}_{seq}.jpg" text="null" data="{data}" />\n')
+	if image_count == 0 or rng.random() < 0.4:
+		parts.append(f'    <part seq="{image_count}" ct="text/plain" name="null" chset="106" cl="text_0.txt" '
+		             f'text={quoteattr(messageBody(rng))} />\n')
+	
+	addrs = []
+	for addr, _ in members:
+		addr_type = '137' if addr == sender_address else '151'
+		addrs.append(f'    <addr address={quoteattr(addr)} type="{addr_type}" charset="106" />\n')
+	addrs.append(f'    <addr address="{CARRIER_NUMBER}" type="{"151" if received else "137"}" charset="106" />\n')
+	
+	return (f'  <mms date="{timestamp}" ct_t="application/vnd.wap.multipart.related" msg_box="{1 if received else 2}" '
+	        f'address={quoteattr(address)} read="1" locked="0" contact_name={quoteattr(contact_name)}>\n'
+	        f'    <parts>\n{"".join(parts)}    </parts>\n'
+	        f'    <addrs>\n{"".join(addrs)}    </addrs>\n'
+	        f'  </mms>\n')
+
+def writeBackup(path, sms=100000, mms=10000, image_kb=100, images_per_mms=1, contacts=500,
+                groups=50, group_size=4, group_ratio=0.3, video_kb=0, video_ratio=0.1, years=5, seed=1):
+	"""Write a synthetic backup to path; returns the number of messages written
+	
+	mms messages carry images_per_mms images of image_kb KB each (0 for text-only MMS), or with
+	video_kb, video_ratio of them a video clip of video_kb KB instead; group_ratio of them go to
+	one of groups group threads of group_size other people.
+	"""
+	rng = random.Random(seed)
+	people = makeContacts(contacts, rng)
+	group_threads = [rng.sample(people, min(group_size, len(people))) for _ in range(groups)]
+	# Real backups are dominated by a handful of busy threads
+	weights = [1 / (rank + 1) for rank in range(len(people))]
+	
+	total = sms + mms
+	start = int(datetime.datetime(2024 - years, 1, 1).timestamp() * 1000)
+	span = years * 365 * 86400000
+	timestamps = sorted(start + rng.randrange(span) for _ in range(total))
+	kinds = [True] * mms + [False] * sms
+	rng.shuffle(kinds)
+	
+	with open(path, 'w', encoding='utf-8') as out:
+		out.write("<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>\n")
+		out.write('<!--File Created By SMS Backup & Restore (synthetic benchmark data)-->\n')
+		out.write('<?xml-stylesheet type="text/xsl" href="sms.xsl"?>\n')
+		out.write(f'<smses count="{total}" backup_set="synthetic" backup_date="{start + span}" type="full">\n')
+		for timestamp, is_mms in zip(timestamps, kinds):
+			if is_mms:
+				if group_threads and rng.random() < group_ratio:
+					members = rng.choice(group_threads)
+				else:
+					members = rng.choices(people, weights)
+				video = video_kb and rng.random() < video_ratio
+				out.write(mmsElement(timestamp, members, images_per_mms, image_kb * 1024, rng, video_kb * 1024 if video else 0))
+			else:
+				out.write(smsElement(timestamp, rng.choices(people, weights)[0], rng))
+		out.write('</smses>\n')
+	return total
+
+def addArguments(parser):
+	"""Generator options, shared with the benchmarks that build their own backups"""
+	parser.add_argument('--sms', type=int, default=100000,
+				help='Number of SMS messages (default: 100000)')
+	parser.add_argument('--mms', type=int, default=10000,
+				help='Number of MMS messages (default: 10000)')
+	parser.add_argument('--image-kb', type=int, default=100,
+				help='Size of each MMS image in KB (default: 100)')
+	parser.add_argument('--images-per-mms', type=int, default=1,
+				help='Images attached to each MMS; 0 for text-only MMS (default: 1)')
+	parser.add_argument('--video-kb', type=int, default=0,
+				help='Size of each MMS video clip in KB; 0 for no videos (default: 0)')
+	parser.add_argument('--video-ratio', type=float, default=0.1,
+				help='Fraction of MMS carrying a video clip instead of images when --video-kb is set (default: 0.1)')
+	parser.add_argument('--contacts', type=int, default=500,
+				help='Number of distinct contacts (default: 500)')
+	parser.add_argument('--groups', type=int, default=50,
+				help='Number of group threads (default: 50)')
+	parser.add_argument('--group-size', type=int, default=4,
+				help='Other people in each group thread (default: 4)')
+	parser.add_argument('--group-ratio', type=float, default=0.3,
+				help='Fraction of MMS sent to group threads (default: 0.3)')
+	parser.add_argument('--seed', type=int, default=1,
+				help='Random seed; the same options and seed give the same file (default: 1)')
+
+def generatorOptions(args):
+	return {'sms': args.sms, 'mms': args.mms, 'image_kb': args.image_kb, 'images_per_mms': args.images_per_mms,
+	        'contacts': args.contacts, 'groups': args.groups, 'group_size': args.group_size,
+	        'group_ratio': args.group_ratio, 'video_kb': args.video_kb, 'video_ratio': args.video_ratio,
+	        'seed': args.seed}
+
+def main():
+	parser = argparse.ArgumentParser(description='Write a synthetic SMS Backup & Restore XML file')
+	parser.add_argument('output', type=str,
+				help='XML file to write')
+	addArguments(parser)
+	args = parser.parse_args()
+	total = writeBackup(args.output, **generatorOptions(args))
+	print(f"Wrote {total} messages to {args.output} (your number: {CARRIER_NUMBER})")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# Local static server for smsxml2html output folders.
+# Serves the .br/.gz siblings written by --compress with Content-Encoding when the browser
+# accepts them, and lets browsers cache versioned conversation files and content-addressed
+# media indefinitely while messages.html is always revalidated.
+#
+# Usage: python serve_archive.py OUTPUT/backup_0001 [--port 8000] [--bind 127.0.0.1]
+
+import os
+import argparse
+import datetime
+import email.utils
+import functools
+import http.server
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+# Preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+CACHE_FOREVER = 'public, max-age=31536000, immutable'
+CACHE_REVALIDATE = 'no-cache'
+# Only a file actually served (or confirmed unchanged) may be cached; errors are always revalidated
+CACHEABLE_STATUSES = (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED)
+
+def acceptedEncodings(header):
+	"""Content codings allowed by an Accept-Encoding header (those not given q=0)"""
+	accepted = set()
+	for item in (header or '').split(','):
+		coding, _, params = item.strip().partition(';')
+		quality = params.strip()
+		if quality.startswith('q='):
+			try:
+				if float(quality[2:]) == 0:
+					continue
+			except ValueError:
+				continue
+		if coding:
+			accepted.add(coding.strip().lower())
+	return accepted
+
+class ArchiveRequestHandler(http.server.SimpleHTTPRequestHandler):
+	"""SimpleHTTPRequestHandler that prefers precompressed siblings and sets cache lifetimes"""
+	status = None
+	vary = False  # Whether the requested file has precompressed siblings
+	
+	def send_response_only(self, code, message=None):
+		self.status = code
+		super().send_response_only(code, message)
+	
+	def cacheControl(self):
+		if self.status not in CACHEABLE_STATUSES:
+			return CACHE_REVALIDATE
+		url = urlsplit(self.path)
+		# Conversation files are requested as name.js?v=<version>; media files are named by their sha256
+		if 'v' in parse_qs(url.query) or '/conv_files/media/' in url.path:
+			return CACHE_FOREVER
+		return CACHE_REVALIDATE
+	
+	def end_headers(self):
+		self.send_header('Cache-Control', self.cacheControl())
+		# Also on uncompressed responses, so a shared cache never hands them to a client that accepts br/gzip
+		if self.vary:
+			self.send_header('Vary', 'Accept-Encoding')
+		super().end_headers()
+	
+	def notModified(self, mtime):
+		"""Whether the request's If-Modified-Since covers mtime, as SimpleHTTPRequestHandler checks it"""
+		if 'If-Modified-Since' not in self.headers or 'If-None-Match' in self.headers:
+			return False
+		try:
+			since = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+		except (TypeError, IndexError, OverflowError, ValueError):
+			return False
+		if since.tzinfo is None:
+			since = since.replace(tzinfo=datetime.timezone.utc)
+		if since.tzinfo is not datetime.timezone.utc:
+			return False
+		modified = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc).replace(microsecond=0)
+		return modified <= since
+	
+	def send_head(self):
+		path = self.translate_path(self.path)
+		self.vary = False
+		if not os.path.isfile(path):
+			return super().send_head()
+		self.vary = any(os.path.isfile(path + suffix) for encoding, suffix in ENCODINGS)
+		accepted = acceptedEncodings(self.headers.get('Accept-Encoding'))
+		source_stat = os.stat(path)
+		for encoding, suffix in ENCODINGS:
+			if encoding not in accepted:
+				continue
+			try:
+				f = open(path + suffix, 'rb')
+			except OSError:
+				continue
+			stat = os.fstat(f.fileno())
+			if stat.st_mtime_ns < source_stat.st_mtime_ns:
+				f.close()  # Left over from before the file was rewritten
+				continue
+			# Last-Modified is the source file's, so revalidation works whichever encoding was sent
+			if self.notModified(source_stat.st_mtime):
+				f.close()
+				self.send_response(HTTPStatus.NOT_MODIFIED)
+				self.end_headers()
+				return None
+			self.send_response(200)
+			self.send_header('Content-Type', self.guess_type(path))
+			self.send_header('Content-Encoding', encoding)
+			self.send_header('Content-Length', str(stat.st_size))
+			self.send_header('Last-Modified', email.utils.formatdate(source_stat.st_mtime, usegmt=True))
+			self.end_headers()
+			return f
+		return super().send_head()
+
+def main():
+	parser = argparse.ArgumentParser(description='Serve an smsxml2html output folder over HTTP, using precompressed files where possible')
+	parser.add_argument('directory', type=str,
+				help='Output folder containing messages.html')
+	parser.add_argument('-p', '--port', type=int, default=8000,
+				help='Port to listen on (default: 8000)')
+	parser.add_argument('-b', '--bind', type=str, default='127.0.0.1',
+				help='Address to listen on; use 0.0.0.0 to serve other machines (default: 127.0.0.1)')
+	args = parser.parse_args()
+	if not os.path.isdir(args.directory):
+		parser.error(f"not a directory: {args.directory}")
+	
+	handler = functools.partial(ArchiveRequestHandler, directory=args.directory)
+	with http.server.ThreadingHTTPServer((args.bind, args.port), handler) as server:
+		print(f"Serving {args.directory} at http://{args.bind}:{args.port}/messages.html (Ctrl+C to stop)")
+		try:
+			server.serve_forever()
+		except KeyboardInterrupt:
+			print("\nStopped")
+
+if __name__ == '__main__':
+	main()
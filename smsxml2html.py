@@ -8,15 +8,33 @@
 
 import os
 import hashlib
+import json
+import itertools
 import sys
 from lxml import etree
 import argparse
 import base64
+import binascii
+import functools
+import abc
 import re
 import time
 import datetime
 import locale
+import sqlite3
+import gzip
+import cProfile
+import tracemalloc
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+try:
+	import brotli  # Optional, for --compress br
+except ImportError:
+	brotli = None
+try:
+	import resource  # Peak memory for --profile; not available on Windows
+except ImportError:
+	resource = None
 
 STYLESHEET_TEMPLATE = """
 body {
@@ -286,6 +304,9 @@ h2 {
 	width: 100%;
 	border-collapse: collapse;
 }
+.virtual-list .messages_table {
+	table-layout: fixed;
+}
 .messages_table th {
 	background-color: #f0f0f0;
 	padding: 10px;
@@ -373,6 +394,29 @@ h2 {
 .image-modal-close:hover {
 	color: #bbb;
 }
+.search-results {
+	border-bottom: 2px solid #2196F3;
+}
+.search-results-title {
+	padding: 8px 20px;
+	font-size: 12px;
+	font-weight: 600;
+	color: #666;
+	background-color: #f5f5f5;
+	text-transform: uppercase;
+}
+.search-result {
+	padding: 10px 20px;
+	border-bottom: 1px solid #e0e0e0;
+	cursor: pointer;
+}
+.search-result:hover {
+	background-color: #f5f5f5;
+}
+.search-result-month {
+	font-size: 13px;
+	color: #666;
+}
 .single-conversation {
 	padding: 20px;
 }
@@ -422,6 +466,19 @@ body.dark-mode .conversation-preview {
 body.dark-mode .conversation-date {
 	color: #808080;
 }
+body.dark-mode .search-results-title {
+	background-color: #252525;
+	color: #a0a0a0;
+}
+body.dark-mode .search-result {
+	border-bottom: 1px solid #404040;
+}
+body.dark-mode .search-result:hover {
+	background-color: #3a3a3a;
+}
+body.dark-mode .search-result-month {
+	color: #a0a0a0;
+}
 body.dark-mode .conversation-details {
 	background-color: #252525;
 	border-bottom: 2px solid #404040;
@@ -499,49 +556,39 @@ body.dark-mode .messages_table {
 """
 
 class SMSMsg:
-	def __init__(self, timestamp, text, type_, extra):
+	# Slotted: backups hold millions of messages and a per-instance __dict__ dominated their memory
+	__slots__ = ('timestamp', 'text', 'type_', 'extra', 'sender_address', 'sender_name')
+	
+	def __init__(self, timestamp, text, type_, extra=None):
 		self.timestamp = timestamp
 		if isinstance(text, bytes):
 			self.text = text.decode('utf8')
 		else:
 			self.text = text if text else ""
-		self.type_ = type_
-		self.extra = extra
+		try:
+			self.type_ = int(type_)
+		except (TypeError, ValueError):
+			self.type_ = 0
+		self.extra = extra or None  # Only kept when there is something in it
 		self.sender_address = None  # Who sent this message
 		self.sender_name = None
+	
+	def setSender(self, address, name):
+		"""Record who sent the message; interned since the same few senders repeat throughout a backup"""
+		self.sender_address = sys.intern(address) if address else address
+		self.sender_name = sys.intern(name) if name else name
 		
 class MMSMsg(SMSMsg):
+	__slots__ = ('images',)
+	
 	def __init__(self, timestamp=0, text="", type_=1, extra=None):
-		if extra is None:
-			extra = {}
 		SMSMsg.__init__(self, timestamp, text, type_, extra)
 		self.images = []
 		
 	def addImageData(self, mime, data):
 		"""Add image as embedded base64 data URI"""
-		# Normalize MIME type and handle variants
-		mime_lower = mime.lower()
-		
-		# Map of MIME types to their standard format
-		mime_map = {
-		    'image/png': 'image/png',
-		    'image/jpeg': 'image/jpeg',
-		    'image/jpg': 'image/jpeg',  # Non-standard but common
-		    'image/gif': 'image/gif',
-		    'image/webp': 'image/webp',
-		    'image/avif': 'image/avif',
-		    'image/bmp': 'image/bmp',
-		    'image/svg+xml': 'image/svg+xml',
-		    'image/tiff': 'image/tiff',
-		    'image/x-icon': 'image/x-icon',
-		    'image/vnd.microsoft.icon': 'image/x-icon',
-		}
-		
-		# Check if we support this MIME type
-		if mime_lower in mime_map:
-		    mime_type = mime_map[mime_lower]
-		else:
-			print("Unknown MIME type '%s' for MMS content; omitting content" % (mime))
+		mime_type = normalizeImageMime(mime)
+		if mime_type is None:
 			return
 		
 		try:
@@ -550,12 +597,476 @@ class MMSMsg(SMSMsg):
 			self.images.append(data_uri)
 		except Exception as e:
 			print(f"Failed to process image: {e}")
+	
+	def addImageRef(self, ref):
+		"""Add image as a reference into the source XML (streaming mode)"""
+		mime_type = normalizeImageMime(ref.mime)
+		if mime_type is None:
+			return
+		ref.mime = mime_type
+		self.images.append(ref)
+
+# Map of MIME types to their standard format
+IMAGE_MIME_MAP = {
+    'image/png': 'image/png',
+    'image/jpeg': 'image/jpeg',
+    'image/jpg': 'image/jpeg',  # Non-standard but common
+    'image/gif': 'image/gif',
+    'image/webp': 'image/webp',
+    'image/avif': 'image/avif',
+    'image/bmp': 'image/bmp',
+    'image/svg+xml': 'image/svg+xml',
+    'image/tiff': 'image/tiff',
+    'image/x-icon': 'image/x-icon',
+    'image/vnd.microsoft.icon': 'image/x-icon',
+}
+
+def normalizeImageMime(mime):
+	"""Return the standard MIME type for a supported image, or None if unsupported"""
+	mime_lower = mime.lower()
+	if mime_lower in IMAGE_MIME_MAP:
+		return IMAGE_MIME_MAP[mime_lower]
+	print("Unknown MIME type '%s' for MMS content; omitting content" % (mime))
+	return None
+
+# Streaming mode: byte offsets of <sms>/<mms> elements so that image payloads
+# can be read back from the XML when their conversation is written
+SCAN_BLOCK_SIZE = 4 * 1024 * 1024
+MESSAGE_START_RE = re.compile(rb'<!--|<(sms|mms)[\s/>]')
+
+def scanMessageOffsets(input_file, block_size=SCAN_BLOCK_SIZE, start=0):
+	"""Yield (tag, byte offset) for every <sms>/<mms> start tag in a backup file, in document order
+	
+	start must be 0 or the offset of a message, so that scanning never begins inside a comment.
+	"""
+	with open(input_file, 'rb') as f:
+		f.seek(start)
+		buf = b''
+		buf_offset = start  # File offset of buf[0]
+		in_comment = False
+		while True:
+			block = f.read(block_size)
+			if not block:
+				break
+			buf += block
+			pos = 0
+			while True:
+				if in_comment:
+					end = buf.find(b'-->', pos)
+					if end < 0:
+						break
+					pos = end + 3
+					in_comment = False
+				match = MESSAGE_START_RE.search(buf, pos)
+				if match is None:
+					break
+				pos = match.end()
+				if match.group(1) is None:
+					in_comment = True
+				else:
+					yield match.group(1).decode('ascii'), buf_offset + match.start()
+			# Keep enough of the tail to recognise a tag or comment split across blocks
+			keep = max(pos, len(buf) - (2 if in_comment else 4))
+			buf_offset += keep
+			buf = buf[keep:]
+
+def readElementAt(input_file, offset, tag):
+	"""Read the raw bytes of the <tag> element starting at offset"""
+	end_tag = b'</' + tag.encode('ascii') + b'>'
+	data = bytearray()
+	with open(input_file, 'rb') as f:
+		f.seek(offset)
+		while True:
+			block = f.read(SCAN_BLOCK_SIZE)
+			if not block:
+				break
+			search_from = max(0, len(data) - len(end_tag))
+			data += block
+			end = data.find(end_tag, search_from)
+			if end >= 0:
+				del data[end + len(end_tag):]
+				break
+	return bytes(data)
+
+# Attachments are base64 in the data attribute of their <part>, and they make up almost all of a
+# backup. Payloads the parser has no use for are emptied in the byte stream before lxml sees them,
+# so they are never parsed, held in the tree or decoded into Python strings.
+DATA_ATTRIBUTE = b' data="'
+# The value of attribute name in a <part> start tag, stepping over whole quoted values so that
+# one can never be mistaken for an attribute
+PART_ATTRIBUTE_RE = rb'''<part(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|'[^']*'))*?\s+%s\s*=\s*(["'])'''
+PART_CT_RE = re.compile(PART_ATTRIBUTE_RE % b'ct')
+PART_DATA_RE = re.compile(PART_ATTRIBUTE_RE % b'data')
+FILTER_BLOCK_SIZE = 1024 * 1024
+
+def partContentType(buf, start):
+	"""The ct of the <part> start tag at buf[start], or None if it is not (yet) in buf"""
+	match = PART_CT_RE.match(buf, start)
+	if match is None:
+		return None
+	close = buf.find(match.group(1), match.end())
+	if close < 0:
+		return None
+	return bytes(buf[match.end():close])
+
+class PartPayloadFilter:
+	"""File-like wrapper over a backup stream that empties the data of <part> elements, for iterparse
+	
+	With keep_images, image parts keep their data (it is embedded in the output) and only other
+	attachments such as video and audio are emptied; without it every part is. Anything the
+	filter does not recognise is passed on unchanged, so it can only ever skip less.
+	"""
+	def __init__(self, source, keep_images):
+		self.source = source
+		self.keep_images = keep_images
+		self.buf = bytearray()  # Input not yet filtered
+		self.scan_from = 0  # Where in buf to resume looking for data attributes
+		self.out = b''  # Filtered block being read
+		self.out_pos = 0
+		self.eof = False
+	
+	def filterBlock(self):
+		"""Read one block from the source and return the filtered input up to the last complete tag"""
+		block = self.source.read(FILTER_BLOCK_SIZE)
+		if not block:
+			self.eof = True
+		buf = self.buf
+		buf += block
+		pieces = []
+		view = memoryview(buf)
+		pos = self.scan_from
+		emitted = 0
+		keep = None
+		while True:
+			at = buf.find(DATA_ATTRIBUTE, pos)
+			if at < 0:
+				break
+			# '<' is not allowed in attribute values, so the nearest one before is the start of the tag
+			start = buf.rfind(b'<', emitted, at)
+			if start >= 0 and self.keep_images:
+				ct = partContentType(buf, start)
+				if ct is None or b'image' in ct:
+					start = -1
+			match = PART_DATA_RE.match(buf, start) if start >= 0 else None
+			if match is None:
+				pos = at + 1
+				continue
+			close = buf.find(match.group(1), match.end())
+			if close < 0:
+				if not self.eof:
+					keep = start  # Wait for the rest of the value
+					pos = at
+					break
+				close = len(buf)
+			pieces.append(view[emitted:match.end()])
+			emitted = pos = close
+		if self.eof:
+			keep = len(buf)
+		elif keep is None:
+			# Hold back the last tag, whose data attribute may be in the next block
+			keep = len(buf) - (len(DATA_ATTRIBUTE) - 1)
+			last_tag = buf.rfind(b'<', pos)
+			if last_tag >= 0:
+				keep = min(keep, last_tag)
+			keep = max(keep, emitted)
+		pieces.append(view[emitted:keep])
+		data = b''.join(pieces)
+		pieces.clear()
+		view.release()
+		del buf[:keep]
+		self.scan_from = max(pos - keep, 0)
+		return data
+	
+	def read(self, size=-1):
+		if size is None or size < 0:
+			data = self.out[self.out_pos:]
+			while not self.eof:
+				data += self.filterBlock()
+			self.out = b''
+			self.out_pos = 0
+			return data
+		while self.out_pos >= len(self.out) and not self.eof:
+			self.out = self.filterBlock()
+			self.out_pos = 0
+		data = self.out[self.out_pos:self.out_pos + size]
+		self.out_pos += len(data)
+		return data
+	
+	def close(self):
+		self.source.close()
+
+# Parallel parsing (--parse-jobs): the backup is a flat run of <sms>/<mms> elements, so it is cut
+# into byte ranges at message starts and each range is parsed as its own small document
+class ByteRangeReader:
+	"""File-like view of bytes [start, end) of a backup wrapped in <smses>...</smses>, for iterparse"""
+	def __init__(self, input_file, start, end):
+		self.f = open(input_file, 'rb')
+		self.f.seek(start)
+		self.remaining = end - start
+		self.head = b'<smses>'
+		self.tail = b'</smses>'
+	
+	def read(self, size=-1):
+		if size is None or size < 0:
+			size = self.remaining
+		data = self.head
+		self.head = b''
+		if self.remaining > 0:
+			block = self.f.read(min(size, self.remaining))
+			self.remaining = self.remaining - len(block) if block else 0
+			data += block
+		elif self.tail:
+			data += self.tail
+			self.tail = b''
+		if not data:
+			self.f.close()
+		return data
+	
+	def close(self):
+		self.f.close()
+
+def splitBackupFile(input_file, parts):
+	"""Cut a backup into up to parts (start, end) byte ranges of about equal size, each starting at a message"""
+	first = next(scanMessageOffsets(input_file), (None, None))[1]
+	if first is None:
+		return []
+	with open(input_file, 'rb') as f:
+		size = f.seek(0, os.SEEK_END)
+		f.seek(max(first, size - SCAN_BLOCK_SIZE))
+		tail = f.read()
+	close = tail.rfind(b'</smses>')
+	end = size - len(tail) + close if close >= 0 else size
+	
+	starts = [first]
+	for i in range(1, parts):
+		target = first + (end - first) * i // parts
+		if target <= starts[-1]:
+			continue
+		# Messages never nest and backups have no comments after the first message
+		scanned = next(scanMessageOffsets(input_file, start=target), None)
+		if scanned is None or scanned[1] >= end:
+			break
+		if scanned[1] > starts[-1]:
+			starts.append(scanned[1])
+	return list(zip(starts, starts[1:] + [end]))
+
+def parseBackupRange(input_file, byte_range, carrier_number, streaming=False, debug_mode=False, dedupe=False):
+	"""Worker for parseBackupFileParallel(): parse one byte range into fresh conversations
+	
+	Returns the message records of the range in file order, as described in parseBackupFile().
+	"""
+	records = []
+	parseBackupFile(input_file, None, carrier_number, None, streaming, debug_mode,
+	                set() if dedupe else None, byte_range, records)
+	return records
+
+def parseBackupFileParallel(input_file, conversations, carrier_number, contact_map, jobs, streaming=False, debug_mode=False, seen=None):
+	"""parseBackupFile() spread over jobs worker processes, one byte range each
+	
+	Workers only turn XML into message records. The records are replayed here in file order,
+	doing what a single pass does after parsing each message: skipping duplicates, learning
+	contact names, creating conversations and naming senders from the contacts known so far.
+	"""
+	ranges = splitBackupFile(input_file, jobs)
+	if len(ranges) < 2:
+		return parseBackupFile(input_file, conversations, carrier_number, contact_map, streaming, debug_mode, seen)
+	print(f"  Parsing {len(ranges)} parts with {min(jobs, len(ranges))} worker processes...")
+	
+	msg_count = 0
+	duplicates = 0
+	type_counts = {}
+	with ProcessPoolExecutor(max_workers=jobs) as executor:
+		results = executor.map(parseBackupRange, itertools.repeat(input_file), ranges, itertools.repeat(carrier_number),
+		                       itertools.repeat(streaming), itertools.repeat(debug_mode), itertools.repeat(seen is not None))
+		for records in results:
+			for digest, save_msg, conv_key, conv_name, participants, names, unresolved in records:
+				if seen is not None:
+					# save_msg is None for a repeat within the part, already skipped by the worker
+					if save_msg is None or digest in seen:
+						duplicates += 1
+						continue
+					seen.add(digest)
+				contact_map.update(names)
+				
+				if unresolved & UNRESOLVED_SENDER:
+					address = save_msg.sender_address
+					save_msg.setSender(address, contact_map.get(address) or formatPhoneNumber(address))
+				if conv_key not in conversations:
+					if unresolved & UNRESOLVED_CONVERSATION:
+						conv_name = contact_map.get(conv_key) or conv_name
+					conversations[conv_key] = {
+						'name': conv_name,
+						'participants': participants,
+						'messages': {}
+					}
+				
+				type_counts[save_msg.type_] = type_counts.get(save_msg.type_, 0) + 1
+				conversations[conv_key]['messages'][save_msg.timestamp] = save_msg
+				msg_count += 1
+	
+	if duplicates:
+		print(f"  Skipped {duplicates} duplicate messages already seen in earlier files")
+	return msg_count, type_counts
+
+@functools.lru_cache(maxsize=2)
+def readMMSParts(input_file, offset):
+	"""Return (date, parts) for the <mms> at offset; parts holds the data of each image part, None for others"""
+	fragment = readElementAt(input_file, offset, 'mms')
+	elem = etree.fromstring(fragment, etree.XMLParser(huge_tree=True))
+	parts = []
+	for part in elem.iter('part'):
+		if "image" in part.get('ct', ''):
+			parts.append(part.get('data', ''))
+		else:
+			parts.append(None)
+	return int(elem.get('date', '0')), tuple(parts)
+
+class ImageRef(abc.ABC):
+	"""An MMS image whose payload is loaded only when its conversation is written"""
+	@abc.abstractmethod
+	def load(self):
+		"""Return the base64 payload ('' if it can't be found)"""
+	
+	@abc.abstractmethod
+	def identity(self):
+		"""Stable description of the image, used in conversation hashes instead of the payload"""
+	
+	def dataURI(self):
+		data = self.load()
+		if not data:
+			return None
+		return f"data:{self.mime};base64,{data}"
+
+class MMSImageRef(ImageRef):
+	"""An MMS image part left on disk: where its <mms> element starts and which part it is"""
+	def __init__(self, source, offset, part_index, mime, date):
+		self.source = source
+		self.offset = offset
+		self.part_index = part_index
+		self.mime = mime
+		self.date = date
+	
+	def load(self):
+		"""Read the base64 payload back from the source XML ('' if it can't be found)"""
+		try:
+			date, parts = readMMSParts(self.source, self.offset)
+		except (OSError, etree.XMLSyntaxError) as e:
+			print(f"Failed to read image from {self.source} at offset {self.offset}: {e}")
+			return ''
+		if date != self.date or self.part_index >= len(parts):
+			print(f"MMS at offset {self.offset} in {self.source} does not match message {self.date}; omitting image")
+			return ''
+		return parts[self.part_index] or ''
+	
+	def identity(self):
+		# Payload stays in the XML and its offset moves between exports
+		return (self.mime, self.part_index)
 
+# Extensions for images written out with --extract-images
+IMAGE_EXTENSIONS = {
+	'image/png': 'png',
+	'image/jpeg': 'jpg',
+	'image/gif': 'gif',
+	'image/webp': 'webp',
+	'image/avif': 'avif',
+	'image/bmp': 'bmp',
+	'image/svg+xml': 'svg',
+	'image/tiff': 'tiff',
+	'image/x-icon': 'ico',
+}
+
+def imageDataURI(img):
+	"""Resolve an MMSMsg.images entry to the data URI used as the <img> src (None to omit it)"""
+	if isinstance(img, ImageRef):
+		return img.dataURI()
+	return img
+
+def imagePayload(img):
+	"""Return (mime, base64 data) for an MMSMsg.images entry"""
+	if isinstance(img, ImageRef):
+		return img.mime, img.load()
+	header, data = img.split(',', 1)
+	return header[len('data:'):].split(';')[0], data
+
+def writeMediaFile(img, media_dir, written):
+	"""Decode an image into media_dir/<sha256>.<ext> once; returns the file name (None to omit it)
+	
+	written is the set of file names already present, so identical attachments are only
+	decoded and written the first time they are seen.
+	"""
+	mime, data = imagePayload(img)
+	if not data:
+		return None
+	try:
+		raw = base64.b64decode(data)
+	except (binascii.Error, ValueError) as e:
+		print(f"Failed to decode image: {e}")
+		return None
+	filename = f"{hashlib.sha256(raw).hexdigest()}.{IMAGE_EXTENSIONS.get(mime, 'bin')}"
+	if filename not in written:
+		media_path = os.path.join(media_dir, filename)
+		if not os.path.exists(media_path):
+			# Unique temp name so parallel workers writing the same image don't collide
+			tmp_path = f"{media_path}.{os.getpid()}.tmp"
+			with open(tmp_path, 'wb') as mf:
+				mf.write(raw)
+			os.replace(tmp_path, media_path)
+		written.add(filename)
+	return filename
+
+# Phone number normalization. Every address of every message goes through parseCarrierNumber,
+# but a backup holds only a few thousand distinct raw forms, so results are cached.
+NON_DIGITS = re.compile('[^0-9]')
+ADDRESS_CACHE_SIZE = 65536
+# Exit codes dialled before a country code (NANP, most other countries), with the fewest digits that
+# may follow. UK national numbers such as 0115 496 0123 have only 8 digits after 011, so they are kept.
+INTERNATIONAL_PREFIXES = (('011', 9), ('00', 8))
+E164_MAX_DIGITS = 15
+# ITU-T E.164 country codes; no code is a prefix of another, so the first match is the only one
+COUNTRY_CODES = frozenset(['1', '7'] + [str(code) for code in (
+	20, 27, 30, 31, 32, 33, 34, 36, 39, 40, 41, 43, 44, 45, 46, 47, 48, 49, 51, 52, 53, 54, 55, 56, 57, 58,
+	60, 61, 62, 63, 64, 65, 66, 81, 82, 84, 86, 90, 91, 92, 93, 94, 95, 98,
+	211, 212, 213, 216, 218, *range(220, 259), *range(260, 270), 290, 291, 297, 298, 299,
+	*range(350, 360), *range(370, 384), 385, 386, 387, 389, 420, 421, 423, *range(500, 510), *range(590, 600),
+	670, *range(672, 684), *range(685, 693), 800, 808, 850, 852, 853, 855, 856, 870, 878, 880, 881, 882, 883,
+	886, 888, *range(960, 969), *range(970, 978), 979, *range(992, 997), 998)])
+# Bumped whenever parseCarrierNumber changes the keys it produces, invalidating --index
+# databases and incremental manifests built with the old keys
+ADDRESS_FORMAT = 3
+
+def isInternationalNumber(digits, min_length):
+	"""Whether digits, as dialled after an exit code, are a plausible E.164 number"""
+	for length in (1, 2, 3):
+		if digits[:length] in COUNTRY_CODES:
+			if length == 1 and digits[0] == '1':
+				return len(digits) == 11  # North American numbers are always 1 + 10 digits
+			return min_length <= len(digits) <= E164_MAX_DIGITS
+	return False
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
 def parseCarrierNumber(number):
-	number = re.sub('[^0-9]', '', number)
-	if len(number) == 10:
-		number = '1' + number
-	return number
+	"""Normalize a phone number to its digits, in E.164 form (without '+') where it can be told
+	
+	'+65 6123 4567', '0065 6123 4567' and '011 65 6123 4567' all become '6561234567'.
+	An exit code is only stripped when a valid country code and length follow it. Numbers
+	with a '+' or an exit code already carry their country code; other 10-digit numbers
+	are taken as North American and get the leading 1. Short codes and e-mail gateways
+	are left as their digits.
+	"""
+	digits = NON_DIGITS.sub('', number)
+	if number.lstrip().startswith('+'):
+		return digits
+	for prefix, min_length in INTERNATIONAL_PREFIXES:
+		if digits.startswith(prefix) and isInternationalNumber(digits[len(prefix):], min_length):
+			return digits[len(prefix):]
+	if len(digits) == 10:
+		digits = '1' + digits
+	return digits
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def parseAddressList(address_field):
+	"""Normalized numbers of a '~'-separated MMS address attribute, in order"""
+	return tuple(parseCarrierNumber(a.strip()) for a in address_field.split('~'))
 
 def formatPhoneNumber(number):
 	"""Format phone number for display"""
@@ -691,7 +1202,7 @@ def parseConversations(root, conversations, carrier_number, debug_mode=False):
 						print(f"  Address field: {address_field}")
 					
 					# Parse the address field which has addresses in same order as names
-					raw_addresses = [parseCarrierNumber(a.strip()) for a in address_field.split('~')]
+					raw_addresses = parseAddressList(address_field)
 					# Filter out your own number
 					ordered_addresses = [a for a in raw_addresses if a and carrier_number not in a]
 					
@@ -754,7 +1265,7 @@ def parseConversations(root, conversations, carrier_number, debug_mode=False):
 			# Preserve original order from address field for display
 			address_field = child.attrib.get('address', '')
 			if address_field:
-				raw_addresses = [parseCarrierNumber(a.strip()) for a in address_field.split('~')]
+				raw_addresses = parseAddressList(address_field)
 				ordered_unique = [a for a in raw_addresses if a in unique_addresses and carrier_number not in a]
 			else:
 				ordered_unique = unique_addresses
@@ -796,7 +1307,596 @@ def parseConversations(root, conversations, carrier_number, debug_mode=False):
 			
 	return messages, type_counts
 
-def dumpConversations(base_path, conversations, carrier_number, sorted_conv_keys, xml_file):
+def parseSMSElement(elem, carrier_number, contact_map, debug=False):
+	"""Build an SMSMsg from an <sms> element; returns (conv_key, conv_name, participants, msg)"""
+	address = parseCarrierNumber(elem.attrib['address'])
+	date    = int(elem.attrib['date'])
+	type_   = elem.attrib['type']
+	name    = elem.attrib.get('contact_name', '(Unknown)')
+	body    = elem.attrib.get('body', '')
+	
+	if debug:
+		print(f"DEBUG SMS: type={type_}, address={address}, name={name}")
+		print(f"  SMS Conv Key: {address}, Name: {name}")
+	
+	# Store contact name mapping
+	if name != '(Unknown)':
+		contact_map[address] = name
+	
+	save_msg = SMSMsg(date, body, type_)
+	if type_ == '1':
+		save_msg.setSender(address, name)
+	else:
+		save_msg.setSender(carrier_number, 'You')
+	
+	# Create conversation key (just the other person for SMS)
+	conv_key = address
+	conv_name = name if name != '(Unknown)' else formatPhoneNumber(address)
+	
+	return conv_key, conv_name, [address], save_msg
+
+def parseMMSElement(elem, carrier_number, contact_map, image_source=None, debug=False):
+	"""Build an MMSMsg from an <mms> element; returns (conv_key, conv_name, participants, msg)
+	
+	image_source is (input_file, offset) of the element in streaming mode, in which case
+	image parts are recorded as MMSImageRef instead of being read into memory.
+	"""
+	save_msg = MMSMsg()
+	date = int(elem.attrib['date'])
+	msg_box = elem.attrib.get('msg_box', '1')
+	contact_name = elem.attrib.get('contact_name', 'Unknown')
+	
+	if msg_box == '2':
+		actual_msg_type = '151'  # Sent MMS
+	else:
+		actual_msg_type = '137'  # Received MMS
+	
+	sender_address = None
+	all_addresses = []
+	address_names = {}  # Map addresses to names from this MMS
+	
+	if debug:
+		print(f"\nDEBUG MMS: date={date}, msg_box={msg_box}, contact_name={contact_name}")
+	
+	# Parts other than images and text (SMIL layout, video, audio) are dropped on their ct alone
+	for part_index, part in enumerate(elem.iter('part')):
+		part_mime = part.get('ct', '')
+		if "image" in part_mime:
+			if image_source is not None:
+				save_msg.addImageRef(MMSImageRef(image_source[0], image_source[1], part_index, part_mime, date))
+			else:
+				part_data = part.get('data')
+				if part_data:
+					save_msg.addImageData(part_mime, part_data)
+		elif "text" in part_mime:
+			save_msg.text += part.get('text', '')
+	
+	for addr in elem.iter('addr'):
+		parsed_addr = parseCarrierNumber(addr.get('address', ''))
+		addr_type = addr.get('type', '137')
+		
+		if debug:
+			print(f"  Address: {parsed_addr}, type={addr_type}")
+		
+		# Skip empty addresses and your own number
+		if parsed_addr and carrier_number not in parsed_addr:
+			all_addresses.append(parsed_addr)
+			
+			# In received MMS (msg_box=1), type 137 indicates the sender
+			# Type 151 typically indicates recipients/CC
+			if addr_type == '137' and msg_box == '1':
+				sender_address = parsed_addr
+				if debug:
+					print(f"    -> Identified as sender (type 137)")
+	
+	# Parse contact_name to extract individual names
+	if contact_name and contact_name != 'Unknown':
+		# The contact_name order matches the address field order in the XML
+		address_field = elem.attrib.get('address', '')
+		
+		if ',' in contact_name and address_field:
+			names = [n.strip() for n in contact_name.split(',')]
+			
+			if debug:
+				print(f"  Parsing names: {names}")
+				print(f"  Address field: {address_field}")
+			
+			# Parse the address field which has addresses in same order as names
+			raw_addresses = parseAddressList(address_field)
+			# Filter out your own number
+			ordered_addresses = [a for a in raw_addresses if a and carrier_number not in a]
+			
+			if debug:
+				print(f"  Ordered addresses: {ordered_addresses}")
+			
+			# Now match names to addresses in order
+			for i, addr in enumerate(ordered_addresses):
+				if i < len(names):
+					address_names[addr] = names[i]
+					contact_map[addr] = names[i]
+					if debug:
+						print(f"  Mapped: {addr} -> {names[i]}")
+		elif address_field and '~' not in address_field:
+			# Single person conversation, map the name to the single address
+			single_addr = parseCarrierNumber(address_field)
+			if single_addr and carrier_number not in single_addr:
+				address_names[single_addr] = contact_name
+				contact_map[single_addr] = contact_name
+				if debug:
+					print(f"  Single person mapped: {single_addr} -> {contact_name}")
+	
+	# Set sender info
+	if msg_box == '2':
+		sender_address_final = carrier_number
+		sender_name_final = 'You'
+	elif sender_address:
+		sender_address_final = sender_address
+		# Try multiple sources for the name
+		sender_name_final = (address_names.get(sender_address) or
+		                    contact_map.get(sender_address) or
+		                    formatPhoneNumber(sender_address))
+		if debug:
+			print(f"  Sender address: {sender_address}")
+			print(f"  address_names.get: {address_names.get(sender_address)}")
+			print(f"  contact_map.get: {contact_map.get(sender_address)}")
+			print(f"  Final sender: {sender_name_final} ({sender_address_final})")
+	else:
+		sender_address_final = all_addresses[0] if all_addresses else None
+		if sender_address_final:
+			sender_name_final = (address_names.get(sender_address_final) or
+			                    contact_map.get(sender_address_final) or
+			                    formatPhoneNumber(sender_address_final))
+		else:
+			sender_name_final = contact_name
+		if debug:
+			print(f"  No explicit sender, using first address: {sender_address_final}")
+			print(f"  Sender name: {sender_name_final}")
+	
+	# Store sender info in the message
+	save_msg.setSender(sender_address_final, sender_name_final)
+	save_msg.type_ = int(actual_msg_type)
+	save_msg.timestamp = date
+	
+	# Create conversation key from all participants
+	# Remove duplicates and normalize
+	unique_addresses = list(set(all_addresses))
+	
+	# Preserve original order from address field for display
+	address_field = elem.attrib.get('address', '')
+	if address_field:
+		raw_addresses = parseAddressList(address_field)
+		ordered_unique = [a for a in raw_addresses if a in unique_addresses and carrier_number not in a]
+	else:
+		ordered_unique = unique_addresses
+	
+	# If only one unique participant (excluding self), treat as 1-on-1
+	if len(unique_addresses) == 1:
+		conv_key = unique_addresses[0]
+	else:
+		conv_key = makeConversationKey(unique_addresses)
+	
+	# Use the single person's name for 1-on-1, group name for actual groups
+	if len(unique_addresses) == 1:
+		conv_name = contact_map.get(unique_addresses[0]) or formatPhoneNumber(unique_addresses[0])
+	else:
+		conv_name = contact_name
+	
+	if debug:
+		print(f"  MMS All addresses: {all_addresses}")
+		print(f"  MMS Unique addresses: {unique_addresses}")
+		print(f"  MMS Ordered unique: {ordered_unique}")
+		print(f"  MMS Conv Key: {conv_key}")
+	
+	return conv_key, conv_name, ordered_unique, save_msg
+
+def messageDigest(elem, carrier_number):
+	"""Identity of an <sms>/<mms> for de-duplication: conversation, timestamp, type and body
+	
+	Only addresses and text parts are read, so duplicate MMS never touch their image data.
+	"""
+	if elem.tag == 'sms':
+		conv_key = parseCarrierNumber(elem.get('address', ''))
+		type_ = elem.get('type', '')
+		body = elem.get('body', '')
+	else:
+		addresses = set()
+		for addr in elem.iter('addr'):
+			parsed_addr = parseCarrierNumber(addr.get('address', ''))
+			if parsed_addr and carrier_number not in parsed_addr:
+				addresses.add(parsed_addr)
+		conv_key = makeConversationKey(addresses)
+		type_ = elem.get('msg_box', '1')
+		body = ''.join(part.get('text', '') for part in elem.iter('part') if "text" in part.get('ct', ''))
+	key = '\0'.join((elem.tag, conv_key, elem.get('date', ''), type_, body))
+	return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+def mergeBackupFiles(input_files, output_file, carrier_number):
+	"""Stream overlapping backups into a single XML, keeping the first copy of each message
+	
+	Backups are not guaranteed to be in date order, so rather than a sorted k-way merge every
+	input is streamed in turn against a set of 8-byte message digests; memory grows with the
+	number of distinct messages only. Returns (messages kept, duplicates dropped).
+	"""
+	seen = set()
+	kept = 0
+	duplicates = 0
+	tmp_file = output_file + '.tmp'
+	with open(tmp_file, 'wb') as out:
+		out.write(b"<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>\n")
+		out.write(f"<!--Merged by smsxml2html from {len(input_files)} backup files-->\n".encode('utf-8'))
+		out.write(b'<smses count="')
+		count_offset = out.tell()
+		# Fixed width so the real count can be filled in once it is known
+		out.write(b'0000000000">\n')
+		
+		for input_file in input_files:
+			print(f"Merging messages from {input_file}...")
+			file_kept = 0
+			context = etree.iterparse(input_file, events=('end',), tag=('sms', 'mms'), huge_tree=True)
+			for event, elem in context:
+				digest = messageDigest(elem, carrier_number)
+				if digest in seen:
+					duplicates += 1
+				else:
+					seen.add(digest)
+					out.write(b'  ' + etree.tostring(elem, encoding='UTF-8', xml_declaration=False, with_tail=False) + b'\n')
+					file_kept += 1
+				
+				# Clear element to free memory
+				elem.clear()
+				while elem.getprevious() is not None:
+					del elem.getparent()[0]
+			del context
+			kept += file_kept
+			print(f"  {file_kept} new messages")
+		
+		out.write(b'</smses>\n')
+		out.seek(count_offset)
+		out.write(b'%010d' % kept)
+	os.replace(tmp_file, output_file)
+	return kept, duplicates
+
+def openBackupSource(input_file, byte_range=None, streaming=False):
+	"""What iterparse reads a backup from
+	
+	lxml reads a whole file fastest from its path. In streaming mode the input goes through
+	PartPayloadFilter, since every payload is read back from the XML later; otherwise images
+	are embedded, and filtering out only the other attachments is slower than parsing them.
+	"""
+	if byte_range is None and not streaming:
+		return input_file
+	source = open(input_file, 'rb') if byte_range is None else ByteRangeReader(input_file, *byte_range)
+	if streaming:
+		source = PartPayloadFilter(source, keep_images=False)
+	return source
+
+# Names in a message record that came from neither the message itself nor a default
+UNRESOLVED_SENDER = 1
+UNRESOLVED_CONVERSATION = 2
+
+def parseBackupFile(input_file, conversations, carrier_number, contact_map, streaming=False, debug_mode=False, seen=None,
+                    byte_range=None, records=None):
+	"""Parse one backup XML into conversations; returns (message count, type counts)
+	
+	In streaming mode image payloads are not kept in memory: a byte offset scan runs
+	alongside iterparse and images are read back from the XML when they are written.
+	Attachment payloads are then emptied by PartPayloadFilter before lxml sees them.
+	When seen is a set, messages whose digest is already in it (from an overlapping
+	backup parsed earlier) are skipped before any message objects are built.
+	byte_range (start, end) limits parsing to the messages in that part of the file.
+	
+	When records is a list, conversations and contact_map are not used. Each message is
+	appended instead as (digest, msg, conv_key, conv_name, participants, names, unresolved),
+	parsed knowing only the contact names it carries itself. names holds those names and
+	unresolved flags the sender and conversation names to look up in the contacts known by
+	then. A message repeated within the range is appended as (digest, None, ...).
+	"""
+	# Use iterparse for large files to avoid memory issues
+	source = openBackupSource(input_file, byte_range, streaming)
+	context = etree.iterparse(source, events=('end',), tag=('sms', 'mms'), huge_tree=True)
+	offsets = scanMessageOffsets(input_file, start=byte_range[0] if byte_range else 0) if streaming else None
+	
+	msg_count = 0
+	duplicates = 0
+	type_counts = {}
+	
+	digest = None
+	for event, elem in context:
+		debug = debug_mode and msg_count < 10
+		
+		image_source = None
+		if offsets is not None:
+			scanned_tag, offset = next(offsets, (None, None))
+			if scanned_tag == elem.tag:
+				image_source = (input_file, offset)
+			else:
+				print(f"Warning: could not locate message {msg_count + duplicates + 1} in {input_file}; keeping remaining images in memory")
+				offsets = None
+				source.keep_images = True  # Messages already read ahead have lost their images
+		
+		if seen is not None:
+			digest = messageDigest(elem, carrier_number)
+			if digest in seen:
+				duplicates += 1
+				if records is not None:
+					records.append((digest, None, None, None, None, None, 0))
+				elem.clear()
+				while elem.getprevious() is not None:
+					del elem.getparent()[0]
+				continue
+			seen.add(digest)
+		
+		if records is not None:
+			names = {}
+			unresolved = 0
+			if elem.tag == 'sms':
+				conv_key, conv_name, participants, save_msg = parseSMSElement(elem, carrier_number, names, debug)
+			else:
+				conv_key, conv_name, participants, save_msg = parseMMSElement(elem, carrier_number, names, image_source, debug)
+				sender_address = save_msg.sender_address
+				if sender_address and sender_address != carrier_number and sender_address not in names:
+					unresolved |= UNRESOLVED_SENDER
+				# 1-on-1 conversations are named after the contact, groups after contact_name
+				if conv_key and '~' not in conv_key and conv_key not in names:
+					unresolved |= UNRESOLVED_CONVERSATION
+			records.append((digest, save_msg, conv_key, conv_name, participants, names, unresolved))
+			msg_count += 1
+		
+		elif elem.tag == 'sms':
+			conv_key, conv_name, participants, save_msg = parseSMSElement(elem, carrier_number, contact_map, debug)
+			
+			if conv_key not in conversations:
+				conversations[conv_key] = {
+					'name': conv_name,
+					'participants': participants,
+					'messages': {}
+				}
+		
+		elif elem.tag == 'mms':
+			conv_key, conv_name, participants, save_msg = parseMMSElement(elem, carrier_number, contact_map, image_source, debug)
+			
+			if conv_key not in conversations:
+				conversations[conv_key] = {
+					'name': conv_name,
+					'participants': participants,  # Use ordered list
+					'messages': {}
+				}
+		
+		if records is None:
+			type_counts[save_msg.type_] = type_counts.get(save_msg.type_, 0) + 1
+			
+			# Store the message
+			conversations[conv_key]['messages'][save_msg.timestamp] = save_msg
+			msg_count += 1
+		
+		# Clear element to free memory
+		elem.clear()
+		while elem.getprevious() is not None:
+			del elem.getparent()[0]
+	
+	# Clean up
+	del context
+	if not isinstance(source, str):
+		source.close()
+	
+	if duplicates and byte_range is None:
+		print(f"  Skipped {duplicates} duplicate messages already seen in earlier files")
+	
+	return msg_count, type_counts
+
+# Persistent message index (--index): the XML is parsed once into SQLite and later runs render from it
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+	key TEXT PRIMARY KEY,
+	value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversations (
+	conv_key TEXT PRIMARY KEY,
+	name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS participants (
+	conv_key TEXT NOT NULL,
+	position INTEGER NOT NULL,
+	address TEXT NOT NULL,
+	PRIMARY KEY (conv_key, position)
+);
+CREATE INDEX IF NOT EXISTS participants_address ON participants (address);
+CREATE TABLE IF NOT EXISTS contacts (
+	address TEXT PRIMARY KEY,
+	name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+	conv_key TEXT NOT NULL,
+	timestamp INTEGER NOT NULL,
+	type INTEGER NOT NULL,
+	is_mms INTEGER NOT NULL,
+	sender_address TEXT,
+	sender_name TEXT,
+	body TEXT NOT NULL,
+	PRIMARY KEY (conv_key, timestamp)
+);
+CREATE INDEX IF NOT EXISTS messages_timestamp ON messages (timestamp);
+CREATE TABLE IF NOT EXISTS attachments (
+	sha256 TEXT PRIMARY KEY,
+	size INTEGER NOT NULL,
+	data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS message_attachments (
+	conv_key TEXT NOT NULL,
+	timestamp INTEGER NOT NULL,
+	position INTEGER NOT NULL,
+	sha256 TEXT NOT NULL,
+	mime TEXT NOT NULL,
+	PRIMARY KEY (conv_key, timestamp, position)
+);
+"""
+INDEX_BATCH_SIZE = 5000
+INDEX_BATCH_BYTES = 64 * 1024 * 1024  # Decoded image bytes a batch may hold before it is written
+
+def openIndex(index_path, carrier_number):
+	"""Open (creating if needed) the SQLite index; exits if it was built for another number"""
+	conn = sqlite3.connect(index_path)
+	conn.executescript(INDEX_SCHEMA)
+	settings = dict(conn.execute('SELECT key, value FROM settings'))
+	if not settings:
+		conn.executemany('INSERT INTO settings (key, value) VALUES (?, ?)',
+		                 [('carrier_number', carrier_number), ('address_format', str(ADDRESS_FORMAT))])
+		conn.commit()
+	elif settings.get('address_format') != str(ADDRESS_FORMAT):
+		# Conversations are keyed by normalized numbers, so rows from an older format would not line up
+		print(f"Error: {index_path} was built with an older phone number format; delete it and index your backups again")
+		sys.exit(1)
+	elif settings['carrier_number'] != carrier_number:
+		print(f"Error: {index_path} was built for {formatPhoneNumber(settings['carrier_number'])}, not {formatPhoneNumber(carrier_number)}")
+		sys.exit(1)
+	return conn
+
+@functools.lru_cache(maxsize=None)
+def indexConnection(index_path, pid):
+	"""Read-only connection to the index, one per process (connections can't cross a fork)"""
+	return sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+
+class IndexedImageRef(ImageRef):
+	"""An MMS image stored in the SQLite index, addressed by the sha256 of its bytes"""
+	def __init__(self, index_path, sha256, mime):
+		self.index_path = index_path
+		self.sha256 = sha256
+		self.mime = mime
+	
+	def load(self):
+		try:
+			row = indexConnection(self.index_path, os.getpid()).execute(
+				'SELECT data FROM attachments WHERE sha256 = ?', (self.sha256,)).fetchone()
+		except sqlite3.Error as e:
+			print(f"Failed to read image {self.sha256} from {self.index_path}: {e}")
+			return ''
+		if row is None:
+			return ''
+		return base64.b64encode(row[0]).decode('ascii')
+	
+	def identity(self):
+		return (self.mime, self.sha256)
+
+def ingestBackupFile(conn, input_file, carrier_number, contact_map, debug_mode=False):
+	"""Parse one backup XML into the index; returns (message count, new message count, type counts)
+	
+	Messages are written in batches as they are parsed, so memory stays bounded by a batch
+	rather than the whole backup; a batch ends after INDEX_BATCH_SIZE messages or once its
+	images reach INDEX_BATCH_BYTES. Image bytes are stored once per distinct sha256. Messages
+	already in the index are replaced, so only the growth of the table is counted as new.
+	"""
+	context = etree.iterparse(input_file, events=('end',), tag=('sms', 'mms'), huge_tree=True)
+	known_convs = {row[0] for row in conn.execute('SELECT conv_key FROM conversations')}
+	indexed_before = conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0]
+	
+	msg_count = 0
+	type_counts = {}
+	message_rows = []
+	attachment_rows = []
+	link_rows = []
+	batch_bytes = 0
+	
+	def flush():
+		conn.executemany('INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)', message_rows)
+		# A message re-imported from a newer backup replaces its previous attachments
+		conn.executemany('DELETE FROM message_attachments WHERE conv_key = ? AND timestamp = ?',
+		                 [(row[0], row[1]) for row in message_rows if row[3]])
+		conn.executemany('INSERT OR IGNORE INTO attachments VALUES (?, ?, ?)', attachment_rows)
+		conn.executemany('INSERT OR REPLACE INTO message_attachments VALUES (?, ?, ?, ?, ?)', link_rows)
+		message_rows.clear()
+		attachment_rows.clear()
+		link_rows.clear()
+	
+	for event, elem in context:
+		debug = debug_mode and msg_count < 10
+		
+		if elem.tag == 'sms':
+			conv_key, conv_name, participants, save_msg = parseSMSElement(elem, carrier_number, contact_map, debug)
+		else:
+			conv_key, conv_name, participants, save_msg = parseMMSElement(elem, carrier_number, contact_map, None, debug)
+		
+		if conv_key not in known_convs:
+			conn.execute('INSERT OR IGNORE INTO conversations VALUES (?, ?)', (conv_key, conv_name))
+			conn.executemany('INSERT OR IGNORE INTO participants VALUES (?, ?, ?)',
+			                 [(conv_key, position, address) for position, address in enumerate(participants)])
+			known_convs.add(conv_key)
+		
+		is_mms = isinstance(save_msg, MMSMsg)
+		message_rows.append((conv_key, save_msg.timestamp, save_msg.type_, int(is_mms),
+		                     save_msg.sender_address, save_msg.sender_name, save_msg.text))
+		if is_mms:
+			for position, img in enumerate(save_msg.images):
+				mime, data = imagePayload(img)
+				try:
+					raw = base64.b64decode(data)
+				except (binascii.Error, ValueError) as e:
+					print(f"Failed to decode image: {e}")
+					continue
+				sha256 = hashlib.sha256(raw).hexdigest()
+				attachment_rows.append((sha256, len(raw), raw))
+				link_rows.append((conv_key, save_msg.timestamp, position, sha256, mime))
+				batch_bytes += len(raw)
+		
+		type_counts[save_msg.type_] = type_counts.get(save_msg.type_, 0) + 1
+		msg_count += 1
+		if len(message_rows) >= INDEX_BATCH_SIZE or batch_bytes >= INDEX_BATCH_BYTES:
+			flush()
+			batch_bytes = 0
+		
+		# Clear element to free memory
+		elem.clear()
+		while elem.getprevious() is not None:
+			del elem.getparent()[0]
+	
+	del context
+	flush()
+	conn.executemany('INSERT OR REPLACE INTO contacts VALUES (?, ?)', contact_map.items())
+	conn.commit()
+	added = conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0] - indexed_before
+	return msg_count, added, type_counts
+
+def loadIndex(index_path):
+	"""Rebuild the conversations dict from the index; returns (conversations, contact map, type counts)
+	
+	Message text comes from SQLite directly and images become IndexedImageRef, so
+	payloads are only read when their conversation is written. Type counts are
+	aggregated by SQLite rather than by walking the messages.
+	"""
+	conn = sqlite3.connect(index_path)
+	contacts = dict(conn.execute('SELECT address, name FROM contacts'))
+	
+	conversations = {}
+	for conv_key, name in conn.execute('SELECT conv_key, name FROM conversations'):
+		conversations[conv_key] = {
+			'name': name,
+			'participants': [],
+			'messages': {}
+		}
+	for conv_key, address in conn.execute('SELECT conv_key, address FROM participants ORDER BY conv_key, position'):
+		conversations[conv_key]['participants'].append(address)
+	
+	for conv_key, timestamp, type_, is_mms, sender_address, sender_name, body in conn.execute(
+			'SELECT conv_key, timestamp, type, is_mms, sender_address, sender_name, body FROM messages'):
+		if is_mms:
+			save_msg = MMSMsg(timestamp, body, type_)
+		else:
+			save_msg = SMSMsg(timestamp, body, type_)
+		save_msg.setSender(sender_address, sender_name)
+		conversations[conv_key]['messages'][timestamp] = save_msg
+	
+	for conv_key, timestamp, sha256, mime in conn.execute(
+			'SELECT conv_key, timestamp, sha256, mime FROM message_attachments ORDER BY conv_key, timestamp, position'):
+		save_msg = conversations[conv_key]['messages'].get(timestamp)
+		if isinstance(save_msg, MMSMsg):
+			save_msg.images.append(IndexedImageRef(index_path, sha256, mime))
+	
+	type_counts = {int(type_): count for type_, count in conn.execute('SELECT type, COUNT(*) FROM messages GROUP BY type')}
+	attachment_count, attachment_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM attachments').fetchone()
+	conn.close()
+	print(f"Loaded index {index_path}: {attachment_count} distinct images ({attachment_bytes / (1024 * 1024):.1f} MB)")
+	return conversations, contacts, type_counts
+
+def dumpConversations(base_path, conversations, carrier_number, sorted_conv_keys, xml_file, extract_images=False, jobs=1, incremental_name=None, search_index=False, chunk_policy=None, chunk_cache=None, compress=(), contacts=None):
 	os.makedirs(base_path, exist_ok=True)
 	
 	# Generate filename based on conversations
@@ -812,266 +1912,629 @@ def dumpConversations(base_path, conversations, carrier_number, sorted_conv_keys
 	# Always use XML filename for consistency
 	xml_basename = Path(xml_file).stem
 	base_filename = xml_basename
-
-	# Check if we need to split into multiple files (estimate size)
-	# Rough estimate: each message with image could be ~50KB
-	max_size_mb = 500
-	estimated_size_mb = 0
 	
-	for conv in conversations.values():
-		for msg in conv['messages'].values():
-			estimated_size_mb += 0.05  # Base message size
-			if isinstance(msg, MMSMsg) and msg.images:
-				estimated_size_mb += len(msg.images) * 0.5  # Rough image size estimate
+	if chunk_policy is None:
+		chunk_policy = parseChunkPolicy(DEFAULT_CHUNK_POLICY)
+	if chunk_cache is None:
+		chunk_cache = DEFAULT_CHUNK_CACHE
+	if contacts is None:
+		contacts = {}
 	
 	# Always use split logic for consistency and proper image modal support
-	# Add incrementing number to base_filename
-	counter = 1
-	while True:
-	    numbered_folder = f'{base_filename}_{counter:04d}'
-	    test_path = os.path.join(base_path, numbered_folder)
-	    if not os.path.exists(test_path):
-	        base_filename = numbered_folder
-	        break
-	    counter += 1
+	if incremental_name:
+		# Incremental runs update the same folder in place
+		base_filename = incremental_name
+	else:
+		# Add incrementing number to base_filename
+		counter = 1
+		while True:
+		    numbered_folder = f'{base_filename}_{counter:04d}'
+		    test_path = os.path.join(base_path, numbered_folder)
+		    if not os.path.exists(test_path):
+		        base_filename = numbered_folder
+		        break
+		    counter += 1
 	
 	subfolder = os.path.join(base_path, base_filename)
 	os.makedirs(subfolder, exist_ok=True)
-	return dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv_keys, base_filename, max_size_mb)
-def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv_keys, base_filename, max_size_mb):
+	return dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv_keys, base_filename, chunk_policy, extract_images, jobs, bool(incremental_name), search_index, chunk_cache, compress, contacts)
+
+# Incremental mode: manifest kept in the output folder describing what each conversation file holds
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_VERSION = 4
+
+def participantContacts(conv, contacts):
+	"""The entries of the shared contact map for a conversation's participants"""
+	return {address: contacts[address] for address in conv['participants'] if address in contacts}
+
+def conversationHash(conv, contacts):
+	"""Hash everything that affects a conversation's rendered files, so unchanged ones can be reused"""
+	h = hashlib.sha256()
+	h.update(repr((conv['name'], conv['participants'], [contacts.get(a) for a in conv['participants']])).encode())
+	for date in sorted(conv['messages']):
+		msg = conv['messages'][date]
+		h.update(repr((msg.timestamp, msg.type_, msg.sender_address, msg.sender_name, msg.text)).encode())
+		if isinstance(msg, MMSMsg):
+			for img in msg.images:
+				if isinstance(img, ImageRef):
+					h.update(repr(img.identity()).encode())
+				else:
+					h.update(img.encode())
+	return h.hexdigest()
+
+def loadManifest(subfolder, settings):
+	"""Return the conversation entries of an existing manifest rendered with the same settings"""
+	manifest_path = os.path.join(subfolder, MANIFEST_FILENAME)
+	try:
+		with open(manifest_path, 'r', encoding='utf-8') as mf:
+			manifest = json.load(mf)
+	except FileNotFoundError:
+		return {}
+	except (OSError, ValueError) as e:
+		print(f"  Ignoring unreadable {MANIFEST_FILENAME}: {e}")
+		return {}
+	if manifest.get('version') != MANIFEST_VERSION or manifest.get('address_format') != ADDRESS_FORMAT:
+		print("  Output was written by an older version, re-rendering all conversations")
+		return {}
+	if manifest.get('settings') != settings:
+		print("  Output settings changed since the last run, re-rendering all conversations")
+		return {}
+	return manifest.get('conversations', {})
+
+def saveManifest(subfolder, settings, entries):
+	manifest_path = os.path.join(subfolder, MANIFEST_FILENAME)
+	tmp_path = manifest_path + '.tmp'
+	with open(tmp_path, 'w', encoding='utf-8') as mf:
+		json.dump({'version': MANIFEST_VERSION, 'address_format': ADDRESS_FORMAT, 'settings': settings, 'conversations': entries}, mf)
+	os.replace(tmp_path, manifest_path)
+
+def conversationFiles(meta):
+	"""Names of the files in conv_files/ that a conversation's metadata refers to"""
+	if meta['chunked']:
+		return [meta['header_file']] + meta['chunk_files']
+	return [meta['js_file']]
+
+def outputVersion(directory, filenames):
+	"""Cache-busting token for a set of output files, changing whenever any of them is rewritten"""
+	h = hashlib.sha1()
+	for filename in filenames:
+		st = os.stat(os.path.join(directory, filename))
+		h.update(f"{filename}:{st.st_size}:{st.st_mtime_ns};".encode())
+	return h.hexdigest()[:10]
+
+def removeStaleFiles(conv_files_dir, entries):
+	"""Delete conversation and media files no longer referenced after an incremental run"""
+	live_files = set()
+	live_media = set()
+	for entry in entries.values():
+		live_files.update(conversationFiles(entry['meta']))
+		live_media.update(entry['media'])
+	removed = 0
+	for filename in os.listdir(conv_files_dir):
+		if filename.startswith('conv_') and compressedSource(filename).endswith('.js') and compressedSource(filename) not in live_files:
+			os.remove(os.path.join(conv_files_dir, filename))
+			removed += 1
+	media_dir = os.path.join(conv_files_dir, "media")
+	if os.path.isdir(media_dir):
+		for filename in os.listdir(media_dir):
+			if filename not in live_media:
+				os.remove(os.path.join(media_dir, filename))
+				removed += 1
+	return removed
+
+class DateFormatCache:
+	"""Formats message timestamps for display, running strftime once per local calendar day
+	
+	Messages are rendered in date order and most days hold many of them, so the month and
+	date strings of the current day are kept and only the time of day is computed per message.
+	"""
+	def __init__(self):
+		self.day_start = None  # Local midnight of the cached day, in ms
+		self.day_end = None    # Following local midnight, in ms
+		self.exact = False     # DST change during the day: format times with datetime
+		self.day_strings = None
+		self.am_pm = (datetime.datetime(2000, 1, 1, 0).strftime('%p'),
+		              datetime.datetime(2000, 1, 1, 12).strftime('%p'))
+	
+	def loadDay(self, timestamp):
+		dt = datetime.datetime.fromtimestamp(timestamp / 1000, tz=None)
+		midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+		self.day_start = int(round(midnight.timestamp() * 1000))
+		self.day_end = int(round((midnight + datetime.timedelta(days=1)).timestamp() * 1000))
+		self.exact = self.day_end - self.day_start != 86400000
+		self.day_strings = (dt.strftime('%B %Y'), dt.strftime('%y%m'), dt.strftime('%b %d, %Y'))
+	
+	def format(self, timestamp):
+		"""Return (month_year, yymm, date, time) strings for a timestamp in ms"""
+		if self.day_start is None or not (self.day_start <= timestamp < self.day_end):
+			self.loadDay(timestamp)
+		month_year, month_short, date_str = self.day_strings
+		
+		if self.exact or not (self.day_start <= timestamp < self.day_end):
+			dt = datetime.datetime.fromtimestamp(timestamp / 1000, tz=None)
+			return month_year, month_short, date_str, dt.strftime('%I:%M:%S %p')
+		
+		seconds = (timestamp - self.day_start) // 1000
+		hour, seconds = divmod(seconds, 3600)
+		minute, second = divmod(seconds, 60)
+		time_str = f"{hour % 12 or 12:02d}:{minute:02d}:{second:02d} {self.am_pm[hour >= 12]}"
+		return month_year, month_short, date_str, time_str
+
+# Message search (--search-index): words map to (conversation, month) postings, sharded by hash
+SEARCH_TOKEN_RE = re.compile(r'\w+')
+SEARCH_SHARD_TARGET = 256 * 1024  # Approximate size of one shard file in bytes
+SEARCH_MAX_SHARDS = 4096
+
+def searchTokens(text):
+	"""Distinct lower-cased words of a message, split the way the search box splits a query"""
+	return {t for t in SEARCH_TOKEN_RE.findall(text.lower()) if 2 <= len(t) <= 40}
+
+def searchTokenHash(token):
+	"""32-bit FNV-1a over UTF-16 code units, the same as searchTokenHash() in messages.html"""
+	h = 0x811c9dc5
+	data = token.encode('utf-16-le')
+	for i in range(0, len(data), 2):
+		h ^= data[i] | (data[i + 1] << 8)
+		h = (h * 0x01000193) & 0xffffffff
+	return h
+
+def writeSearchIndex(conv_files_dir, conversations, sorted_conv_keys):
+	"""Write the sharded search index to conv_files/search/; returns what messages.html needs to query it
+	
+	Each word maps to a flat list of (conversation position, month, matching messages), so a
+	search loads only the shards holding its words and never the conversation files. Months
+	are numbered newest first and carry the anchor used by jumpToMonth().
+	"""
+	search_dir = os.path.join(conv_files_dir, "search")
+	os.makedirs(search_dir, exist_ok=True)
+	
+	postings = {}
+	month_ids = {}     # yymm -> provisional month number
+	month_info = []    # (first timestamp, yymm, month name) per provisional number
+	date_formatter = DateFormatCache()
+	for conv_idx, conv_key in enumerate(sorted_conv_keys):
+		messages = conversations[conv_key]['messages']
+		token_counts = {}
+		for date in sorted(messages):
+			tokens = searchTokens(messages[date].text)
+			if not tokens:
+				continue
+			month_year, month_short, _, _ = date_formatter.format(date)
+			month_idx = month_ids.get(month_short)
+			if month_idx is None:
+				month_idx = month_ids[month_short] = len(month_info)
+				month_info.append((date, month_short, month_year))
+			for token in tokens:
+				key = (token, month_idx)
+				token_counts[key] = token_counts.get(key, 0) + 1
+		for (token, month_idx), count in token_counts.items():
+			postings.setdefault(token, []).extend((conv_idx, month_idx, count))
+	
+	# Renumber months newest first so results can be ordered by month number alone
+	order = sorted(range(len(month_info)), key=lambda i: month_info[i][0], reverse=True)
+	renumber = {old: new for new, old in enumerate(order)}
+	for posting in postings.values():
+		for i in range(1, len(posting), 3):
+			posting[i] = renumber[posting[i]]
+	
+	estimated_size = sum(len(token) + 4 * len(posting) + 6 for token, posting in postings.items())
+	num_shards = 1
+	while num_shards < SEARCH_MAX_SHARDS and estimated_size / num_shards > SEARCH_SHARD_TARGET:
+		num_shards *= 2
+	shards = [{} for _ in range(num_shards)]
+	for token, posting in postings.items():
+		shards[searchTokenHash(token) % num_shards][token] = posting
+	
+	for filename in os.listdir(search_dir):
+		if filename.startswith('search_') and compressedSource(filename).endswith('.js'):
+			os.remove(os.path.join(search_dir, filename))
+	for shard_num, shard in enumerate(shards):
+		with open(os.path.join(search_dir, f"search_{shard_num}.js"), 'w', encoding='utf-8') as sf:
+			sf.write(f'window.searchShard_{shard_num} = {json.dumps(shard, ensure_ascii=False, separators=(",", ":"))};')
+	
+	print(f"  Indexed {len(postings)} distinct words into {num_shards} search shards in conv_files/search/")
+	return {
+		'shards': num_shards,
+		'months': [[month_info[i][1], month_info[i][2]] for i in order],
+		'v': outputVersion(search_dir, [f"search_{n}.js" for n in range(num_shards)])
+	}
+
+# Precompressed output (--compress): .gz/.br siblings of the text files, served by serve_archive.py
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+BROTLI_QUALITY = 9  # 11 compresses a few percent smaller but is many times slower on large archives
+
+def parseCompression(text):
+	"""Parse a --compress value such as 'gzip,br' into a tuple of encodings"""
+	encodings = tuple(dict.fromkeys(e.strip().lower() for e in text.split(',') if e.strip()))
+	for encoding in encodings:
+		if encoding not in COMPRESSED_SUFFIXES:
+			raise argparse.ArgumentTypeError(f"unknown compression '{encoding}' (use gzip, br or gzip,br)")
+		if encoding == 'br' and brotli is None:
+			raise argparse.ArgumentTypeError("br compression needs the brotli package (pip install brotli)")
+	if not encodings:
+		raise argparse.ArgumentTypeError("no compression given (use gzip, br or gzip,br)")
+	return encodings
+
+def compressedSource(filename):
+	"""Name of the file a .gz/.br sibling was compressed from (filename itself if it is not one)"""
+	for suffix in COMPRESSED_SUFFIXES.values():
+		if filename.endswith(suffix):
+			return filename[:-len(suffix)]
+	return filename
+
+def compressOutputFiles(subfolder, encodings):
+	"""Write compressed siblings of messages.html and every conv_files/ script that is newer than them"""
+	sources = [os.path.join(subfolder, "messages.html")]
+	for dirpath, dirnames, filenames in os.walk(os.path.join(subfolder, "conv_files")):
+		dirnames[:] = [d for d in dirnames if d != "media"]  # Images are already compressed
+		sources.extend(os.path.join(dirpath, fn) for fn in filenames if fn.endswith('.js'))
+	
+	compressed = 0
+	sizes = dict.fromkeys(encodings, 0)
+	original_size = 0
+	for path in sources:
+		source_mtime = os.stat(path).st_mtime_ns
+		data = None
+		original_size += os.path.getsize(path)
+		for encoding in encodings:
+			target = path + COMPRESSED_SUFFIXES[encoding]
+			try:
+				if os.stat(target).st_mtime_ns >= source_mtime:
+					sizes[encoding] += os.path.getsize(target)
+					continue  # Unchanged since the last run
+			except FileNotFoundError:
+				pass
+			if data is None:
+				with open(path, 'rb') as sf:
+					data = sf.read()
+			if encoding == 'gzip':
+				payload = gzip.compress(data, compresslevel=9, mtime=0)
+			else:
+				payload = brotli.compress(data, quality=BROTLI_QUALITY)
+			with open(target + '.tmp', 'wb') as cf:
+				cf.write(payload)
+			os.replace(target + '.tmp', target)
+			sizes[encoding] += len(payload)
+			compressed += 1
+	
+	summary = ', '.join(f"{encoding} {size / (1024 * 1024):.1f} MB ({original_size / max(size, 1):.1f}x smaller)" for encoding, size in sizes.items())
+	print(f"  Compressed {compressed} files: {original_size / (1024 * 1024):.1f} MB of text -> {summary}")
+
+# Chunk policies (--chunk-policy): where large conversations are split into separate files
+DEFAULT_CHUNK_POLICY = 'size=50'
+CHUNK_PERIODS = ('month', 'quarter', 'year')
+# auto: keep each chunk within what a browser parses in about CHUNK_PARSE_BUDGET_MS
+CHUNK_PARSE_BUDGET_MS = 200
+CHUNK_PARSE_CHARS_PER_MS = 50 * 1024  # Conservative JS literal parse rate on a mid-range phone
+
+DEFAULT_CHUNK_CACHE = 3  # Chunks the viewer keeps loaded: the page on screen and its two neighbours
+
+def parseChunkPolicy(text):
+	"""Parse a --chunk-policy value into (kind, limit): ('size', characters), ('messages', n) or ('period', name)"""
+	kind, _, value = text.strip().lower().partition('=')
+	if kind == 'auto' and not value:
+		return ('size', CHUNK_PARSE_BUDGET_MS * CHUNK_PARSE_CHARS_PER_MS)
+	if kind == 'period' and value in CHUNK_PERIODS:
+		return ('period', value)
+	try:
+		if kind == 'size' and float(value) > 0:
+			return ('size', int(float(value) * 1024 * 1024))
+		if kind == 'messages' and int(value) > 0:
+			return ('messages', int(value))
+	except ValueError:
+		pass
+	raise argparse.ArgumentTypeError(f"invalid chunk policy '{text}' (use size=MB, messages=N, period=month|quarter|year or auto)")
+
+def chunkPeriod(month_short, period):
+	"""Key shared by all months (as yymm) that belong in the same chunk under a period policy"""
+	if period == 'year':
+		return month_short[:2]
+	if period == 'quarter':
+		return (month_short[:2], (int(month_short[2:]) - 1) // 3)
+	return month_short
+
+def writeJSONRows(out, rows):
+	"""Write JSON rows comma-separated, a slice at a time rather than as one joined string"""
+	for start in range(0, len(rows), 1000):
+		if start:
+			out.write(',')
+		out.write(','.join(rows[start:start + 1000]))
+
+def renderConversation(conv_key, conv, carrier_number, conv_files_dir, chunk_policy, extract_images=False, contacts=None):
+	"""Write the JS file(s) for one conversation; returns (metadata, names of media files it references)
+	
+	Conversations are independent of each other, so this runs in worker processes with --jobs.
+	Messages are written as JSON rows rather than HTML so the viewer can render only the rows
+	on screen: ["m", month name, anchor] starts a month, and [kind, date, time, sender, text,
+	images?] is a message where kind is 0 (received), 1 (sent, sender omitted) or the type as
+	a string. Rows are streamed into chunk files as they are built, so no more than about one
+	chunk of output is held in memory however large the conversation is.
+	
+	Chunks always end at a month boundary so every month anchor lives in exactly one chunk;
+	under a size or message limit a single month over the limit becomes an oversized chunk.
+	"""
+	media_dir = os.path.join(conv_files_dir, "media")
+	media_written = set()
+	
+	# Use hash for short, unique ID to avoid Windows path length issues
+	conv_hash = hashlib.md5(conv_key.encode()).hexdigest()[:12]
+	safe_id = conv_hash
+	contacts = contacts or {}
+	
+	# Rows not yet written out, and the months that start among them
+	policy_kind, policy_limit = chunk_policy
+	chunk_rows = []
+	chunk_size = 0
+	chunk_messages = 0
+	chunk_period = None
+	chunk_month_starts = []  # (index in chunk_rows, month name)
+	chunk_files = []
+	month_chunks = {}  # yymm -> number of the chunk holding that month's anchor
+	
+	def flushChunk(count):
+		"""Write the first count pending rows (always whole months) to the next chunk file"""
+		nonlocal chunk_size, chunk_messages, chunk_month_starts
+		if not chunk_files and policy_kind != 'period':
+			print(f"  Large conversation detected: {conv['name']}, splitting into chunks...")
+		chunk_num = len(chunk_files) + 1
+		chunk_filename = f"conv_{safe_id}_chunk{chunk_num}.js"
+		chunk_path = os.path.join(conv_files_dir, chunk_filename)
+		
+		with open(chunk_path, 'w', encoding='utf-8') as jsf:
+			jsf.write(f'window.convChunk_{safe_id}_{chunk_num} = [')
+			writeJSONRows(jsf, chunk_rows[:count])
+			jsf.write('];')
+		
+		chunk_files.append(chunk_filename)
+		for index, name in chunk_month_starts:
+			if index < count:
+				month_chunks[month_amap[name][:4]] = chunk_num
+		del chunk_rows[:count]
+		chunk_size = sum(len(row) + 1 for row in chunk_rows)
+		chunk_messages = len(chunk_rows) - (1 if chunk_rows else 0)
+		chunk_month_starts = [(index - count, name) for index, name in chunk_month_starts if index >= count]
+	
+	def addRow(row, month_name=None):
+		nonlocal chunk_size, chunk_messages
+		if month_name:
+			chunk_month_starts.append((len(chunk_rows), month_name))
+		else:
+			chunk_messages += 1
+		row_json = json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+		chunk_rows.append(row_json)
+		chunk_size += len(row_json) + 1
+		if policy_kind == 'size':
+			over_limit = chunk_size > policy_limit
+		elif policy_kind == 'messages':
+			over_limit = chunk_messages > policy_limit
+		else:
+			over_limit = False
+		if over_limit:
+			# End the chunk where the current month starts, unless that month is all there is
+			month_start = chunk_month_starts[-1][0] if chunk_month_starts else 0
+			if month_start:
+				flushChunk(month_start)
+	
+	# Generate month TOC and messages grouped by month in a single pass
+	prev_month_year = ""
+	months = []
+	month_amap = {}
+	date_formatter = DateFormatCache()
+	sorted_dates = sorted(conv['messages'].keys(), reverse=True)
+	
+	for date in sorted_dates:
+		msg = conv['messages'][date]
+		month_year, month_short, date_str, time_str = date_formatter.format(msg.timestamp)
+		
+		if month_year != prev_month_year:
+			months.append(month_year)
+			month_amap[month_year] = month_short + '_' + safe_id
+			
+			if policy_kind == 'period':
+				period = chunkPeriod(month_short, policy_limit)
+				if chunk_rows and period != chunk_period:
+					flushChunk(len(chunk_rows))
+				chunk_period = period
+			
+			# Start new month
+			addRow(['m', month_year, month_amap[month_year]], month_year)
+		
+		# Determine message type and sender
+		if msg.type_ in (1, 137, 130):
+			kind = 0
+			if msg.sender_name and msg.sender_address:
+				sender_info = f"{msg.sender_name}<br>{formatPhoneNumber(msg.sender_address)}"
+			elif msg.sender_address:
+				sender_info = f"{formatPhoneNumber(msg.sender_address)}"
+			else:
+				sender_info = msg.sender_name or "Unknown"
+		elif msg.type_ in (2, 151):
+			kind = 1
+			sender_info = 0  # Always you; the viewer fills it in
+		else:
+			kind = str(msg.type_)
+			sender_info = f"{msg.sender_name}<br>{formatPhoneNumber(msg.sender_address) if msg.sender_address else ''}"
+		
+		msg_text = msg.text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
+		row = [kind, date_str, time_str, sender_info, msg_text]
+		
+		if isinstance(msg, MMSMsg) and msg.images:
+			image_srcs = []
+			for img in msg.images:
+				if extract_images:
+					media_file = writeMediaFile(img, media_dir, media_written)
+					if media_file:
+						image_srcs.append(f"conv_files/media/{media_file}")
+					continue
+				img_data = imageDataURI(img)
+				if img_data:
+					image_srcs.append(img_data)
+			if image_srcs:
+				row.append(image_srcs)
+		
+		addRow(row)
+		prev_month_year = month_year
+	
+	# Create header HTML
+	header_html = []
+	if len(conv['participants']) > 1:
+		header_html.append('<div class="conversation-details">')
+		header_html.append('<p><strong>Group Conversation</strong></p>')
+		header_html.append('<p><strong>Participants:</strong> ')
+		participant_info = []
+		for addr in conv['participants']:
+			name = contacts.get(addr, formatPhoneNumber(addr))
+			phone = formatPhoneNumberSimple(addr)
+			participant_info.append(f"{name} ({phone})")
+		header_html.append(', '.join(participant_info))
+		header_html.append('</p>')
+		header_html.append(f'<p><strong>Total Messages:</strong> {len(conv["messages"])}</p>')
+		header_html.append('</div>')
+	
+	if len(months) > 1:
+		header_html.append('<div class="month-jump"><strong>Jump to:</strong> ')
+		month_links = []
+		for month_year in months:
+			month_links.append(f'<a href="javascript:void(0)" onclick="jumpToMonth(\'month-{month_amap[month_year]}\')">{month_year}</a>')
+		header_html.append(' | '.join(month_links))
+		header_html.append('</div>')
+	
+	if chunk_files:
+		# Write last chunk to conv_files subfolder
+		if chunk_rows:
+			flushChunk(len(chunk_rows))
+		
+		# Write header file to conv_files subfolder
+		header_filename = f"conv_{safe_id}_header.js"
+		header_path = os.path.join(conv_files_dir, header_filename)
+		
+		with open(header_path, 'w', encoding='utf-8') as jsf:
+			jsf.write(f'window.convHeader_{safe_id} = {json.dumps("".join(header_html), ensure_ascii=False)};')
+		
+		meta = {
+			'id': safe_id,
+			'chunked': True,
+			'header_file': header_filename,
+			'chunk_files': chunk_files,
+			'name': conv['name'],
+			'participants': conv['participants'],
+			'msg_count': len(conv['messages']),
+			'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0,
+			'month_chunks': month_chunks
+		}
+	
+	else:
+		# Small enough - single file in conv_files subfolder
+		js_filename = f"conv_{safe_id}.js"
+		js_path = os.path.join(conv_files_dir, js_filename)
+		
+		with open(js_path, 'w', encoding='utf-8') as jsf:
+			jsf.write(f'window.convData_{safe_id} = {{"header":{json.dumps("".join(header_html), ensure_ascii=False)},"rows":[')
+			writeJSONRows(jsf, chunk_rows)
+			jsf.write(']};')
+		
+		meta = {
+			'id': safe_id,
+			'chunked': False,
+			'js_file': js_filename,
+			'name': conv['name'],
+			'participants': conv['participants'],
+			'msg_count': len(conv['messages']),
+			'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0
+		}
+	
+	meta['v'] = outputVersion(conv_files_dir, conversationFiles(meta))
+	return meta, media_written
+
+def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv_keys, base_filename, chunk_policy, extract_images=False, jobs=1, incremental=False, search_index=False, chunk_cache=DEFAULT_CHUNK_CACHE, compress=(), contacts=None):
 	"""Split large conversation sets - each conversation in separate files, large ones split into chunks"""
 	print(f"\n  Large file detected! Creating separate conversation files in subfolder: {base_filename}/")
 	
+	if contacts is None:
+		contacts = {}
+	
 	# Create the conv_files subfolder
 	conv_files_dir = os.path.join(subfolder, "conv_files")
 	os.makedirs(conv_files_dir, exist_ok=True)
 	
+	# Images are decoded once into conv_files/media/<sha256>.<ext> instead of being inlined
+	media_written = set()
+	if extract_images:
+		os.makedirs(os.path.join(conv_files_dir, "media"), exist_ok=True)
+	
 	conv_metadata = []
-	max_chunk_size = 50 * 1024 * 1024  # 50MB per chunk (in characters)
 	
-	# Create individual JS files for each conversation
+	# Incremental mode: reuse the files of conversations whose content hash is unchanged
+	settings = {'carrier_number': carrier_number, 'chunk_policy': list(chunk_policy), 'extract_images': extract_images}
+	if incremental:
+		PROFILER.begin('Check for changed conversations')
+	previous_entries = loadManifest(subfolder, settings) if incremental else {}
+	manifest_entries = {}
+	render_keys = []
 	for conv_key in sorted_conv_keys:
+		if not incremental:
+			render_keys.append(conv_key)
+			continue
 		conv = conversations[conv_key]
-		# Use hash for short, unique ID to avoid Windows path length issues
-		conv_hash = hashlib.md5(conv_key.encode()).hexdigest()[:12]
-		safe_id = conv_hash
-		contact_map = conv.get('contact_map', {})
-		
-		# Build all message HTML first to check size
-		message_htmls = []
-		
-		# Generate month TOC and messages
-		prev_month_year = ""
-		months = []
-		month_amap = {}
-		sorted_dates = sorted(conv['messages'].keys(), reverse=True)
-		
-		for date in sorted_dates:
-			msg = conv['messages'][date]
-			dt = datetime.datetime.fromtimestamp(msg.timestamp / 1000, tz=None)
-			month_year = dt.strftime('%B %Y')
-			if month_year != prev_month_year:
-				month_year_short = dt.strftime('%y%m') + '_' + safe_id
-				months.append(month_year)
-				month_amap[month_year] = month_year_short
-			prev_month_year = month_year
-		
-		# Generate messages grouped by month
-		prev_month_year = ""
-		current_month_html = []
-		
-		for date in sorted_dates:
-			msg = conv['messages'][date]
-			dt = datetime.datetime.fromtimestamp(msg.timestamp / 1000, tz=None)
-			month_year = dt.strftime('%B %Y')
-			
-			if month_year != prev_month_year:
-				# Save previous month if exists
-				if current_month_html:
-					current_month_html.append('</table>')
-					message_htmls.append({
-						'month': prev_month_year,
-						'html': ''.join(current_month_html),
-						'anchor': month_amap[prev_month_year]
-					})
-					current_month_html = []
-				
-				# Start new month
-				current_month_html.append(f'<a id="month-{month_amap[month_year]}"></a>')
-				current_month_html.append(f"<h2>{month_year}</h2>")
-				current_month_html.append('<table class="messages_table">')
-				current_month_html.append('<tr>')
-				current_month_html.append('<th style="width: 80px;">Type</th>')
-				current_month_html.append('<th style="width: 150px;">Date</th>')
-				current_month_html.append('<th style="width: 200px;">Name / Number</th>')
-				current_month_html.append('<th>Content</th>')
-				current_month_html.append('</tr>')
-			
-			# Determine message type and styling
-			if msg.type_ in ['1', '137', '130']:
-				msg_type = 'Received'
-				row_class = 'msg_received'
-				if msg.sender_name and msg.sender_address:
-					sender_info = f"{msg.sender_name}<br>{formatPhoneNumber(msg.sender_address)}"
-				elif msg.sender_address:
-					sender_info = f"{formatPhoneNumber(msg.sender_address)}"
-				else:
-					sender_info = msg.sender_name or "Unknown"
-			elif msg.type_ in ['2', '151']:
-				msg_type = 'Sent'
-				row_class = 'msg_sent'
-				sender_info = f"You<br>{formatPhoneNumber(carrier_number)}"
-			else:
-				msg_type = f'Type {msg.type_}'
-				row_class = 'msg_received'
-				sender_info = f"{msg.sender_name}<br>{formatPhoneNumber(msg.sender_address) if msg.sender_address else ''}"
-			
-			current_month_html.append(f'<tr class="{row_class}">')
-			current_month_html.append(f'<td class="msg_type">{msg_type}</td>')
-			current_month_html.append(f'<td class="msg_date">{dt.strftime("%b %d, %Y")}<br>{dt.strftime("%I:%M:%S %p")}</td>')
-			current_month_html.append(f'<td class="msg_contact">{sender_info}</td>')
-			current_month_html.append('<td>')
-			
-			msg_text = msg.text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
-			current_month_html.append(msg_text)
-			
-			if isinstance(msg, MMSMsg) and msg.images:
-				for img_data in msg.images:
-					current_month_html.append(f'<br><img class="mms_img" src="{img_data}" alt="MMS Image" onclick="openImageModal(this.src)" />')
-			
-			current_month_html.append('</td>')
-			current_month_html.append('</tr>')
-			prev_month_year = month_year
-		
-		# Save last month
-		if current_month_html:
-			current_month_html.append('</table>')
-			message_htmls.append({
-				'month': prev_month_year,
-				'html': ''.join(current_month_html),
-				'anchor': month_amap[prev_month_year]
-			})
-		
-		# Create header HTML
-		header_html = []
-		if len(conv['participants']) > 1:
-			header_html.append('<div class="conversation-details">')
-			header_html.append('<p><strong>Group Conversation</strong></p>')
-			header_html.append('<p><strong>Participants:</strong> ')
-			participant_info = []
-			for addr in conv['participants']:
-				name = contact_map.get(addr, formatPhoneNumber(addr))
-				phone = formatPhoneNumberSimple(addr)
-				participant_info.append(f"{name} ({phone})")
-			header_html.append(', '.join(participant_info))
-			header_html.append('</p>')
-			header_html.append(f'<p><strong>Total Messages:</strong> {len(conv["messages"])}</p>')
-			header_html.append('</div>')
-		
-		if len(months) > 1:
-			header_html.append('<div class="month-jump"><strong>Jump to:</strong> ')
-			month_links = []
-			for month_year in months:
-				month_links.append(f'<a href="javascript:void(0)" onclick="jumpToMonth(\'month-{month_amap[month_year]}\')">{month_year}</a>')
-			header_html.append(' | '.join(month_links))
-			header_html.append('</div>')
-		
-		# Decide if we need to chunk this conversation
-		total_size = len(''.join(header_html)) + sum(len(m['html']) for m in message_htmls)
-		
-		if total_size > max_chunk_size:
-			# Large conversation - split into chunks by month
-			print(f"  Large conversation detected: {conv['name']} (~{total_size/1024/1024:.1f}MB), splitting into chunks...")
-			
-			chunk_num = 0
-			current_chunk = []
-			current_chunk_size = 0
-			chunk_files = []
-			chunk_months = {}  # Track which months are in which chunk
-			
-			for msg_data in message_htmls:
-				msg_size = len(msg_data['html'])
-				
-				if current_chunk_size + msg_size > max_chunk_size and current_chunk:
-					# Write current chunk to conv_files subfolder
-					chunk_num += 1
-					chunk_filename = f"conv_{safe_id}_chunk{chunk_num}.js"
-					chunk_path = os.path.join(conv_files_dir, chunk_filename)
-					
-					chunk_html = ''.join(current_chunk)
-					escaped_html = chunk_html.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-					
-					with open(chunk_path, 'w', encoding='utf-8') as jsf:
-						jsf.write(f'window.convChunk_{safe_id}_{chunk_num} = `{escaped_html}`;')
-					
-					chunk_files.append(chunk_filename)
-					# Track which months are in this chunk
-					# Extract months from the HTML we just processed
-					import re
-					months_in_chunk = list(set(re.findall(r'<h2>(.*?)</h2>', chunk_html)))
-					chunk_months[chunk_num] = months_in_chunk
-					current_chunk = []
-					current_chunk_size = 0
-				
-				current_chunk.append(msg_data['html'])
-				current_chunk_size += msg_size
-			
-			# Write last chunk to conv_files subfolder
-			if current_chunk:
-				chunk_num += 1
-				chunk_filename = f"conv_{safe_id}_chunk{chunk_num}.js"
-				chunk_path = os.path.join(conv_files_dir, chunk_filename)
-				
-				chunk_html = ''.join(current_chunk)
-				escaped_html = chunk_html.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-				
-				with open(chunk_path, 'w', encoding='utf-8') as jsf:
-					jsf.write(f'window.convChunk_{safe_id}_{chunk_num} = `{escaped_html}`;')
-				
-				chunk_files.append(chunk_filename)
-			
-			# Write header file to conv_files subfolder
-			header_filename = f"conv_{safe_id}_header.js"
-			header_path = os.path.join(conv_files_dir, header_filename)
-			header_escaped = ''.join(header_html).replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-			
-			with open(header_path, 'w', encoding='utf-8') as jsf:
-				jsf.write(f'window.convHeader_{safe_id} = `{header_escaped}`;')
-			
-			conv_metadata.append({
-				'id': safe_id,
-				'chunked': True,
-				'header_file': header_filename,
-				'chunk_files': chunk_files,
-				'name': conv['name'],
-				'participants': conv['participants'],
-				'msg_count': len(conv['messages']),
-				'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0,
-				'chunk_months': chunk_months
-			})
-			
+		entry = {
+			'msg_count': len(conv['messages']),
+			'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0,
+			'hash': conversationHash(conv, contacts)
+		}
+		previous = previous_entries.get(conv_key)
+		if (previous and previous['hash'] == entry['hash'] and
+		    all(os.path.exists(os.path.join(conv_files_dir, fn)) for fn in conversationFiles(previous['meta']))):
+			entry['meta'] = previous['meta']
+			entry['media'] = previous['media']
 		else:
-			# Small enough - single file in conv_files subfolder
-			js_filename = f"conv_{safe_id}.js"
-			js_path = os.path.join(conv_files_dir, js_filename)
-			
-			full_html = ''.join(header_html) + ''.join(m['html'] for m in message_htmls)
-			escaped_html = full_html.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-			
-			with open(js_path, 'w', encoding='utf-8') as jsf:
-				jsf.write(f'window.convData_{safe_id} = `{escaped_html}`;')
-			
-			conv_metadata.append({
-				'id': safe_id,
-				'chunked': False,
-				'js_file': js_filename,
-				'name': conv['name'],
-				'participants': conv['participants'],
-				'msg_count': len(conv['messages']),
-				'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0
-			})
+			render_keys.append(conv_key)
+		manifest_entries[conv_key] = entry
+	
+	if incremental:
+		print(f"  Reusing {len(sorted_conv_keys) - len(render_keys)} unchanged conversations, rendering {len(render_keys)}")
+	
+	# Create individual JS files for each conversation
+	PROFILER.begin('Render conversations')
+	rendered = {}
+	render_args = (carrier_number, conv_files_dir, chunk_policy, extract_images)
+	render = profiledRenderConversation if PROFILER.enabled else renderConversation
+	if jobs > 1 and len(render_keys) > 1:
+		print(f"  Rendering {len(render_keys)} conversations with {jobs} worker processes...")
+		# Workers don't inherit the locale on platforms that spawn rather than fork
+		with ProcessPoolExecutor(max_workers=jobs, initializer=locale.setlocale, initargs=(locale.LC_ALL, '')) as executor:
+			# Each worker gets only the names of its conversation's participants, not the whole map
+			results = executor.map(render, render_keys,
+			                       (conversations[k] for k in render_keys),
+			                       *[itertools.repeat(arg) for arg in render_args],
+			                       (participantContacts(conversations[k], contacts) for k in render_keys))
+			for conv_key, result in zip(render_keys, results):
+				rendered[conv_key] = result
+	else:
+		for conv_key in render_keys:
+			rendered[conv_key] = render(conv_key, conversations[conv_key], *render_args, contacts)
+	if PROFILER.enabled:
+		for conv_key, (result, stats) in rendered.items():
+			PROFILER.addConversation(conversations[conv_key], result[0], stats)
+			rendered[conv_key] = result
+	
+	# Merge rendered and reused metadata back in order of most recent message
+	for conv_key in sorted_conv_keys:
+		if conv_key in rendered:
+			meta, conv_media = rendered[conv_key]
+			if incremental:
+				manifest_entries[conv_key]['meta'] = meta
+				manifest_entries[conv_key]['media'] = sorted(conv_media)
+		else:
+			meta, conv_media = manifest_entries[conv_key]['meta'], manifest_entries[conv_key]['media']
+		conv_metadata.append(meta)
+		media_written.update(conv_media)
+	
+	if search_index:
+		PROFILER.begin('Search index')
+	search_info = writeSearchIndex(conv_files_dir, conversations, sorted_conv_keys) if search_index else None
 	
 	# Create messages.html (renamed from 0_index.html)
+	PROFILER.begin('Write messages.html')
 	index_path = os.path.join(subfolder, "messages.html")
 	with open(index_path, 'w', encoding='utf-8') as f:
 		f.write('<!DOCTYPE html>\n<html><head>\n')
@@ -1094,14 +2557,23 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('<button class="back-button" onclick="showList()">←</button>\n')
 		f.write('<h1 id="header-title">Messages</h1>\n')
 		f.write('<div id="headerSearch" class="header-search">\n')
-		f.write('<input type="text" id="searchInput" placeholder="Search..." oninput="filterConversations()" />\n')
+		if search_info:
+			f.write('<input type="text" id="searchInput" placeholder="Search conversations and messages..." oninput="filterConversations(); scheduleMessageSearch()" />\n')
+		else:
+			f.write('<input type="text" id="searchInput" placeholder="Search..." oninput="filterConversations()" />\n')
 		f.write('</div>\n')
 		f.write('<button class="dark-mode-toggle" onclick="toggleDarkMode()" title="Toggle Dark Mode">&#127769;</button>\n')
 		f.write('</div>\n')
 		
-		# Conversation list
-		f.write('<div id="conversation-list" class="conversation-list">\n')
+		# Message search results (filled in by searchMessages)
+		if search_info:
+			f.write('<div id="search-results" class="search-results" style="display: none;"></div>\n')
 		
+		# Conversation list: only the rows on screen are rendered, from the conv-list data below
+		f.write('<div id="conversation-list" class="conversation-list"></div>\n')
+		
+		# Compact list entries [avatar, subtitle, date, search text], in the same order as the metadata
+		conv_list = []
 		for meta in conv_metadata:
 			# Get date string
 			if meta['latest_date']:
@@ -1112,10 +2584,8 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 			
 			# Get initials for avatar
 			if len(meta['participants']) > 1:
-				# Group conversation - create mini avatars
-				is_group = True
+				# Group conversation - one mini avatar initial per participant
 				num_avatars = min(len(meta['participants']), 4)
-				group_class = f"group-{num_avatars}"
 				
 				# Get first letter of each participant
 				participant_initials = []
@@ -1142,12 +2612,8 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 						initial = '#'
 					participant_initials.append(initial)
 				
-				avatar_html = f'<div class="conversation-avatar-group {group_class}">'
-				for initial in participant_initials:
-					avatar_html += f'<div class="mini-avatar">{initial}</div>'
-				avatar_html += '</div>'
+				avatar = participant_initials
 			else:
-				is_group = False
 				# Check if it's an unknown contact (formatted phone number)
 				# Remove all non-alphanumeric except spaces to check
 				name_check = ''.join(c for c in meta['name'] if c.isalnum() or c.isspace()).strip()
@@ -1161,7 +2627,7 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 					else:
 						initials = meta['name'][:2]
 					initials = initials.upper()
-				avatar_html = f'<div class="conversation-avatar">{initials}</div>'
+				avatar = initials
 			
 			# Format subtitle
 			if len(meta['participants']) > 1:
@@ -1171,25 +2637,20 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 			else:
 				subtitle = "Unknown"
 			
-			f.write(f'<div class="conversation-item" data-name="{meta["name"].lower()}" data-participants="{" ".join([formatPhoneNumberSimple(p) for p in meta["participants"]])}" onclick="loadConversation(\'{meta["id"]}\', \'{meta["name"].replace("'", "\\'")}\')">\n')
-			f.write(avatar_html + '\n')
-			f.write('<div class="conversation-info">\n')
-			f.write(f'<div class="conversation-name">{meta["name"]}</div>\n')
-			f.write(f'<div class="conversation-preview">{subtitle}</div>\n')
-			f.write('</div>\n')
-			f.write('<div class="conversation-meta">\n')
-			f.write(f'<div class="conversation-date">{date_str}</div>\n')
-			f.write(f'<div class="conversation-count">{meta["msg_count"]}</div>\n')
-			f.write('</div>\n')
-			f.write('</div>\n')
-		
-		f.write('</div>\n')
+			search_text = meta['name'].lower() + ' ' + ' '.join(formatPhoneNumberSimple(p) for p in meta['participants'])
+			conv_list.append([avatar, subtitle, date_str, search_text])
 		
 		# Container for loaded conversation
 		f.write('<div id="conversation-content" class="conversation-view"></div>\n')
 		
 		f.write('</div>\n')  # Close phone-view
 		
+		# Conversation metadata as real JSON, parsed once at startup ('<' escaped so it can't end the block)
+		metadata_json = json.dumps(conv_metadata, ensure_ascii=False, separators=(',', ':')).replace('<', '\\u003c')
+		f.write(f'<script type="application/json" id="conv-metadata">{metadata_json}</script>\n')
+		list_json = json.dumps(conv_list, ensure_ascii=False, separators=(',', ':')).replace('<', '\\u003c')
+		f.write(f'<script type="application/json" id="conv-list">{list_json}</script>\n')
+		
 		# JavaScript - define image modal functions first, before everything else
 		f.write('<script>\n')
 		f.write('// Image modal functions (must be globally available)\n')
@@ -1204,7 +2665,8 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('  return new Promise((resolve, reject) => {\n')
 		f.write('    const script = document.createElement("script");\n')
 		f.write('    script.src = src;\n')
-		f.write('    script.onload = () => resolve();\n')
+		f.write('    // The script has defined its globals once loaded, so the element itself can go\n')
+		f.write('    script.onload = () => { script.remove(); resolve(); };\n')
 		f.write('    script.onerror = () => reject(new Error(`Failed to load ${src}`));\n')
 		f.write('    document.head.appendChild(script);\n')
 		f.write('  });\n')
@@ -1216,6 +2678,17 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('\n')
 		f.write('// Month jump function (works for both chunked and non-chunked conversations)\n')
 		f.write('function jumpToMonth(monthId) {\n')
+		f.write('  // In a paged conversation, load only the page holding the month and jump once it renders\n')
+		f.write('  if (openChunked) {\n')
+		f.write('    const chunkNum = openChunked.meta.month_chunks[monthId.slice(6, 10)];\n')
+		f.write('    if (chunkNum && chunkNum !== openChunked.current()) {\n')
+		f.write('      pendingJump = monthId;\n')
+		f.write('      openChunked.showChunk(chunkNum);\n')
+		f.write('      return;\n')
+		f.write('    }\n')
+		f.write('  }\n')
+		f.write('  // Months outside the rendered rows are brought in by the virtual list first\n')
+		f.write('  if (virtualList && virtualList.scrollToAnchor(monthId)) return;\n')
 		f.write('  const anchor = document.getElementById(monthId);\n')
 		f.write('  if (anchor) {\n')
 		f.write("    anchor.scrollIntoView({ behavior: 'smooth' });\n")
@@ -1240,16 +2713,187 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		
 		# Rest of the JavaScript - UPDATE PATHS TO INCLUDE conv_files/
 		f.write('const loadedConversations = new Set();\n')
-		f.write('const convMetadata = ' + str(conv_metadata).replace("'", '"').replace('True', 'true').replace('False', 'false') + ';\n\n')
+		f.write('// Most chunks kept in memory at once (--chunk-cache; override with localStorage.chunkCacheSize)\n')
+		f.write(f'const CHUNK_CACHE_SIZE = Math.max(1, parseInt(localStorage.getItem("chunkCacheSize"), 10) || {chunk_cache});\n')
+		f.write('const chunkCache = new Map(); // "<id>_<n>" -> load promise, least recently used first\n')
+		f.write('const convMetadata = JSON.parse(document.getElementById("conv-metadata").textContent);\n')
+		f.write('const convById = new Map(convMetadata.map(meta => [meta.id, meta]));\n')
+		f.write('const convList = JSON.parse(document.getElementById("conv-list").textContent);\n\n')
+		
+		f.write('// Virtualized message list: rows are grouped into blocks and only blocks near the viewport are in the DOM\n')
+		f.write('const ownSender = ' + json.dumps(f"You<br>{formatPhoneNumber(carrier_number)}") + ';\n')
+		f.write('const VIRTUAL_BLOCK_ROWS = 100;\n')
+		f.write('const VIRTUAL_OVERSCAN = 1000; // px rendered above and below the viewport\n')
+		f.write('const VIRTUAL_ROW_ESTIMATE = 60; // px per row until a block has been measured\n')
+		f.write('const MESSAGE_TABLE_START = \'<table class="messages_table"><colgroup><col style="width: 80px;"><col style="width: 150px;"><col style="width: 200px;"><col></colgroup>\';\n')
+		f.write('const MESSAGE_TABLE_HEAD = "<tr><th>Type</th><th>Date</th><th>Name / Number</th><th>Content</th></tr>";\n')
+		f.write('let virtualList = null;\n')
+		f.write('let openChunked = null; // { meta, showChunk, current } of the paged conversation on screen\n\n')
+		
+		f.write('function messageRowHtml(row) {\n')
+		f.write('  let rowClass = "msg_received";\n')
+		f.write('  let label = "Received";\n')
+		f.write('  let sender = row[3];\n')
+		f.write('  if (row[0] === 1) {\n')
+		f.write('    rowClass = "msg_sent";\n')
+		f.write('    label = "Sent";\n')
+		f.write('    sender = ownSender;\n')
+		f.write('  } else if (row[0] !== 0) {\n')
+		f.write('    label = "Type " + row[0];\n')
+		f.write('  }\n')
+		f.write('  let html = `<tr class="${rowClass}"><td class="msg_type">${label}</td><td class="msg_date">${row[1]}<br>${row[2]}</td><td class="msg_contact">${sender}</td><td>${row[4]}`;\n')
+		f.write('  if (row.length > 5) {\n')
+		f.write('    for (const src of row[5]) {\n')
+		f.write('      const lazy = src.startsWith("data:") ? "" : \' loading="lazy"\';\n')
+		f.write('      html += `<br><img class="mms_img"${lazy} src="${src}" alt="MMS Image" onclick="openImageModal(this.src)" />`;\n')
+		f.write('    }\n')
+		f.write('  }\n')
+		f.write('  return html + "</td></tr>";\n')
+		f.write('}\n\n')
+		
+		f.write('function messageBlockHtml(rows, start, end) {\n')
+		f.write('  let html = "";\n')
+		f.write('  let inTable = false;\n')
+		f.write('  for (let i = start; i < end; i++) {\n')
+		f.write('    const row = rows[i];\n')
+		f.write('    if (row[0] === "m") {\n')
+		f.write('      if (inTable) html += "</table>";\n')
+		f.write('      html += `<a id="month-${row[2]}"></a><h2>${row[1]}</h2>` + MESSAGE_TABLE_START + MESSAGE_TABLE_HEAD;\n')
+		f.write('      inTable = true;\n')
+		f.write('    } else {\n')
+		f.write('      if (!inTable) html += MESSAGE_TABLE_START;\n')
+		f.write('      inTable = true;\n')
+		f.write('      html += messageRowHtml(row);\n')
+		f.write('    }\n')
+		f.write('  }\n')
+		f.write('  return inTable ? html + "</table>" : html;\n')
+		f.write('}\n\n')
+		
+		f.write('function createVirtualList(container, rows) {\n')
+		f.write('  const blockCount = Math.ceil(rows.length / VIRTUAL_BLOCK_ROWS);\n')
+		f.write('  const heights = [];\n')
+		f.write('  for (let b = 0; b < blockCount; b++) {\n')
+		f.write('    heights.push(Math.min(VIRTUAL_BLOCK_ROWS, rows.length - b * VIRTUAL_BLOCK_ROWS) * VIRTUAL_ROW_ESTIMATE);\n')
+		f.write('  }\n')
+		f.write('  const topSpacer = document.createElement("div");\n')
+		f.write('  const blocksEl = document.createElement("div");\n')
+		f.write('  const bottomSpacer = document.createElement("div");\n')
+		f.write('  container.replaceChildren(topSpacer, blocksEl, bottomSpacer);\n')
+		f.write('  const rendered = new Map(); // block number -> element\n')
+		f.write('  let frame = 0;\n')
+		f.write('  \n')
+		f.write('  // Blocks grow when their images load, so keep measuring them while they are shown\n')
+		f.write('  const observer = new ResizeObserver(entries => {\n')
+		f.write('    for (const entry of entries) {\n')
+		f.write('      const height = entry.target.offsetHeight;\n')
+		f.write('      if (height) heights[Number(entry.target.dataset.block)] = height;\n')
+		f.write('    }\n')
+		f.write('    schedule();\n')
+		f.write('  });\n')
+		f.write('  \n')
+		f.write('  function schedule() {\n')
+		f.write('    if (!frame) frame = requestAnimationFrame(update);\n')
+		f.write('  }\n')
+		f.write('  \n')
+		f.write('  function render(first, last) {\n')
+		f.write('    for (const [b, el] of rendered) {\n')
+		f.write('      if (b < first || b > last) {\n')
+		f.write('        observer.unobserve(el);\n')
+		f.write('        rendered.delete(b);\n')
+		f.write('      }\n')
+		f.write('    }\n')
+		f.write('    const children = [];\n')
+		f.write('    for (let b = first; b <= last; b++) {\n')
+		f.write('      let el = rendered.get(b);\n')
+		f.write('      if (!el) {\n')
+		f.write('        el = document.createElement("div");\n')
+		f.write('        el.dataset.block = b;\n')
+		f.write('        el.innerHTML = messageBlockHtml(rows, b * VIRTUAL_BLOCK_ROWS, Math.min(rows.length, (b + 1) * VIRTUAL_BLOCK_ROWS));\n')
+		f.write('        rendered.set(b, el);\n')
+		f.write('        observer.observe(el);\n')
+		f.write('      }\n')
+		f.write('      children.push(el);\n')
+		f.write('    }\n')
+		f.write('    let above = 0;\n')
+		f.write('    let below = 0;\n')
+		f.write('    for (let b = 0; b < first; b++) above += heights[b];\n')
+		f.write('    for (let b = last + 1; b < blockCount; b++) below += heights[b];\n')
+		f.write('    topSpacer.style.height = above + "px";\n')
+		f.write('    bottomSpacer.style.height = below + "px";\n')
+		f.write('    blocksEl.replaceChildren(...children);\n')
+		f.write('  }\n')
+		f.write('  \n')
+		f.write('  function update() {\n')
+		f.write('    frame = 0;\n')
+		f.write('    if (blockCount === 0) return;\n')
+		f.write('    const viewTop = -container.getBoundingClientRect().top - VIRTUAL_OVERSCAN;\n')
+		f.write('    const viewBottom = viewTop + window.innerHeight + 2 * VIRTUAL_OVERSCAN;\n')
+		f.write('    let first = -1;\n')
+		f.write('    let last = blockCount - 1;\n')
+		f.write('    let y = 0;\n')
+		f.write('    for (let b = 0; b < blockCount; b++) {\n')
+		f.write('      if (first < 0 && y + heights[b] > viewTop) first = b;\n')
+		f.write('      y += heights[b];\n')
+		f.write('      if (y >= viewBottom) {\n')
+		f.write('        last = b;\n')
+		f.write('        break;\n')
+		f.write('      }\n')
+		f.write('    }\n')
+		f.write('    if (first < 0) first = blockCount - 1;\n')
+		f.write('    render(first, Math.max(first, last));\n')
+		f.write('  }\n')
+		f.write('  \n')
+		f.write('  window.addEventListener("scroll", schedule, { passive: true });\n')
+		f.write('  window.addEventListener("resize", schedule);\n')
+		f.write('  update();\n')
+		f.write('  \n')
+		f.write('  return {\n')
+		f.write('    scrollToAnchor(anchorId) {\n')
+		f.write('      const index = rows.findIndex(row => row[0] === "m" && "month-" + row[2] === anchorId);\n')
+		f.write('      if (index < 0) return false;\n')
+		f.write('      const block = Math.floor(index / VIRTUAL_BLOCK_ROWS);\n')
+		f.write('      render(block, Math.min(blockCount - 1, block + 1));\n')
+		f.write('      document.getElementById(anchorId).scrollIntoView();\n')
+		f.write('      schedule();\n')
+		f.write('      return true;\n')
+		f.write('    },\n')
+		f.write('    destroy() {\n')
+		f.write('      observer.disconnect();\n')
+		f.write('      window.removeEventListener("scroll", schedule);\n')
+		f.write('      window.removeEventListener("resize", schedule);\n')
+		f.write('      if (frame) cancelAnimationFrame(frame);\n')
+		f.write('    }\n')
+		f.write('  };\n')
+		f.write('}\n\n')
+		
+		f.write('// Replace the conversation view with html, rendering rows into its .virtual-list element\n')
+		f.write('function showMessages(content, html, rows) {\n')
+		f.write('  if (virtualList) virtualList.destroy();\n')
+		f.write('  content.innerHTML = html;\n')
+		f.write('  virtualList = createVirtualList(content.querySelector(".virtual-list"), rows);\n')
+		f.write('}\n\n')
+		
+		f.write('// Month anchor to scroll to once the conversation being opened has rendered\n')
+		f.write('let pendingJump = null;\n')
+		f.write('function applyPendingJump() {\n')
+		f.write('  if (pendingJump) {\n')
+		f.write('    const target = pendingJump;\n')
+		f.write('    pendingJump = null;\n')
+		f.write('    setTimeout(() => jumpToMonth(target), 0);\n')
+		f.write('  }\n')
+		f.write('}\n\n')
 		
-		f.write('function loadConversation(id, name) {\n')
+		f.write('function loadConversation(id, startChunk) {\n')
+		f.write('  const meta = convById.get(id);\n')
+		f.write('  openChunked = null;\n')
 		f.write('  document.getElementById("conversation-list").style.display = "none";\n')
+		if search_info:
+			f.write('  document.getElementById("search-results").style.display = "none";\n')
 		f.write('  document.querySelector(".back-button").style.display = "block";\n')
-		f.write('  document.getElementById("header-title").textContent = name;\n')
+		f.write('  document.getElementById("header-title").textContent = meta ? meta.name : "Messages";\n')
 		f.write('  document.getElementById("headerSearch").classList.add("hidden");\n')
 		f.write('  const content = document.getElementById("conversation-content");\n')
 		f.write('  \n')
-		f.write('  const meta = convMetadata.find(m => m.id === id);\n')
 		f.write('  if (!meta) {\n')
 		f.write('    content.innerHTML = "<div style=\\"padding: 40px; text-align: center; color: red;\\">Conversation not found</div>";\n')
 		f.write('    return;\n')
@@ -1261,14 +2905,17 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('      // Reload with proper pagination\n')
 		f.write('      content.classList.remove("no-pagination");\n')
 		f.write('      content.style.display = "block";\n')
-		f.write('      loadChunkedConversation(id, meta);\n')
+		f.write('      loadChunkedConversation(id, meta, startChunk);\n')
 		f.write('      return; // Exit early\n')
 		f.write('    } else {\n')
-		f.write('      content.innerHTML = window["convData_" + id];\n')
+		f.write('      content.style.display = "block";\n')
+		f.write('      const data = window["convData_" + id];\n')
+		f.write('      showMessages(content, data.header + \'<div class="virtual-list"></div>\', data.rows);\n')
 		f.write('      content.classList.add("no-pagination");\n')
 		f.write('    }\n')
 		f.write('    content.style.display = "block";\n')
 		f.write('    window.scrollTo(0, 0);\n')
+		f.write('    applyPendingJump();\n')
 		f.write('  } else {\n')
 		f.write('    // Load the conversation\n')
 		f.write('    content.innerHTML = "<div style=\\"padding: 40px; text-align: center;\\">Loading conversation...</div>";\n')
@@ -1276,14 +2923,16 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('    \n')
 		f.write('    if (meta.chunked) {\n')
 		f.write('      // Load chunked conversation\n')
-		f.write('      loadChunkedConversation(id, meta);\n')
+		f.write('      loadChunkedConversation(id, meta, startChunk);\n')
 		f.write('    } else {\n')
 		f.write('      // Load single file - ADD conv_files/ prefix\n')
-		f.write('      loadScript("conv_files/" + meta.js_file, () => {\n')
+		f.write('      loadPayload(convFileUrl(meta, meta.js_file), "convData_" + id).then(() => {\n')
 		f.write('        loadedConversations.add(id);\n')
-		f.write('        content.innerHTML = window["convData_" + id];\n')
+		f.write('        const data = window["convData_" + id];\n')
+		f.write('        showMessages(content, data.header + \'<div class="virtual-list"></div>\', data.rows);\n')
 		f.write('        content.classList.add("no-pagination");\n')
 		f.write('        window.scrollTo(0, 0);\n')
+		f.write('        applyPendingJump();\n')
 		f.write('      }, () => {\n')
 		f.write('        content.innerHTML = "<div style=\\"padding: 40px; text-align: center; color: red;\\">Error loading conversation</div>";\n')
 		f.write('      });\n')
@@ -1291,7 +2940,43 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('  }\n')
 		f.write('}\n\n')
 		
-		f.write('function loadChunkedConversation(id, meta) {\n')
+		f.write('// Load a chunk (or reuse it) and mark it most recently used, dropping the oldest chunks over the cap\n')
+		f.write('function loadChunk(id, meta, chunkNum) {\n')
+		f.write('  const key = id + "_" + chunkNum;\n')
+		f.write('  let promise = chunkCache.get(key);\n')
+		f.write('  if (promise) {\n')
+		f.write('    chunkCache.delete(key);\n')
+		f.write('  } else {\n')
+		f.write('    promise = loadPayload(convFileUrl(meta, meta.chunk_files[chunkNum - 1]), "convChunk_" + key).then(() => {\n')
+		f.write('      // Evicted while still loading\n')
+		f.write('      if (!chunkCache.has(key)) delete window["convChunk_" + key];\n')
+		f.write('    });\n')
+		f.write('    promise.catch(() => chunkCache.delete(key));\n')
+		f.write('  }\n')
+		f.write('  chunkCache.set(key, promise);\n')
+		f.write('  while (chunkCache.size > CHUNK_CACHE_SIZE) {\n')
+		f.write('    const oldest = chunkCache.keys().next().value;\n')
+		f.write('    chunkCache.delete(oldest);\n')
+		f.write('    delete window["convChunk_" + oldest];\n')
+		f.write('  }\n')
+		f.write('  return promise;\n')
+		f.write('}\n\n')
+		
+		f.write('// Fetch the pages either side of the one on screen in the background, as far as the cache allows\n')
+		f.write('function prefetchChunks(id, meta, chunkNum) {\n')
+		f.write('  const neighbours = [chunkNum + 1, chunkNum - 1]\n')
+		f.write('    .filter(n => n >= 1 && n <= meta.chunk_files.length)\n')
+		f.write('    .slice(0, CHUNK_CACHE_SIZE - 1);\n')
+		f.write('  if (!neighbours.length) return;\n')
+		f.write('  const idle = window.requestIdleCallback || (callback => setTimeout(callback, 200));\n')
+		f.write('  idle(() => {\n')
+		f.write('    if (!openChunked || openChunked.meta !== meta || openChunked.current() !== chunkNum) return;\n')
+		f.write('    neighbours.forEach(n => loadChunk(id, meta, n).catch(() => {}));\n')
+		f.write('    loadChunk(id, meta, chunkNum); // Keep the page on screen the most recently used\n')
+		f.write('  });\n')
+		f.write('}\n\n')
+		
+		f.write('function loadChunkedConversation(id, meta, startChunk) {\n')
 		f.write('  const content = document.getElementById("conversation-content");\n')
 		f.write('  let currentChunk = 1;\n')
 		f.write('  let isLoading = false;\n')
@@ -1308,20 +2993,18 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('      </div>\n')
 		f.write('    </div>`;\n')
 		f.write('    \n')
-		f.write('    // Load header if first chunk\n')
-		f.write('    const headerPromise = chunkNum === 1 && !window["convHeader_" + id] ? \n')
-		f.write('      loadScriptPromise("conv_files/" + meta.header_file) : Promise.resolve();\n')
+		f.write('    // Load the header with whichever chunk is shown first\n')
+		f.write('    const headerPromise = !window["convHeader_" + id] ? \n')
+		f.write('      loadPayload(convFileUrl(meta, meta.header_file), "convHeader_" + id) : Promise.resolve();\n')
 		f.write('    \n')
-		f.write('    // Load the chunk if not already loaded\n')
-		f.write('    const chunkFile = meta.chunk_files[chunkNum - 1];\n')
-		f.write('    const chunkPromise = !window["convChunk_" + id + "_" + chunkNum] ? \n')
-		f.write('      loadScriptPromise("conv_files/" + chunkFile) : Promise.resolve();\n')
+		f.write('    // Load the chunk unless it is still cached (usually prefetched)\n')
+		f.write('    const chunkPromise = loadChunk(id, meta, chunkNum);\n')
 		f.write('    \n')
 		f.write('    Promise.all([headerPromise, chunkPromise])\n')
 		f.write('      .then(() => {\n')
 		f.write('        // Render the chunk\n')
 		f.write('        const header = window["convHeader_" + id] || "";\n')
-		f.write('        const chunk = window["convChunk_" + id + "_" + chunkNum] || "<p>Error: Chunk not found</p>";\n')
+		f.write('        const rows = window["convChunk_" + id + "_" + chunkNum];\n')
 		f.write('        \n')
 		f.write('        // Build pagination controls\n')
 		f.write('        const totalChunks = meta.chunk_files.length;\n')
@@ -1334,62 +3017,14 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('        `;\n')
 		f.write('        const paginationBottom = paginationTop.replace("pagination-controls", "pagination-controls" + " style=\\"position: static;\\"");\n')
 		f.write('        \n')
-		f.write('        content.innerHTML = paginationTop + \'<div style="padding-top: 0px;">\' + header + chunk + \'</div>\' + paginationBottom;\n')
+		f.write('        const body = rows ? \'<div class="virtual-list"></div>\' : "<p>Error: Chunk not found</p>";\n')
+		f.write('        showMessages(content, paginationTop + \'<div style="padding-top: 0px;">\' + header + body + \'</div>\' + paginationBottom, rows || []);\n')
 		f.write('        \n')
-		f.write('        // Filter month links to show only months present in current chunk\n')
-		f.write('        setTimeout(() => {\n')
-		f.write('          const monthJumpDiv = content.querySelector(".month-jump");\n')
-		f.write('          if (monthJumpDiv) {\n')
-		f.write('            const allLinks = monthJumpDiv.querySelectorAll("a");\n')
-		f.write('            const monthsOnPage = new Set();\n')
-		f.write('            \n')
-		f.write('            const monthHeaders = content.querySelectorAll("h2");\n')
-		f.write('            monthHeaders.forEach(h2 => {\n')
-		f.write('              monthsOnPage.add(h2.textContent.trim());\n')
-		f.write('            });\n')
-		f.write('            \n')
-		f.write('            let visibleCount = 0;\n')
-		f.write('            allLinks.forEach((link, index) => {\n')
-		f.write('              const monthText = link.textContent.trim();\n')
-		f.write('              const nextSibling = link.nextSibling;\n')
-		f.write('              \n')
-		f.write('              if (monthsOnPage.has(monthText)) {\n')
-		f.write('                link.style.display = "inline";\n')
-		f.write('                visibleCount++;\n')
-		f.write('                \n')
-		f.write('                if (nextSibling && nextSibling.nodeType === 3 && nextSibling.textContent.includes("|")) {\n')
-		f.write('                  const nextLink = link.nextElementSibling;\n')
-		f.write('                  if (nextLink && monthsOnPage.has(nextLink.textContent.trim())) {\n')
-		f.write('                    nextSibling.textContent = " | ";\n')
-		f.write('                  } else {\n')
-		f.write('                    nextSibling.textContent = " ";\n')
-		f.write('                  }\n')
-		f.write('                }\n')
-		f.write('              } else {\n')
-		f.write('                link.style.display = "none";\n')
-		f.write('                if (nextSibling && nextSibling.nodeType === 3) {\n')
-		f.write('                  nextSibling.textContent = " ";\n')
-		f.write('                }\n')
-		f.write('              }\n')
-		f.write('            });\n')
-		f.write('            \n')
-		f.write('            if (monthJumpDiv.textContent.trim().startsWith("|")) {\n')
-		f.write('              const firstText = monthJumpDiv.childNodes[0];\n')
-		f.write('              if (firstText && firstText.nodeType === 3) {\n')
-		f.write('                firstText.textContent = firstText.textContent.replace(/^\\\\s*\\\\|\\\\s*/, "");\n')
-		f.write('              }\n')
-		f.write('            }\n')
-		f.write('            \n')
-		f.write('            if (visibleCount === 0) {\n')
-		f.write('              monthJumpDiv.style.display = "none";\n')
-		f.write('            } else {\n')
-		f.write('              monthJumpDiv.style.display = "block";\n')
-		f.write('            }\n')
-		f.write('          }\n')
-		f.write('        }, 100);\n')
 		f.write('        currentChunk = chunkNum;\n')
 		f.write('        isLoading = false;\n')
 		f.write('        window.scrollTo(0, 0);\n')
+		f.write('        applyPendingJump();\n')
+		f.write('        prefetchChunks(id, meta, chunkNum);\n')
 		f.write('      })\n')
 		f.write('      .catch(err => {\n')
 		f.write('        content.innerHTML = `<div style="padding: 40px; text-align: center; color: red;">Error loading chunk ${chunkNum}: ${err.message}</div>`;\n')
@@ -1415,20 +3050,39 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('  \n')
 		f.write('  // Mark as loaded and show first chunk\n')
 		f.write('  loadedConversations.add(id);\n')
+		f.write('  openChunked = { meta, showChunk, current: () => currentChunk };\n')
 		f.write('  \n')
 		f.write('  \n')
-		f.write('  showChunk(1);\n')
+		f.write('  showChunk(startChunk || 1);\n')
 		f.write('}\n\n')
 		
-		f.write('function loadScript(src, onSuccess, onError) {\n')
-		f.write('  const script = document.createElement("script");\n')
-		f.write('  script.src = src;\n')
-		f.write('  script.onload = onSuccess;\n')
-		f.write('  script.onerror = onError;\n')
-		f.write('  document.head.appendChild(script);\n')
+		f.write('// Versioned so that servers can let browsers cache conversation files indefinitely\n')
+		f.write('function convFileUrl(meta, filename) {\n')
+		f.write('  return "conv_files/" + filename + "?v=" + meta.v;\n')
+		f.write('}\n\n')
+		
+		f.write('// Every payload file is "window.<name> = <JSON>;". Over HTTP it is fetched and the JSON parsed directly,\n')
+		f.write('// which is much faster than evaluating it as a script; from file://, where fetch is blocked, it is run as one\n')
+		f.write('const fetchPayloads = location.protocol === "http:" || location.protocol === "https:";\n')
+		f.write('function loadPayload(src, name) {\n')
+		f.write('  if (!fetchPayloads) return loadScriptPromise(src);\n')
+		f.write('  return fetch(src)\n')
+		f.write('    .then(response => {\n')
+		f.write('      if (!response.ok) throw new Error(`Failed to load ${src}`);\n')
+		f.write('      return response.text();\n')
+		f.write('    })\n')
+		f.write('    .then(text => {\n')
+		f.write('      window[name] = JSON.parse(text.slice(text.indexOf("=") + 1, text.lastIndexOf(";")));\n')
+		f.write('    })\n')
+		f.write('    .catch(() => loadScriptPromise(src));\n')
 		f.write('}\n\n')
 		
 		f.write('function showList() {\n')
+		f.write('  openChunked = null;\n')
+		f.write('  if (virtualList) {\n')
+		f.write('    virtualList.destroy();\n')
+		f.write('    virtualList = null;\n')
+		f.write('  }\n')
 		f.write('  document.getElementById("conversation-list").style.display = "block";\n')
 		f.write('  document.getElementById("conversation-content").style.display = "none";\n')
 		f.write('  document.querySelector(".back-button").style.display = "none";\n')
@@ -1436,810 +3090,413 @@ def dumpConversationsSplit(subfolder, conversations, carrier_number, sorted_conv
 		f.write('  document.getElementById("headerSearch").classList.remove("hidden");\n')
 		f.write('  document.getElementById("searchInput").value = "";\n')
 		f.write('  filterConversations();\n')
+		if search_info:
+			f.write('  searchMessages("");\n')
 		f.write('  window.scrollTo(0, 0);\n')
 		f.write('}\n\n')
 		
-		f.write('function filterConversations() {\n')
-		f.write('  const searchTerm = document.getElementById("searchInput").value.toLowerCase();\n')
-		f.write('  const items = document.querySelectorAll(".conversation-item");\n')
-		f.write('  \n')
-		f.write('  items.forEach(item => {\n')
-		f.write('    const name = item.getAttribute("data-name");\n')
-		f.write('    const participants = item.getAttribute("data-participants");\n')
-		f.write('    const searchText = name + " " + participants;\n')
-		f.write('    \n')
-		f.write('    if (searchText.includes(searchTerm)) {\n')
-		f.write('      item.style.display = "flex";\n')
-		f.write('    } else {\n')
-		f.write('      item.style.display = "none";\n')
-		f.write('    }\n')
-		f.write('  });\n')
-		f.write('}\n')
-		f.write('</script>\n')
-		
-		f.write('</body></html>\n')
-	
-	print(f"  Created messages.html and {len(conv_metadata)} conversation JS files in conv_files/\n")
-	return f"{base_filename}/messages.html"
-
-	"""Split large conversation sets - each conversation in separate files, large ones split into chunks"""
-	print(f"\n⚠️  Large file detected! Creating separate conversation files in subfolder: {base_filename}/")
-	
-	conv_metadata = []
-	max_chunk_size = 50 * 1024 * 1024  # 50MB per chunk (in characters)
-	
-	# Create individual JS files for each conversation
-	for conv_key in sorted_conv_keys:
-		conv = conversations[conv_key]
-		safe_id = re.sub('[^A-Za-z0-9_-]', '_', conv_key)
-		contact_map = conv.get('contact_map', {})
-		
-		# Build all message HTML first to check size
-		message_htmls = []
-		
-		# Generate month TOC and messages
-		prev_month_year = ""
-		months = []
-		month_amap = {}
-		sorted_dates = sorted(conv['messages'].keys(), reverse=True)
-		
-		for date in sorted_dates:
-			msg = conv['messages'][date]
-			dt = datetime.datetime.fromtimestamp(msg.timestamp / 1000, tz=None)
-			month_year = dt.strftime('%B %Y')
-			if month_year != prev_month_year:
-				month_year_short = dt.strftime('%y%m') + '_' + safe_id
-				months.append(month_year)
-				month_amap[month_year] = month_year_short
-			prev_month_year = month_year
-		
-		# Generate messages grouped by month
-		prev_month_year = ""
-		current_month_html = []
-		
-		for date in sorted_dates:
-			msg = conv['messages'][date]
-			dt = datetime.datetime.fromtimestamp(msg.timestamp / 1000, tz=None)
-			month_year = dt.strftime('%B %Y')
-			
-			if month_year != prev_month_year:
-				# Save previous month if exists
-				if current_month_html:
-					current_month_html.append('</table>')
-					message_htmls.append({
-						'month': prev_month_year,
-						'html': ''.join(current_month_html),
-						'anchor': month_amap[prev_month_year]
-					})
-					current_month_html = []
-				
-				# Start new month
-				current_month_html.append(f'<a id="month-{month_amap[month_year]}"></a>')
-				current_month_html.append(f"<h2>{month_year}</h2>")
-				current_month_html.append('<table class="messages_table">')
-				current_month_html.append('<tr>')
-				current_month_html.append('<th style="width: 80px;">Type</th>')
-				current_month_html.append('<th style="width: 150px;">Date</th>')
-				current_month_html.append('<th style="width: 200px;">Name / Number</th>')
-				current_month_html.append('<th>Content</th>')
-				current_month_html.append('</tr>')
-			
-			# Determine message type and styling
-			if msg.type_ in ['1', '137', '130']:
-				msg_type = 'Received'
-				row_class = 'msg_received'
-				if msg.sender_name and msg.sender_address:
-					sender_info = f"{msg.sender_name}<br>{formatPhoneNumber(msg.sender_address)}"
-				elif msg.sender_address:
-					sender_info = f"{formatPhoneNumber(msg.sender_address)}"
-				else:
-					sender_info = msg.sender_name or "Unknown"
-			elif msg.type_ in ['2', '151']:
-				msg_type = 'Sent'
-				row_class = 'msg_sent'
-				sender_info = f"You<br>{formatPhoneNumber(carrier_number)}"
-			else:
-				msg_type = f'Type {msg.type_}'
-				row_class = 'msg_received'
-				sender_info = f"{msg.sender_name}<br>{formatPhoneNumber(msg.sender_address) if msg.sender_address else ''}"
-			
-			current_month_html.append(f'<tr class="{row_class}">')
-			current_month_html.append(f'<td class="msg_type">{msg_type}</td>')
-			current_month_html.append(f'<td class="msg_date">{dt.strftime("%b %d, %Y")}<br>{dt.strftime("%I:%M:%S %p")}</td>')
-			current_month_html.append(f'<td class="msg_contact">{sender_info}</td>')
-			current_month_html.append('<td>')
-			
-			msg_text = msg.text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
-			current_month_html.append(msg_text)
-			
-			if isinstance(msg, MMSMsg) and msg.images:
-				for img_data in msg.images:
-					current_month_html.append(f'<br><img class="mms_img" src="{img_data}" alt="MMS Image" onclick="openImageModal(this.src)" />')
-			
-			current_month_html.append('</td>')
-			current_month_html.append('</tr>')
-			prev_month_year = month_year
-		
-		# Save last month
-		if current_month_html:
-			current_month_html.append('</table>')
-			message_htmls.append({
-				'month': prev_month_year,
-				'html': ''.join(current_month_html),
-				'anchor': month_amap[prev_month_year]
-			})
-		
-		# Create header HTML
-		header_html = []
-		if len(conv['participants']) > 1:
-			header_html.append('<div class="conversation-details">')
-			header_html.append('<p><strong>Group Conversation</strong></p>')
-			header_html.append('<p><strong>Participants:</strong> ')
-			participant_info = []
-			for addr in conv['participants']:
-				name = contact_map.get(addr, formatPhoneNumber(addr))
-				phone = formatPhoneNumberSimple(addr)
-				participant_info.append(f"{name} ({phone})")
-			header_html.append(', '.join(participant_info))
-			header_html.append('</p>')
-			header_html.append(f'<p><strong>Total Messages:</strong> {len(conv["messages"])}</p>')
-			header_html.append('</div>')
-		
-		if len(months) > 1:
-			header_html.append('<div class="month-jump"><strong>Jump to:</strong> ')
-			month_links = []
-			for month_year in months:
-				month_links.append(f'<a href="javascript:void(0)" onclick="jumpToMonth(\'month-{month_amap[month_year]}\')">{month_year}</a>')
-			header_html.append(' | '.join(month_links))
-			header_html.append('</div>')
-		
-		# Decide if we need to chunk this conversation
-		total_size = len(''.join(header_html)) + sum(len(m['html']) for m in message_htmls)
-		
-		if total_size > max_chunk_size:
-			# Large conversation - split into chunks by month
-			print(f"  Large conversation detected: {conv['name']} (~{total_size/1024/1024:.1f}MB), splitting into chunks...")
-			
-			chunk_num = 0
-			current_chunk = []
-			current_chunk_size = 0
-			chunk_files = []
-			
-			for msg_data in message_htmls:
-				msg_size = len(msg_data['html'])
-				
-				if current_chunk_size + msg_size > max_chunk_size and current_chunk:
-					# Write current chunk
-					chunk_num += 1
-					chunk_filename = f"conv_{safe_id}_chunk{chunk_num}.js"
-					chunk_path = os.path.join(subfolder, chunk_filename)
-					
-					chunk_html = ''.join(current_chunk)
-					escaped_html = chunk_html.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-					
-					with open(chunk_path, 'w', encoding='utf-8') as jsf:
-						jsf.write(f'window.convChunk_{safe_id}_{chunk_num} = `{escaped_html}`;')
-					
-					chunk_files.append(chunk_filename)
-					current_chunk = []
-					current_chunk_size = 0
-				
-				current_chunk.append(msg_data['html'])
-				current_chunk_size += msg_size
-			
-			# Write last chunk
-			if current_chunk:
-				chunk_num += 1
-				chunk_filename = f"conv_{safe_id}_chunk{chunk_num}.js"
-				chunk_path = os.path.join(subfolder, chunk_filename)
-				
-				chunk_html = ''.join(current_chunk)
-				escaped_html = chunk_html.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-				
-				with open(chunk_path, 'w', encoding='utf-8') as jsf:
-					jsf.write(f'window.convChunk_{safe_id}_{chunk_num} = `{escaped_html}`;')
-				
-				chunk_files.append(chunk_filename)
-			
-			# Write header file
-			header_filename = f"conv_{safe_id}_header.js"
-			header_path = os.path.join(subfolder, header_filename)
-			header_escaped = ''.join(header_html).replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-			
-			with open(header_path, 'w', encoding='utf-8') as jsf:
-				jsf.write(f'window.convHeader_{safe_id} = `{header_escaped}`;')
-			
-			conv_metadata.append({
-				'id': safe_id,
-				'chunked': True,
-				'header_file': header_filename,
-				'chunk_files': chunk_files,
-				'name': conv['name'],
-				'participants': conv['participants'],
-				'msg_count': len(conv['messages']),
-				'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0
-			})
-			
-		else:
-			# Small enough - single file
-			js_filename = f"conv_{safe_id}.js"
-			js_path = os.path.join(subfolder, js_filename)
-			
-			full_html = ''.join(header_html) + ''.join(m['html'] for m in message_htmls)
-			escaped_html = full_html.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
-			
-			with open(js_path, 'w', encoding='utf-8') as jsf:
-				jsf.write(f'window.convData_{safe_id} = `{escaped_html}`;')
-			
-			conv_metadata.append({
-				'id': safe_id,
-				'chunked': False,
-				'js_file': js_filename,
-				'name': conv['name'],
-				'participants': conv['participants'],
-				'msg_count': len(conv['messages']),
-				'latest_date': max(conv['messages'].keys()) if conv['messages'] else 0
-			})
-	
-	# Create index HTML
-	index_path = os.path.join(subfolder, "0_index.html")
-	with open(index_path, 'w', encoding='utf-8') as f:
-		f.write('<!DOCTYPE html>\n<html><head>\n')
-		f.write('<meta charset="UTF-8">\n')
-		f.write('<meta name="viewport" content="width=device-width, initial-scale=1.0">\n')
-		f.write('<style>\n')
-		f.write(STYLESHEET_TEMPLATE)
-		f.write('</style>\n')
-		f.write(f'<title>{base_filename}</title>\n')
-		f.write('</head><body>\n')
-		
-		# Image modal (at top level, always available)
-		f.write('<div id="imageModal" class="image-modal" onclick="closeImageModal()">\n')
-		f.write('<span class="image-modal-close">&times;</span>\n')
-		f.write('<img id="modalImage" src="" />\n')
-		f.write('</div>\n')
-		
-		f.write('<div class="phone-view">\n')
-		f.write('<div class="header">\n')
-		f.write('<button class="back-button" onclick="showList()">←</button>\n')
-		f.write('<h1 id="header-title">Messages</h1>\n')
-		f.write('<div id="headerSearch" class="header-search">\n')
-		f.write('<input type="text" id="searchInput" placeholder="Search..." oninput="filterConversations()" />\n')
-		f.write('</div>\n')
-		f.write('<button class="dark-mode-toggle" onclick="toggleDarkMode()" title="Toggle Dark Mode">&#127769;</button>\n')
-		f.write('</div>\n')
-		
-		# Conversation list
-		f.write('<div id="conversation-list" class="conversation-list">\n')
+		f.write('// Virtualized conversation list: rows have a fixed height, so only the visible slice is rendered\n')
+		f.write('const CONV_ROW_OVERSCAN = 10;\n')
+		f.write('let convRowHeight = 81; // Measured from the first rendered row\n')
+		f.write('let convRowMeasured = false;\n')
+		f.write('let filteredConvs = convMetadata.map((meta, index) => index);\n')
+		f.write('let listRange = "";\n')
+		f.write('let listFrame = 0;\n\n')
 		
-		for meta in conv_metadata:
-			# Get date string
-			if meta['latest_date']:
-				dt = datetime.datetime.fromtimestamp(meta['latest_date'] / 1000, tz=None)
-				date_str = dt.strftime('%b %d, %Y')
-			else:
-				date_str = ''
-			
-			# Get initials for avatar
-			if len(meta['participants']) > 1:
-				# Group conversation - create mini avatars
-				is_group = True
-				num_avatars = min(len(meta['participants']), 4)
-				group_class = f"group-{num_avatars}"
-				
-				# Get first letter of each participant
-				participant_initials = []
-				
-				# Try to split the name by comma to get individual names
-				if ',' in meta.get('name', ''):
-					name_parts = [n.strip() for n in meta['name'].split(',')]
-				else:
-					name_parts = []
-				
-				for i, participant in enumerate(meta['participants'][:num_avatars]):
-					# Get name for this participant
-					if i < len(name_parts) and name_parts[i]:
-						part_name = name_parts[i]
-					else:
-						# Fallback to formatted phone number
-						part_name = formatPhoneNumber(participant)
-					
-					# Get initial
-					name_check = ''.join(c for c in part_name if c.isalnum() or c.isspace()).strip()
-					if name_check and not name_check[0].isdigit():
-						initial = part_name[0].upper()
-					else:
-						initial = '#'
-					participant_initials.append(initial)
-				
-				avatar_html = f'<div class="conversation-avatar-group {group_class}">'
-				for initial in participant_initials:
-					avatar_html += f'<div class="mini-avatar">{initial}</div>'
-				avatar_html += '</div>'
-			else:
-				is_group = False
-				# Check if it's an unknown contact (formatted phone number)
-				# Remove all non-alphanumeric except spaces to check
-				name_check = ''.join(c for c in meta['name'] if c.isalnum() or c.isspace()).strip()
-				if name_check.isdigit() or meta['name'].startswith('('):
-					# Unknown contact - phone number
-					initials = '#'
-				else:
-					name_parts = meta['name'].split()
-					if len(name_parts) >= 2:
-						initials = name_parts[0][0] + name_parts[1][0]
-					else:
-						initials = meta['name'][:2]
-					initials = initials.upper()
-				avatar_html = f'<div class="conversation-avatar">{initials}</div>'
-			
-			# Format subtitle
-			if len(meta['participants']) > 1:
-				subtitle = f"Group · {len(meta['participants'])} people"
-			elif len(meta['participants']) == 1:
-				subtitle = formatPhoneNumberSimple(meta['participants'][0])
-			else:
-				subtitle = "Unknown"
-			
-			f.write(f'<div class="conversation-item" data-name="{meta["name"].lower()}" data-participants="{" ".join([formatPhoneNumberSimple(p) for p in meta["participants"]])}" onclick="loadConversation(\'{meta["id"]}\', \'{meta["name"].replace("'", "\\'")}\')">\n')
-			f.write(avatar_html + '\n')
-			f.write('<div class="conversation-info">\n')
-			f.write(f'<div class="conversation-name">{meta["name"]}</div>\n')
-			f.write(f'<div class="conversation-preview">{subtitle}</div>\n')
-			f.write('</div>\n')
-			f.write('<div class="conversation-meta">\n')
-			f.write(f'<div class="conversation-date">{date_str}</div>\n')
-			f.write(f'<div class="conversation-count">{meta["msg_count"]}</div>\n')
-			f.write('</div>\n')
-			f.write('</div>\n')
-		
-		f.write('</div>\n')
-		
-		# Container for loaded conversation
-		f.write('<div id="conversation-content" class="conversation-view"></div>\n')
-		
-		f.write('</div>\n')  # Close phone-view
-		
-		# JavaScript - define image modal functions first, before everything else
-		f.write('<script>\n')
-		f.write('// Image modal functions (must be globally available)\n')
-		f.write('function openImageModal(src) {\n')
-		f.write('  event.stopPropagation();\n')
-		f.write('  const modal = document.getElementById("imageModal");\n')
-		f.write('  const modalImg = document.getElementById("modalImage");\n')
-		f.write('  modal.style.display = "block";\n')
-		f.write('  modalImg.src = src;\n')
-		f.write('}\n\n')
-		
-		f.write('function closeImageModal() {\n')
-		f.write('  document.getElementById("imageModal").style.display = "none";\n')
+		f.write('function escapeHtml(text) {\n')
+		f.write('  return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");\n')
 		f.write('}\n\n')
-		f.write('\n\n')
-		f.write('// Dark mode toggle\n')
-		f.write('function toggleDarkMode() {\n')
-		f.write('  document.body.classList.toggle(\'dark-mode\');\n')
-		f.write('  const isDark = document.body.classList.contains(\'dark-mode\');\n')
-		f.write('  localStorage.setItem(\'darkMode\', isDark);\n')
-		f.write('  const btn = document.querySelector(\'.dark-mode-toggle\');\n')
-		f.write('  btn.innerHTML = isDark ? \'&#9728;\' : \'&#127769;\';\n')
-		f.write('}\n')
-		f.write('\n')
-		f.write('// Load dark mode preference\n')
-		f.write('if (localStorage.getItem(\'darkMode\') === \'true\') {\n')
-		f.write('  document.body.classList.add(\'dark-mode\');\n')
-		f.write('  const btn = document.querySelector(\'.dark-mode-toggle\');\n')
-		f.write('  if (btn) btn.innerHTML = \'&#9728;\';\n')
-		f.write('}\n')
 		
-		# Rest of the JavaScript
-		f.write('const loadedConversations = new Set();\n')
-		f.write('const convMetadata = ' + str(conv_metadata).replace("'", '"').replace('True', 'true').replace('False', 'false') + ';\n\n')
-		
-		f.write('function loadConversation(id, name) {\n')
-		f.write('  document.getElementById("conversation-list").style.display = "none";\n')
-		f.write('  document.querySelector(".back-button").style.display = "block";\n')
-		f.write('  document.getElementById("header-title").textContent = name;\n')
-		f.write('  document.getElementById("headerSearch").classList.add("hidden");\n')
-		f.write('  const content = document.getElementById("conversation-content");\n')
-		f.write('  \n')
-		f.write('  const meta = convMetadata.find(m => m.id === id);\n')
-		f.write('  if (!meta) {\n')
-		f.write('    content.innerHTML = "<div style=\\"padding: 40px; text-align: center; color: red;\\">Conversation not found</div>";\n')
-		f.write('    return;\n')
-		f.write('  }\n')
-		f.write('  \n')
-		f.write('  if (loadedConversations.has(id)) {\n')
-		f.write('    // Already loaded\n')
-		f.write('    if (meta.chunked) {\n')
-		f.write('      let html = window["convHeader_" + id] || "";\n')
-		f.write('      for (let i = 1; i <= meta.chunk_files.length; i++) {\n')
-		f.write('        html += window["convChunk_" + id + "_" + i] || "";\n')
-		f.write('      }\n')
-		f.write('      content.innerHTML = html;\n')
-		f.write('    } else {\n')
-		f.write('      content.innerHTML = window["convData_" + id];\n')
-		f.write('    }\n')
-		f.write('    content.style.display = "block";\n')
-		f.write('    window.scrollTo(0, 0);\n')
+		f.write('function conversationItemHtml(index) {\n')
+		f.write('  const meta = convMetadata[index];\n')
+		f.write('  const [avatar, subtitle, date] = convList[index];\n')
+		f.write('  let avatarHtml;\n')
+		f.write('  if (Array.isArray(avatar)) {\n')
+		f.write('    avatarHtml = `<div class="conversation-avatar-group group-${avatar.length}">`;\n')
+		f.write('    for (const initial of avatar) avatarHtml += `<div class="mini-avatar">${escapeHtml(initial)}</div>`;\n')
+		f.write('    avatarHtml += "</div>";\n')
 		f.write('  } else {\n')
-		f.write('    // Load the conversation\n')
-		f.write('    content.innerHTML = "<div style=\\"padding: 40px; text-align: center;\\">Loading conversation...</div>";\n')
-		f.write('    content.style.display = "block";\n')
-		f.write('    \n')
-		f.write('    if (meta.chunked) {\n')
-		f.write('      // Load chunked conversation\n')
-		f.write('      loadChunkedConversation(id, meta);\n')
-		f.write('    } else {\n')
-		f.write('      // Load single file\n')
-		f.write('      loadScript(meta.js_file, () => {\n')
-		f.write('        loadedConversations.add(id);\n')
-		f.write('        content.innerHTML = window["convData_" + id];\n')
-		f.write('        window.scrollTo(0, 0);\n')
-		f.write('      }, () => {\n')
-		f.write('        content.innerHTML = "<div style=\\"padding: 40px; text-align: center; color: red;\\">Error loading conversation</div>";\n')
-		f.write('      });\n')
-		f.write('    }\n')
+		f.write('    avatarHtml = `<div class="conversation-avatar">${escapeHtml(avatar)}</div>`;\n')
 		f.write('  }\n')
+		f.write('  return `<div class="conversation-item" onclick="loadConversation(\'${meta.id}\')">${avatarHtml}` +\n')
+		f.write('    `<div class="conversation-info"><div class="conversation-name">${escapeHtml(meta.name)}</div>` +\n')
+		f.write('    `<div class="conversation-preview">${escapeHtml(subtitle)}</div></div>` +\n')
+		f.write('    `<div class="conversation-meta"><div class="conversation-date">${date}</div>` +\n')
+		f.write('    `<div class="conversation-count">${meta.msg_count}</div></div></div>`;\n')
 		f.write('}\n\n')
 		
-		f.write('function loadChunkedConversation(id, meta) {\n')
-		f.write('  const content = document.getElementById("conversation-content");\n')
-		f.write('  let loaded = 0;\n')
-		f.write('  const total = meta.chunk_files.length + 1; // chunks + header\n')
-		f.write('  \n')
-		f.write('  function updateProgress() {\n')
-		f.write('    loaded++;\n')
-		f.write('    const pct = Math.round((loaded / total) * 100);\n')
-		f.write('    const chunks = meta.chunk_files.length;\n')
-		f.write('    const header = 1;\n')
-		f.write('    const currentItem = loaded <= header ? \'header\' : `chunk ${loaded - header} of ${chunks}`;\n')
-		f.write('    content.innerHTML = `<div style="padding: 40px; text-align: center;">\n')
-		f.write('      <div style="font-size: 18px; margin-bottom: 10px;">Loading conversation...</div>\n')
-		f.write('      <div style="font-size: 14px; color: #666; margin-bottom: 15px;">Loading ${currentItem}</div>\n')
-		f.write('      <div style="background: #e0e0e0; height: 8px; border-radius: 4px; overflow: hidden; max-width: 400px; margin: 0 auto;">\n')
-		f.write('        <div style="background: #2196F3; height: 100%; width: ${pct}%; transition: width 0.3s;"></div>\n')
-		f.write('      </div>\n')
-		f.write('      <div style="margin-top: 10px; font-size: 16px; font-weight: bold;">${pct}%</div>\n')
-		f.write('    </div>`;\n')
-		f.write('    \n')
-		f.write('    // Render progressively as chunks load\n')
-		f.write('    if (loaded === 1) {\n')
-		f.write('      // First load (header) - create container and show header\n')
-		f.write('      content.innerHTML = window["convHeader_" + id] || "";\n')
-		f.write('      window.scrollTo(0, 0);\n')
-		f.write('    } else if (loaded > 1) {\n')
-		f.write('      // Append each chunk as it loads\n')
-		f.write('      const chunkNum = loaded - 1;\n')
-		f.write('      const chunkData = window["convChunk_" + id + "_" + chunkNum];\n')
-		f.write('      if (chunkData) {\n')
-		f.write('        // Create a temporary div to parse the chunk HTML\n')
-		f.write('        const tempDiv = document.createElement("div");\n')
-		f.write('        tempDiv.innerHTML = chunkData;\n')
-		f.write('        // Append all children to the content\n')
-		f.write('        while (tempDiv.firstChild) {\n')
-		f.write('          content.appendChild(tempDiv.firstChild);\n')
-		f.write('        }\n')
-		f.write('      }\n')
-		f.write('    }\n')
-		f.write('    \n')
-		f.write('    if (loaded === total) {\n')
-		f.write('      // All loaded, mark as complete\n')
-		f.write('      loadedConversations.add(id);\n')
-		f.write('      // Hide progress indicator\n')
-		f.write('      const progressDivs = content.querySelectorAll("div[style*=\'padding: 40px\']");\n')
-		f.write('      progressDivs.forEach(div => {\n')
-		f.write('        if (div.textContent.includes("Loading")) div.remove();\n')
-		f.write('      });\n')
+		f.write('function renderConversationList() {\n')
+		f.write('  listFrame = 0;\n')
+		f.write('  const list = document.getElementById("conversation-list");\n')
+		f.write('  if (list.style.display === "none") return;\n')
+		f.write('  const viewTop = -list.getBoundingClientRect().top;\n')
+		f.write('  const first = Math.max(0, Math.floor(viewTop / convRowHeight) - CONV_ROW_OVERSCAN);\n')
+		f.write('  const last = Math.min(filteredConvs.length, Math.ceil((viewTop + window.innerHeight) / convRowHeight) + CONV_ROW_OVERSCAN);\n')
+		f.write('  const range = first + ":" + last;\n')
+		f.write('  if (range === listRange) return;\n')
+		f.write('  listRange = range;\n')
+		f.write('  let html = `<div style="height: ${first * convRowHeight}px;"></div>`;\n')
+		f.write('  for (let i = first; i < last; i++) html += conversationItemHtml(filteredConvs[i]);\n')
+		f.write('  html += `<div style="height: ${Math.max(0, filteredConvs.length - last) * convRowHeight}px;"></div>`;\n')
+		f.write('  list.innerHTML = html;\n')
+		f.write('  const item = list.querySelector(".conversation-item");\n')
+		f.write('  if (!convRowMeasured && item && item.offsetHeight) {\n')
+		f.write('    convRowMeasured = true;\n')
+		f.write('    if (item.offsetHeight !== convRowHeight) {\n')
+		f.write('      convRowHeight = item.offsetHeight;\n')
+		f.write('      listRange = "";\n')
+		f.write('      renderConversationList();\n')
 		f.write('    }\n')
 		f.write('  }\n')
-		f.write('  \n')
-		f.write('  function onError() {\n')
-		f.write('    content.innerHTML = "<div style=\\"padding: 40px; text-align: center; color: red;\\">Error loading conversation</div>";\n')
-		f.write('  }\n')
-		f.write('  \n')
-		f.write('  // Load header\n')
-		f.write('  loadScript(meta.header_file, updateProgress, onError);\n')
-		f.write('  \n')
-		f.write('  // Load all chunks\n')
-		f.write('  meta.chunk_files.forEach(file => {\n')
-		f.write('    loadScript(file, updateProgress, onError);\n')
-		f.write('  });\n')
-		f.write('}\n\n')
-		
-		f.write('function loadScript(src, onSuccess, onError) {\n')
-		f.write('  const script = document.createElement("script");\n')
-		f.write('  script.src = src;\n')
-		f.write('  script.onload = onSuccess;\n')
-		f.write('  script.onerror = onError;\n')
-		f.write('  document.head.appendChild(script);\n')
 		f.write('}\n\n')
 		
-		f.write('function showList() {\n')
-		f.write('  document.getElementById("conversation-list").style.display = "block";\n')
-		f.write('  document.getElementById("conversation-content").style.display = "none";\n')
-		f.write('  document.querySelector(".back-button").style.display = "none";\n')
-		f.write('  document.getElementById("header-title").textContent = "Messages";\n')
-		f.write('  document.getElementById("headerSearch").classList.remove("hidden");\n')
-		f.write('  document.getElementById("searchInput").value = "";\n')
-		f.write('  filterConversations();\n')
-		f.write('  window.scrollTo(0, 0);\n')
+		f.write('function scheduleListRender() {\n')
+		f.write('  if (!listFrame) listFrame = requestAnimationFrame(renderConversationList);\n')
 		f.write('}\n\n')
 		
 		f.write('function filterConversations() {\n')
 		f.write('  const searchTerm = document.getElementById("searchInput").value.toLowerCase();\n')
-		f.write('  const items = document.querySelectorAll(".conversation-item");\n')
-		f.write('  \n')
-		f.write('  items.forEach(item => {\n')
-		f.write('    const name = item.getAttribute("data-name");\n')
-		f.write('    const participants = item.getAttribute("data-participants");\n')
-		f.write('    const searchText = name + " " + participants;\n')
-		f.write('    \n')
-		f.write('    if (searchText.includes(searchTerm)) {\n')
-		f.write('      item.style.display = "flex";\n')
-		f.write('    } else {\n')
-		f.write('      item.style.display = "none";\n')
-		f.write('    }\n')
-		f.write('  });\n')
-		f.write('}\n')
+		f.write('  filteredConvs = [];\n')
+		f.write('  for (let i = 0; i < convList.length; i++) {\n')
+		f.write('    if (convList[i][3].includes(searchTerm)) filteredConvs.push(i);\n')
+		f.write('  }\n')
+		f.write('  listRange = "";\n')
+		f.write('  renderConversationList();\n')
+		f.write('}\n\n')
+		
+		f.write('window.addEventListener("scroll", scheduleListRender, { passive: true });\n')
+		f.write('window.addEventListener("resize", scheduleListRender);\n')
+		f.write('renderConversationList();\n')
+		
+		if search_info:
+			f.write('\n// Message search over the sharded index in conv_files/search/\n')
+			f.write('const searchIndex = ' + json.dumps(search_info) + ';\n')
+			f.write('const searchShards = {};\n')
+			f.write('const SEARCH_RESULT_LIMIT = 200;\n')
+			f.write('let searchTimer = null;\n\n')
+			
+			f.write('function searchTokenHash(token) {\n')
+			f.write('  let h = 0x811c9dc5;\n')
+			f.write('  for (let i = 0; i < token.length; i++) {\n')
+			f.write('    h ^= token.charCodeAt(i);\n')
+			f.write('    h = Math.imul(h, 0x01000193) >>> 0;\n')
+			f.write('  }\n')
+			f.write('  return h >>> 0;\n')
+			f.write('}\n\n')
+			
+			f.write('function searchTokens(text) {\n')
+			f.write('  const tokens = new Set();\n')
+			f.write('  for (const token of text.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || []) {\n')
+			f.write('    if (token.length >= 2 && token.length <= 40) tokens.add(token);\n')
+			f.write('  }\n')
+			f.write('  return [...tokens];\n')
+			f.write('}\n\n')
+			
+			f.write('function loadSearchShard(num) {\n')
+			f.write('  if (!searchShards[num]) {\n')
+			f.write('    searchShards[num] = loadPayload("conv_files/search/search_" + num + ".js?v=" + searchIndex.v, "searchShard_" + num)\n')
+			f.write('      .then(() => window["searchShard_" + num]);\n')
+			f.write('  }\n')
+			f.write('  return searchShards[num];\n')
+			f.write('}\n\n')
+			
+			f.write('function scheduleMessageSearch() {\n')
+			f.write('  clearTimeout(searchTimer);\n')
+			f.write('  const query = document.getElementById("searchInput").value;\n')
+			f.write('  searchTimer = setTimeout(() => searchMessages(query), 200);\n')
+			f.write('}\n\n')
+			
+			f.write('function searchMessages(query) {\n')
+			f.write('  const results = document.getElementById("search-results");\n')
+			f.write('  const tokens = searchTokens(query);\n')
+			f.write('  if (tokens.length === 0) {\n')
+			f.write('    results.style.display = "none";\n')
+			f.write('    results.innerHTML = "";\n')
+			f.write('    return;\n')
+			f.write('  }\n')
+			f.write('  Promise.all(tokens.map(token => loadSearchShard(searchTokenHash(token) % searchIndex.shards).then(shard => shard[token] || [])))\n')
+			f.write('    .then(postings => {\n')
+			f.write('      if (document.getElementById("searchInput").value !== query) return; // A newer search is pending\n')
+			f.write('      // Every word must occur in the same conversation month\n')
+			f.write('      const monthCount = searchIndex.months.length;\n')
+			f.write('      let hits = null;\n')
+			f.write('      for (const posting of postings) {\n')
+			f.write('        const current = new Map();\n')
+			f.write('        for (let i = 0; i < posting.length; i += 3) {\n')
+			f.write('          const key = posting[i] * monthCount + posting[i + 1];\n')
+			f.write('          if (hits === null) {\n')
+			f.write('            current.set(key, posting[i + 2]);\n')
+			f.write('          } else if (hits.has(key)) {\n')
+			f.write('            current.set(key, Math.min(hits.get(key), posting[i + 2]));\n')
+			f.write('          }\n')
+			f.write('        }\n')
+			f.write('        hits = current;\n')
+			f.write('      }\n')
+			f.write('      renderSearchResults(hits, tokens.length === 1);\n')
+			f.write('    })\n')
+			f.write('    .catch(err => {\n')
+			f.write('      results.innerHTML = `<div class="search-results-title">Search failed: ${escapeHtml(err.message)}</div>`;\n')
+			f.write('      results.style.display = "block";\n')
+			f.write('    });\n')
+			f.write('}\n\n')
+			
+			f.write('function renderSearchResults(hits, exactCounts) {\n')
+			f.write('  const results = document.getElementById("search-results");\n')
+			f.write('  const monthCount = searchIndex.months.length;\n')
+			f.write('  // Months are numbered newest first\n')
+			f.write('  const keys = [...hits.keys()].sort((a, b) => (a % monthCount) - (b % monthCount) || a - b);\n')
+			f.write('  let html = `<div class="search-results-title">${keys.length ? "Messages in " + keys.length + " conversation months" : "No matching messages"}</div>`;\n')
+			f.write('  for (const key of keys.slice(0, SEARCH_RESULT_LIMIT)) {\n')
+			f.write('    const convIdx = Math.floor(key / monthCount);\n')
+			f.write('    const monthIdx = key % monthCount;\n')
+			f.write('    const count = hits.get(key);\n')
+			f.write('    const detail = exactCounts ? count + (count === 1 ? " message" : " messages") : "matching messages";\n')
+			f.write('    html += `<div class="search-result" onclick="openSearchResult(${convIdx}, ${monthIdx})">`;\n')
+			f.write('    html += `<div class="conversation-name">${escapeHtml(convMetadata[convIdx].name)}</div>`;\n')
+			f.write('    html += `<div class="search-result-month">${searchIndex.months[monthIdx][1]} &middot; ${detail}</div></div>`;\n')
+			f.write('  }\n')
+			f.write('  results.innerHTML = html;\n')
+			f.write('  results.style.display = "block";\n')
+			f.write('}\n\n')
+			
+			f.write('function openSearchResult(convIdx, monthIdx) {\n')
+			f.write('  const meta = convMetadata[convIdx];\n')
+			f.write('  const month = searchIndex.months[monthIdx];\n')
+			f.write('  pendingJump = "month-" + month[0] + "_" + meta.id;\n')
+			f.write('  loadConversation(meta.id, meta.chunked ? meta.month_chunks[month[0]] || 1 : 1);\n')
+			f.write('}\n')
 		f.write('</script>\n')
 		
 		f.write('</body></html>\n')
 	
-	print(f"  Created 0_index.html and {len(conv_metadata)} conversation JS files\n")
-	return f"{base_filename}/0_index.html"
+	if incremental:
+		saveManifest(subfolder, settings, manifest_entries)
+		removed = removeStaleFiles(conv_files_dir, manifest_entries)
+		if removed:
+			print(f"  Removed {removed} files no longer referenced by any conversation")
+	
+	if compress:
+		PROFILER.begin('Compress output')
+		compressOutputFiles(subfolder, compress)
+	PROFILER.end()
+	
+	print(f"  Created messages.html and {len(conv_metadata)} conversation JS files in conv_files/")
+	if extract_images:
+		print(f"  Wrote {len(media_written)} unique images to conv_files/media/")
+	print()
+	return f"{base_filename}/messages.html"
+
+# Phase timing (--profile)
+def peakMemoryMB(children=False):
+	"""High-water mark of resident memory in MB (of finished worker processes if children), or None"""
+	if resource is None:
+		return None
+	usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+	return usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)  # Bytes on macOS, KB elsewhere
+
+def cpuSeconds():
+	"""CPU time of this process plus its finished worker processes"""
+	if resource is None:
+		return time.process_time()
+	return sum(r.ru_utime + r.ru_stime for r in (resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)))
+
+def profiledRenderConversation(*args):
+	"""renderConversation() plus (wall seconds, CPU seconds, peak MB allocated while rendering)
+	
+	The process high-water mark only moves for the largest conversation so far, so memory is
+	measured with tracemalloc, traced just for this conversation and counting what it allocated.
+	"""
+	already_tracing = tracemalloc.is_tracing()
+	if already_tracing:
+		tracemalloc.reset_peak()
+	else:
+		tracemalloc.start()
+	memory_start = tracemalloc.get_traced_memory()[0]
+	wall_start = time.perf_counter()
+	cpu_start = time.process_time()
+	try:
+		result = renderConversation(*args)
+		wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+		peak = (tracemalloc.get_traced_memory()[1] - memory_start) / (1024 * 1024)
+	finally:
+		if not already_tracing:
+			tracemalloc.stop()
+	return result, (wall, cpu, peak)
+
+class PhaseProfiler:
+	"""Wall time, CPU time and memory high-water mark of each phase of a run, for --profile
+	
+	Phases run one after another: begin() ends the current phase and starts the next one.
+	Memory is the peak resident size of the process at the end of the phase, so a phase
+	that raised it is one that needed more memory than anything before it.
+	"""
+	SLOWEST_CONVERSATIONS = 10
+	
+	def __init__(self):
+		self.enabled = False
+		self.phases = []          # (name, wall seconds, CPU seconds, peak MB)
+		self.conversations = []   # (wall seconds, CPU seconds, peak MB, name, messages, chunks)
+		self.current = None
+	
+	def begin(self, name):
+		if not self.enabled:
+			return
+		self.end()
+		self.current = (name, time.perf_counter(), cpuSeconds())
+	
+	def end(self):
+		if not self.current:
+			return
+		name, wall_start, cpu_start = self.current
+		peaks = [peak for peak in (peakMemoryMB(), peakMemoryMB(children=True)) if peak is not None]
+		self.phases.append((name, time.perf_counter() - wall_start, cpuSeconds() - cpu_start, max(peaks) if peaks else None))
+		self.current = None
+	
+	def addConversation(self, conv, meta, stats):
+		chunks = len(meta['chunk_files']) if meta['chunked'] else 1
+		self.conversations.append(stats + (conv['name'], len(conv['messages']), chunks))
+	
+	def report(self):
+		self.end()
+		if not self.phases:
+			return
+		memory = lambda mb: f"{mb:10.1f}" if mb is not None else f"{'-':>10}"
+		print("\nProfile:")
+		print(f"  {'Phase':<40}{'Wall s':>10}{'CPU s':>10}{'Peak MB':>10}")
+		for name, wall, cpu, peak in self.phases:
+			print(f"  {name[:40]:<40}{wall:10.2f}{cpu:10.2f}{memory(peak)}")
+		print(f"  {'Total':<40}{sum(p[1] for p in self.phases):10.2f}{sum(p[2] for p in self.phases):10.2f}")
+		if self.conversations:
+			slowest = sorted(self.conversations, reverse=True)[:self.SLOWEST_CONVERSATIONS]
+			print(f"\n  Slowest conversations to render ({len(self.conversations)} rendered; Peak MB is what each one allocated):")
+			print(f"  {'Conversation':<32}{'Messages':>10}{'Chunks':>8}{'Wall s':>10}{'CPU s':>10}{'Peak MB':>10}")
+			for wall, cpu, peak, name, messages, chunks in slowest:
+				print(f"  {name[:32]:<32}{messages:10}{chunks:8}{wall:10.2f}{cpu:10.2f}{memory(peak)}")
+		print()
+
+PROFILER = PhaseProfiler()
 
+def finishProfiling(profile, stats_path):
+	"""Print the --profile table and write the cProfile statistics, if either was asked for"""
+	PROFILER.report()
+	if profile:
+		profile.disable()
+		profile.dump_stats(stats_path)
+		print(f"Wrote cProfile statistics to {stats_path} (view with: python -m pstats {stats_path})\n")
 
 def main():
 	parser = argparse.ArgumentParser(description='Turns SMS Backup and Restore XML into HTML conversations with embedded images')
-	parser.add_argument('input', metavar='input', nargs='+', type=str,
+	parser.add_argument('input', metavar='input', nargs='*', type=str,
 				help='Input XML file(s)')
-	parser.add_argument('-o', '--output', type=str, required=True,
+	parser.add_argument('-o', '--output', type=str,
 				help='Output directory')
 	parser.add_argument('-n', '--number', type=str, required=True,
 				help='Your carrier phone number')
+	parser.add_argument('--streaming', action='store_true',
+				help='Keep MMS images on disk while parsing and read them back from the XML as each conversation is written (for backups larger than memory)')
+	parser.add_argument('--extract-images', action='store_true',
+				help='Write each distinct MMS image once to conv_files/media/<sha256>.<ext> instead of embedding base64 in the conversation files')
+	parser.add_argument('-j', '--jobs', type=int, default=1,
+				help='Number of worker processes used to render conversations (default: 1)')
+	parser.add_argument('--parse-jobs', metavar='N', type=int, default=1,
+				help='Parse each input in N byte ranges on N worker processes (default: 1)')
+	parser.add_argument('--incremental', metavar='NAME', type=str,
+				help='Update OUTPUT/NAME in place, re-rendering only conversations that changed since the previous run')
+	parser.add_argument('--merge-output', metavar='FILE', type=str,
+				help='Merge the input backups into one de-duplicated XML file (rendered from if -o is also given)')
+	parser.add_argument('--index', metavar='DB', type=str,
+				help='Add the input backups to a SQLite message index and render from it; with no inputs, render an existing index')
+	parser.add_argument('--chunk-policy', metavar='POLICY', type=parseChunkPolicy, default=DEFAULT_CHUNK_POLICY,
+				help='Where large conversations are split into pages: size=MB, messages=N, period=month|quarter|year, or auto to fit a browser parse-time budget (default: size=50)')
+	parser.add_argument('--chunk-cache', metavar='K', type=int, default=DEFAULT_CHUNK_CACHE,
+				help=f'Most conversation pages the viewer keeps loaded, including prefetched neighbours (default: {DEFAULT_CHUNK_CACHE})')
+	parser.add_argument('--compress', metavar='ENCODINGS', type=parseCompression,
+				help='Also write precompressed .gz and/or .br copies of the text files (gzip, br or gzip,br; br needs the brotli package) for serving with serve_archive.py')
+	parser.add_argument('--search-index', action='store_true',
+				help='Build a full-text index of message bodies so the search box also finds messages, without loading every conversation')
+	parser.add_argument('--profile', action='store_true',
+				help='Print wall time, CPU time and peak memory for each phase and the slowest conversations')
+	parser.add_argument('--profile-stats', metavar='FILE', type=str,
+				help='Also run under cProfile and write the statistics to FILE for pstats/snakeviz (implies --profile; slows the run)')
 	args = parser.parse_args()
+	if not args.output and not args.merge_output:
+		parser.error('one of -o/--output or --merge-output is required')
+	if not args.input and not args.index:
+		parser.error('at least one input file is required unless --index is given')
+	if args.merge_output and not args.input:
+		parser.error('--merge-output requires input files')
+	PROFILER.enabled = args.profile or bool(args.profile_stats)
+	profile = None
+	if args.profile_stats:
+		profile = cProfile.Profile()
+		profile.enable()
 	carrier_number = parseCarrierNumber(args.number)
 	
 	messages = 0
 	conversations = {}
 	all_type_counts = {}
-	contact_map = {}  # Global contact name mapping
+	contact_map = {}  # Global contact name mapping; conversations look their participants up in it when rendered
 	debug_mode = False  # Set to True for debugging output
 	locale.setlocale(locale.LC_ALL, '')
 	
 	print("Starting SMS XML to HTML conversion...")
 	print(f"Your number: {formatPhoneNumber(carrier_number)}\n")
 	
-	for input_file in args.input:
-		if not os.path.exists(input_file):
-			print(f"Warning: File not found: {input_file}")
-			continue
-			
-		print(f"Parsing conversations from {input_file}...")
-		
-		# Use iterparse for large files to avoid memory issues
-		context = etree.iterparse(input_file, events=('end',), tag=('sms', 'mms'), huge_tree=True)
-		
-		msg_count = 0
-		type_counts = {}
-		
-		for event, elem in context:
-			if elem.tag == 'sms':
-				address = parseCarrierNumber(elem.attrib['address'])
-				date    = int(elem.attrib['date'])
-				type_   = elem.attrib['type']
-				name    = elem.attrib.get('contact_name', '(Unknown)')
-				body    = elem.attrib.get('body', '')
-				
-				if debug_mode and msg_count < 10:
-					print(f"DEBUG SMS: type={type_}, address={address}, name={name}")
-					print(f"  SMS Conv Key: {address}, Name: {name}")
-				
-				# Store contact name mapping
-				if name != '(Unknown)':
-					contact_map[address] = name
-				
-				save_msg = SMSMsg(date, body, type_, {})
-				save_msg.sender_name = name if type_ == '1' else 'You'
-				save_msg.sender_address = address if type_ == '1' else carrier_number
-				
-				# Create conversation key (just the other person for SMS)
-				conv_key = address
-				conv_name = name if name != '(Unknown)' else formatPhoneNumber(address)
-				
-				type_counts[type_] = type_counts.get(type_, 0) + 1
-				
-				if conv_key not in conversations:
-					conversations[conv_key] = {
-						'name': conv_name,
-						'participants': [address],
-						'messages': {},
-						'contact_map': contact_map.copy()
-					}
-				conversations[conv_key]['messages'][date] = save_msg
-				msg_count += 1
-				
-			elif elem.tag == 'mms':
-				save_msg = MMSMsg()
-				date = int(elem.attrib['date'])
-				msg_box = elem.attrib.get('msg_box', '1')
-				contact_name = elem.attrib.get('contact_name', 'Unknown')
-				
-				if msg_box == '2':
-					actual_msg_type = '151'  # Sent MMS
-				else:
-					actual_msg_type = '137'  # Received MMS
-				
-				sender_address = None
-				all_addresses = []
-				address_names = {}  # Map addresses to names from this MMS
-				
-				if debug_mode and msg_count < 10:
-					print(f"\nDEBUG MMS: date={date}, msg_box={msg_box}, contact_name={contact_name}")
-				
-				for mms_child in elem:
-					if mms_child.tag == 'parts':
-						for part_child in mms_child:
-							if part_child.tag == 'part':
-								part_data = part_child.attrib.get('data', '')
-								part_text = part_child.attrib.get('text', '')
-								part_mime = part_child.attrib['ct']
-								if "image" in part_mime and part_data:
-									save_msg.addImageData(part_mime, part_data)
-								elif "text" in part_mime:
-									save_msg.text += part_text
-									
-					elif mms_child.tag == 'addrs':
-						for addr_child in mms_child:
-							if addr_child.tag == 'addr':
-								parsed_addr = parseCarrierNumber(addr_child.attrib['address'])
-								addr_type = addr_child.attrib.get('type', '137')
-								
-								if debug_mode and msg_count < 10:
-									print(f"  Address: {parsed_addr}, type={addr_type}")
-								
-								# Skip empty addresses and your own number
-								if parsed_addr and carrier_number not in parsed_addr:
-									all_addresses.append(parsed_addr)
-									
-									# In received MMS (msg_box=1), type 137 indicates the sender
-									# Type 151 typically indicates recipients/CC
-									if addr_type == '137' and msg_box == '1':
-										sender_address = parsed_addr
-										if debug_mode and msg_count < 10:
-											print(f"    -> Identified as sender (type 137)")
-				
-				# Parse contact_name to extract individual names
-				if contact_name and contact_name != 'Unknown':
-					# The contact_name order matches the address field order in the XML
-					address_field = elem.attrib.get('address', '')
-					
-					if ',' in contact_name and address_field:
-						names = [n.strip() for n in contact_name.split(',')]
-						
-						if debug_mode and msg_count < 10:
-							print(f"  Parsing names: {names}")
-							print(f"  Address field: {address_field}")
-						
-						# Parse the address field which has addresses in same order as names
-						raw_addresses = [parseCarrierNumber(a.strip()) for a in address_field.split('~')]
-						# Filter out your own number
-						ordered_addresses = [a for a in raw_addresses if a and carrier_number not in a]
-						
-						if debug_mode and msg_count < 10:
-							print(f"  Ordered addresses: {ordered_addresses}")
-						
-						# Now match names to addresses in order
-						for i, addr in enumerate(ordered_addresses):
-							if i < len(names):
-								address_names[addr] = names[i]
-								contact_map[addr] = names[i]
-								if debug_mode and msg_count < 10:
-									print(f"  Mapped: {addr} -> {names[i]}")
-					elif address_field and '~' not in address_field:
-						# Single person conversation, map the name to the single address
-						single_addr = parseCarrierNumber(address_field)
-						if single_addr and carrier_number not in single_addr:
-							address_names[single_addr] = contact_name
-							contact_map[single_addr] = contact_name
-							if debug_mode and msg_count < 10:
-								print(f"  Single person mapped: {single_addr} -> {contact_name}")
-				
-				# Set sender info
-				if msg_box == '2':
-					sender_address_final = carrier_number
-					sender_name_final = 'You'
-				elif sender_address:
-					sender_address_final = sender_address
-					# Try multiple sources for the name
-					sender_name_final = (address_names.get(sender_address) or 
-					                    contact_map.get(sender_address) or 
-					                    formatPhoneNumber(sender_address))
-					if debug_mode and msg_count < 10:
-						print(f"  Sender address: {sender_address}")
-						print(f"  address_names.get: {address_names.get(sender_address)}")
-						print(f"  contact_map.get: {contact_map.get(sender_address)}")
-						print(f"  Final sender: {sender_name_final} ({sender_address_final})")
-				else:
-					sender_address_final = all_addresses[0] if all_addresses else None
-					if sender_address_final:
-						sender_name_final = (address_names.get(sender_address_final) or 
-						                    contact_map.get(sender_address_final) or 
-						                    formatPhoneNumber(sender_address_final))
-					else:
-						sender_name_final = contact_name
-					if debug_mode and msg_count < 10:
-						print(f"  No explicit sender, using first address: {sender_address_final}")
-						print(f"  Sender name: {sender_name_final}")
-				
-				# Store sender info in the message
-				save_msg.sender_address = sender_address_final
-				save_msg.sender_name = sender_name_final
-				save_msg.type_ = actual_msg_type
-				save_msg.timestamp = date
-				
-				# Create conversation key from all participants
-				# Remove duplicates and normalize
-				unique_addresses = list(set(all_addresses))
-				
-				# Preserve original order from address field for display
-				address_field = elem.attrib.get('address', '')
-				if address_field:
-					raw_addresses = [parseCarrierNumber(a.strip()) for a in address_field.split('~')]
-					ordered_unique = [a for a in raw_addresses if a in unique_addresses and carrier_number not in a]
-				else:
-					ordered_unique = unique_addresses
-				
-				# If only one unique participant (excluding self), treat as 1-on-1
-				if len(unique_addresses) == 1:
-					conv_key = unique_addresses[0]
-				else:
-					conv_key = makeConversationKey(unique_addresses)
-				
-				if debug_mode and msg_count < 10:
-					print(f"  MMS All addresses: {all_addresses}")
-					print(f"  MMS Unique addresses: {unique_addresses}")
-					print(f"  MMS Ordered unique: {ordered_unique}")
-					print(f"  MMS Conv Key: {conv_key}")
-				
-				type_counts[actual_msg_type] = type_counts.get(actual_msg_type, 0) + 1
-				
-				if conv_key not in conversations:
-					# Use the single person's name for 1-on-1, group name for actual groups
-					if len(unique_addresses) == 1:
-						conv_name = contact_map.get(unique_addresses[0]) or formatPhoneNumber(unique_addresses[0])
-					else:
-						conv_name = contact_name
-					
-					conversations[conv_key] = {
-						'name': conv_name,
-						'participants': ordered_unique,  # Use ordered list
-						'messages': {},
-						'contact_map': {}
-					}
-				
-				# Update the contact map for this conversation
-				conversations[conv_key]['contact_map'].update(contact_map)
-				
-				# Store the message
-				conversations[conv_key]['messages'][date] = save_msg
-				msg_count += 1
+	input_files = args.input
+	if args.merge_output:
+		PROFILER.begin('Merge backups')
+		existing_files = [f for f in input_files if os.path.exists(f)]
+		for missing_file in set(input_files) - set(existing_files):
+			print(f"Warning: File not found: {missing_file}")
+		kept, duplicates = mergeBackupFiles(existing_files, args.merge_output, carrier_number)
+		print(f"\nMerged {kept} messages into {args.merge_output} ({duplicates} duplicates dropped)\n")
+		if not args.output:
+			finishProfiling(profile, args.profile_stats)
+			sys.exit(0)
+		input_files = [args.merge_output]
+	
+	if args.index:
+		conn = openIndex(args.index, carrier_number)
+		contact_map.update(conn.execute('SELECT address, name FROM contacts'))
+		for input_file in input_files:
+			if not os.path.exists(input_file):
+				print(f"Warning: File not found: {input_file}")
+				continue
+			
+			print(f"Indexing messages from {input_file}...")
+			PROFILER.begin(f"Index {os.path.basename(input_file)}")
+			msg_count, added, type_counts = ingestBackupFile(conn, input_file, carrier_number, contact_map, debug_mode)
+			print(f"  {msg_count} messages read, {added} added to {args.index}")
+		conn.close()
+		
+		PROFILER.begin('Load index')
+		conversations, contact_map, all_type_counts = loadIndex(args.index)
+		messages = sum(all_type_counts.values())
+	else:
+		# Overlapping backups: skip messages already parsed from an earlier file
+		seen = set() if len(input_files) > 1 else None
+		
+		for input_file in input_files:
+			if not os.path.exists(input_file):
+				print(f"Warning: File not found: {input_file}")
+				continue
+			
+			print(f"Parsing conversations from {input_file}...")
+			PROFILER.begin(f"Parse {os.path.basename(input_file)}")
+			
+			if args.parse_jobs > 1:
+				msg_count, type_counts = parseBackupFileParallel(input_file, conversations, carrier_number, contact_map, args.parse_jobs, args.streaming, debug_mode, seen)
+			else:
+				msg_count, type_counts = parseBackupFile(input_file, conversations, carrier_number, contact_map, args.streaming, debug_mode, seen)
 			
-			# Clear element to free memory
-			elem.clear()
-			while elem.getprevious() is not None:
-				del elem.getparent()[0]
-		
-		# Clean up
-		del context
-		
-		messages += msg_count
-		for type_, count in type_counts.items():
-			all_type_counts[type_] = all_type_counts.get(type_, 0) + count
+			messages += msg_count
+			for type_, count in type_counts.items():
+				all_type_counts[type_] = all_type_counts.get(type_, 0) + count
 		
 	print(f"\nParsed {messages} messages in {len(conversations)} conversations")
 	
 	# Sort conversations by most recent message date (descending)
+	PROFILER.begin('Sort conversations')
 	sorted_conv_keys = sorted(conversations.keys(), 
 	                          key=lambda k: max(conversations[k]['messages'].keys()) if conversations[k]['messages'] else 0,
 	                          reverse=True)
@@ -2247,19 +3504,23 @@ def main():
 	print("\nMessage type distribution:")
 	for type_, count in sorted(all_type_counts.items()):
 		type_name = {
-			'1': 'Received SMS', 
-			'2': 'Sent SMS', 
-			'130': 'Received MMS (special)', 
-			'137': 'Received MMS', 
-			'151': 'Sent MMS'
+			1: 'Received SMS',
+			2: 'Sent SMS',
+			130: 'Received MMS (special)',
+			137: 'Received MMS',
+			151: 'Sent MMS'
 		}.get(type_, f'Unknown ({type_})')
 		print(f"  Type {type_} ({type_name}): {count} messages")
 	
-	print("\nGenerating HTML file with embedded images...")
-	filename = dumpConversations(args.output, conversations, carrier_number, sorted_conv_keys, args.input[0])
+	if args.extract_images:
+		print("\nGenerating HTML file with extracted images...")
+	else:
+		print("\nGenerating HTML file with embedded images...")
+	filename = dumpConversations(args.output, conversations, carrier_number, sorted_conv_keys, args.input[0] if args.input else args.index, args.extract_images, max(1, args.jobs), args.incremental, args.search_index, args.chunk_policy, max(1, args.chunk_cache), args.compress or (), contact_map)
 	print(f"\nSuccess! Created {filename} in {args.output}")
 	print(f"Open {filename} in your web browser to view all your conversations.")
 	
+	finishProfiling(profile, args.profile_stats)
 	sys.exit(0)
 	
 if __name__ == '__main__':
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# --parse-jobs must give the same conversations and contact names as a sequential parse,
+# including when the inputs overlap and names are only learned from earlier files or parts.
+#
+# Usage: python -m unittest discover tests
+
+import io
+import os
+import sys
+import random
+import tempfile
+import unittest
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smsxml2html import parseBackupFile, parseBackupFileParallel, parseCarrierNumber
+
+CARRIER_NUMBER = parseCarrierNumber('5550009999')
+
+def writeBackup(path, start, name, seed, messages=3000, people=50):
+	"""Backup of SMS, group MMS and 1-on-1 MMS, where contact_name is often missing"""
+	rng = random.Random(seed)
+	lines = ['<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>', '<smses count="0">']
+	date = start
+	for i in range(messages):
+		date += 1
+		n, m = rng.randrange(people), rng.randrange(people)
+		address, other = f'555000{n:04d}', f'555000{m:04d}'
+		contact = rng.choice(['(Unknown)', f'{name} {n}'])
+		if rng.random() < 0.6:
+			lines.append(f'<sms protocol="0" address="{address}" date="{date}" type="{rng.choice("12")}" '
+			             f'body="message {i}" contact_name="{contact}" />')
+			continue
+		group_name = rng.choice(['(Unknown)', f'{name} {n}, {name} {m}'])
+		lines.append(f'<mms date="{date}" msg_box="{rng.choice("12")}" address="{address}~{other}" contact_name="{group_name}">'
+		             f'<parts><part ct="text/plain" text="group {i}" /></parts><addrs><addr address="{address}" type="137" />'
+		             f'<addr address="{other}" type="151" /><addr address="5550009999" type="151" /></addrs></mms>')
+		date += 1
+		lines.append(f'<mms date="{date}" msg_box="1" address="{other}" contact_name="Unknown">'
+		             f'<parts><part ct="text/plain" text="solo {i}" /></parts><addrs><addr address="{other}" type="137" />'
+		             f'<addr address="5550009999" type="151" /></addrs></mms>')
+	lines.append('</smses>')
+	with open(path, 'w', encoding='utf-8') as f:
+		f.write('\n'.join(lines))
+
+def parse(files, jobs):
+	"""Conversations, contact map and per-file (count, type counts) of parsing files in order"""
+	conversations = {}
+	contact_map = {}
+	seen = set() if len(files) > 1 else None
+	counts = []
+	with contextlib.redirect_stdout(io.StringIO()):
+		for path in files:
+			if jobs > 1:
+				counts.append(parseBackupFileParallel(path, conversations, CARRIER_NUMBER, contact_map, jobs, seen=seen))
+			else:
+				counts.append(parseBackupFile(path, conversations, CARRIER_NUMBER, contact_map, seen=seen))
+	summary = {conv_key: (conv['name'], conv['participants'],
+	                      sorted((date, msg.type_, msg.sender_address, msg.sender_name, msg.text)
+	                             for date, msg in conv['messages'].items()))
+	           for conv_key, conv in conversations.items()}
+	return summary, contact_map, counts
+
+class ParallelParseTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.workdir = tempfile.TemporaryDirectory(prefix='smsxml2html_test_')
+		cls.a = os.path.join(cls.workdir.name, 'a.xml')
+		cls.b = os.path.join(cls.workdir.name, 'b.xml')
+		writeBackup(cls.a, 1000, 'Contact', 1)
+		writeBackup(cls.b, 500000, 'Person', 2)
+	
+	@classmethod
+	def tearDownClass(cls):
+		cls.workdir.cleanup()
+	
+	def assertSameAsSequential(self, *files):
+		expected = parse(list(files), 1)
+		result = parse(list(files), 4)
+		self.assertEqual(result[0], expected[0])
+		self.assertEqual(result[1], expected[1])
+		self.assertEqual(result[2], expected[2])
+	
+	def test_single_file(self):
+		self.assertSameAsSequential(self.a)
+	
+	def test_overlapping_inputs(self):
+		self.assertSameAsSequential(self.a, self.b, self.a)
+		self.assertSameAsSequential(self.b, self.a, self.b, self.a)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# Phone number normalization: every way of writing a number should give the conversation key
+# of the same contact, without mistaking national numbers for international ones.
+#
+# Usage: python -m unittest discover tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smsxml2html import parseCarrierNumber, parseAddressList
+
+class InternationalFormsTest(unittest.TestCase):
+	def assertSameKey(self, expected, *numbers):
+		for number in numbers:
+			with self.subTest(number=number):
+				self.assertEqual(parseCarrierNumber(number), expected)
+	
+	def test_plus_00_and_011_agree(self):
+		self.assertSameKey('442079460958', '+44 20 7946 0958', '0044 20 7946 0958', '011 44 20 7946 0958')
+	
+	def test_ten_digit_international_numbers_get_no_nanp_prefix(self):
+		self.assertSameKey('6561234567', '+65 6123 4567', '0065 6123 4567', '011 65 6123 4567')
+		self.assertSameKey('6491234567', '+64 9 123 4567', '0064 9 123 4567', '011 64 9 123 4567')
+		self.assertSameKey('4930123456', '+49 30 123456', '0049 30 123456', '011 49 30 123456')
+	
+	def test_north_american_forms_agree(self):
+		self.assertSameKey('15551234567', '(555) 123-4567', '555-123-4567', '1 555 123 4567',
+		                   '+1 555 123 4567', '001 555 123 4567', '011 1 555 123 4567')
+	
+	def test_uk_national_numbers_keep_their_digits(self):
+		self.assertSameKey('01154960123', '0115 496 0123')
+		self.assertSameKey('01134960000', '01134960000')
+		self.assertSameKey('01174960999', '0117 496 0999')
+	
+	def test_exit_code_needs_a_country_code(self):
+		self.assertSameKey('001234567890', '0012 3456 7890')
+	
+	def test_short_codes_are_left_alone(self):
+		self.assertSameKey('12345', '12345')
+		self.assertSameKey('00123', '00123')
+	
+	def test_address_list_keeps_order(self):
+		self.assertEqual(parseAddressList('+65 6123 4567~555-123-4567'), ('6561234567', '15551234567'))
+
+if __name__ == '__main__':
+	unittest.main()